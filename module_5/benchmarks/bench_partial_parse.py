@@ -0,0 +1,84 @@
+"""Compare full-document and sliced-fragment parsing of listing and detail pages.
+
+The pages are synthetic: the fixture table or detail list, wrapped in
+site chrome (a head with inline script and style, navigation, and a footer)
+sized like a live GradCafe page. Peak memory is what tracemalloc sees, so
+it leaves out libxml2's own allocations for the lxml rows. Run from the
+repository root:
+
+    python module_5/benchmarks/bench_partial_parse.py [chrome_kb]
+"""
+
+import importlib
+import os
+import sys
+import timeit
+import tracemalloc
+
+SRC_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "..", "tests", "fixtures", "gradcafe")
+
+parsers = importlib.import_module("module_2.parsers")
+
+
+def _fixture(name):
+    """Return fixture HTML text by file name."""
+    with open(os.path.join(FIXTURE_DIR, name), "r", encoding="utf-8") as file_in:
+        return file_in.read()
+
+
+def _chrome(kilobytes):
+    """Return (head, nav, footer) boilerplate totalling roughly kilobytes of HTML."""
+    links = "".join(
+        f'<li class="nav-item"><a class="nav-link" href="/p/{i}">Program {i}</a></li>'
+        for i in range(kilobytes * 6)
+    )
+    script = "<script>" + "window.cfg = {a: '<table>'};" * (kilobytes * 4) + "</script>"
+    head = f"<head><title>GradCafe</title><style>.x{{color:red}}</style>{script}</head>"
+    return head, f"<nav><ul>{links}</ul></nav>", f"<footer><ul>{links}</ul></footer>"
+
+
+def _pages(kilobytes):
+    """Build one large listing page and one large detail page."""
+    head, nav, footer = _chrome(kilobytes)
+    table = parsers.slice_element(_fixture("listing_page_1.html"), "table")
+    rows = table[table.index("<tr", table.index("</tr>")):table.rindex("</table>")]
+    listing = f"<html>{head}<body>{nav}<table><tr><th>h</th></tr>{rows * 10}</table>{footer}"
+    detail = _fixture("detail_987654.html").replace("<main", f"{nav}<main").replace(
+        "</main>", f"</main>{footer}"
+    )
+    return listing, detail
+
+
+def _measure(call):
+    """Return (mean milliseconds, peak KB allocated) for one call."""
+    runs = 20
+    seconds = timeit.timeit(call, number=runs) / runs
+    tracemalloc.start()
+    call()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds * 1e3, peak / 1e3
+
+
+def main(kilobytes=60):
+    """Print per-page time and peak memory for each backend, full vs partial."""
+    listing, detail = _pages(kilobytes)
+    print(f"listing page {len(listing) // 1024} KB, detail page {len(detail) // 1024} KB")
+    print(f"{'backend':<14}{'page':<9}{'mode':<9}{'ms':>8}{'peak KB':>10}")
+    for name in ("html.parser", "lxml"):
+        for partial in (False, True):
+            backend = parsers.get_parser_backend(name, partial)
+            mode = "partial" if partial else "full"
+            for page, call in (
+                ("listing", lambda b=backend: b.listing_rows(listing)),
+                ("detail", lambda b=backend: b.parse_detail(detail)),
+            ):
+                millis, peak = _measure(call)
+                print(f"{name:<14}{page:<9}{mode:<9}{millis:>8.2f}{peak:>10.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 60)
@@ -0,0 +1,100 @@
+"""Compare bytes per row of plain dict rows and CompactRecords.
+
+Rows are synthetic merged rows (cleaned fields plus the LLM fields) with
+repeating universities, programs, terms, and statuses. For each form, the
+retained and peak traced memory of decoding the JSON file are reported
+per row, along with clean_data dicts vs ``clean_data(compact=True)``. Run
+from the repository root:
+
+    python module_5/benchmarks/bench_record_memory.py [rows]
+"""
+
+import gc
+import importlib
+import io
+import json
+import os
+import random
+import sys
+import tracemalloc
+
+SRC_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+
+clean = importlib.import_module("module_2.clean")
+record = importlib.import_module("module_2.record")
+
+UNIVERSITIES = (
+    "Johns Hopkins University",
+    "Stanford University",
+    "Carnegie Mellon University",
+    "University of Michigan",
+    "Georgia Institute of Technology",
+)
+PROGRAMS = ("Computer Science", "Data Science", "Electrical Engineering", "Statistics")
+STATUSES = ("Accepted on 12 Feb", "Rejected on 3 Mar", "Wait listed on 1 Jan", "Interview")
+
+
+def _raw_rows(count):
+    """Build count raw scrape records with a fixed seed."""
+    rng = random.Random(0)
+    return [
+        {
+            "program_raw": rng.choice(PROGRAMS),
+            "university_raw": rng.choice(UNIVERSITIES),
+            "comments_raw": rng.choice((None, "", f"Comment {index}")),
+            "date_added_raw": f"February {rng.randrange(1, 29):02d}, 2026",
+            "semester_year_start_raw": rng.choice(("Fall 2026", "Spring 2026")),
+            "international_american_raw": rng.choice(("International", "American")),
+            "gre_score_raw": str(rng.randrange(300, 341)),
+            "gre_v_score_raw": str(rng.randrange(140, 171)),
+            "gre_aw_raw": rng.choice(("3.5", "4.0", "4.5")),
+            "degree_type_raw": rng.choice(("Masters", "PhD")),
+            "gpa_raw": f"{rng.uniform(3, 4):.2f}",
+            "url": f"https://www.thegradcafe.com/result/{900000 + index}",
+            "applicant_status_raw": rng.choice(STATUSES),
+        }
+        for index in range(count)
+    ]
+
+
+def _merged_json(raw):
+    """Return the module_2_out.json text for raw: cleaned rows plus LLM fields."""
+    rows = clean.clean_data(raw)
+    for row in rows:
+        row["llm-generated-program"] = row["program"]
+        row["llm-generated-university"] = row["university"]
+    return json.dumps(rows, indent=2, ensure_ascii=False)
+
+
+def _measure(function, *args):
+    """Return (retained bytes, peak bytes) of the object function(*args) builds."""
+    gc.collect()
+    tracemalloc.start()
+    result = function(*args)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return retained, peak
+
+
+def main(count=100_000):
+    """Print retained and peak bytes per row for dicts and CompactRecords."""
+    raw = _raw_rows(count)
+    text = _merged_json(raw)
+    cases = (
+        ("json.load dicts", json.load, io.StringIO(text)),
+        ("load_records", record.load_records, io.StringIO(text)),
+        ("clean_data dicts", clean.clean_data, raw),
+        ("clean_data compact", lambda rows: clean.clean_data(rows, compact=True), raw),
+    )
+    print(f"{count} rows")
+    print(f"{'form':<22}{'retained B/row':>16}{'peak B/row':>12}")
+    for name, function, source in cases:
+        retained, peak = _measure(function, source)
+        print(f"{name:<22}{retained / count:>16.0f}{peak / count:>12.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
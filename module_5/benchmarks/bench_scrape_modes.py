@@ -0,0 +1,74 @@
+"""Compare end-to-end scrape throughput across scraper modes.
+
+Every mode scrapes the same synthetic site from a local replay server with
+request pacing disabled, so the numbers show scraper overhead and fetch
+concurrency rather than GradCafe's rate limit. Latency is added per request
+to mimic a remote host. Run from the repository root:
+
+    python module_5/benchmarks/bench_scrape_modes.py [pages] [latency_ms]
+"""
+
+import importlib
+import os
+import sys
+import tempfile
+import time
+
+SRC_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+
+replay = importlib.import_module("module_2.replay")
+scrape = importlib.import_module("module_2.scrape")
+rate_limit = importlib.import_module("module_2.rate_limit")
+pipeline = importlib.import_module("module_2.pipeline")
+enrich_queue = importlib.import_module("module_2.enrich_queue")
+
+MODES = (
+    ("sequential", {"detail_workers": 1}),
+    ("threaded x8", {"detail_workers": 8}),
+    ("html.parser", {"parser": "html.parser"}),
+    ("lxml", {"parser": "lxml"}),
+    ("full parse", {"partial_parse": False}),
+    ("partial parse", {"partial_parse": True}),
+)
+
+
+def _run(server, options):
+    """Scrape the whole site once; return (seconds, rows)."""
+    options = {
+        "base_url": server.base_url,
+        "rate_limiter": rate_limit.AdaptiveRateLimiter(rate=1e6, burst=1e6),
+        **options,
+    }
+    started = time.perf_counter()
+    rows = scrape.scrape_data(options=options)
+    return time.perf_counter() - started, len(rows)
+
+
+def _report(name, pages, seconds, rows):
+    """Print one result line."""
+    print(f"{name:<16}{seconds:>8.2f}{pages / seconds:>10.1f}{rows / seconds:>10.1f}")
+
+
+def main(pages=10, latency_ms=20.0):
+    """Print seconds, pages/s, and rows/s for each scrape mode."""
+    site = replay.SyntheticSite(pages=pages)
+    print(f"{pages} pages x {site.rows_per_page} rows, {latency_ms:.0f} ms per request")
+    print(f"{'mode':<16}{'s':>8}{'pages/s':>10}{'rows/s':>10}")
+    with replay.ReplayServer(site, latency=latency_ms / 1e3) as server:
+        for name, options in MODES:
+            _report(name, pages, *_run(server, options))
+        with pipeline.ParsePipeline() as parse_pipeline:
+            _report("pipeline", pages, *_run(server, {"parse_pipeline": parse_pipeline}))
+        with tempfile.TemporaryDirectory() as tmp:
+            queue = enrich_queue.EnrichmentQueue(os.path.join(tmp, "queue.sqlite3"))
+            _report("deferred", pages, *_run(server, {"enrichment_queue": queue}))
+            queue.close()
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 10,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 20.0,
+    )
@@ -0,0 +1,110 @@
+"""Compare the startswith/strptime status and date path with the cached regex parser.
+
+The baseline is the code clean_data and load_data.parse_date used before
+``module_2.status_parse``: ``startswith``/``replace`` for the decision date
+text and a ``strptime`` loop for the added-on date. Rows repeat a realistic
+number of distinct statuses and dates; both paths are checked to agree.
+Run from the repository root:
+
+    python module_5/benchmarks/bench_status_parse.py [rows]
+"""
+
+import importlib
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+SRC_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+
+status_parse = importlib.import_module("module_2.status_parse")
+
+DECISIONS = ("Accepted", "Rejected", "Wait listed", "Interview")
+
+
+def _rows(count):
+    """Build count (status, date_added) pairs over ~100 days with a fixed seed."""
+    rng = random.Random(0)
+    start = date(2026, 1, 1)
+    rows = []
+    for _ in range(count):
+        added = start + timedelta(days=rng.randrange(100))
+        decided = added - timedelta(days=rng.randrange(30))
+        status = f"{rng.choice(DECISIONS)} on {decided.day} {decided.strftime('%b')}"
+        rows.append((rng.choice((status, status, "Other")), added.strftime("%B %d, %Y")))
+    return rows
+
+
+def _baseline(rows):
+    """Old path: startswith/replace status dates and strptime added-on dates."""
+    out = []
+    for status, added in rows:
+        accepted = rejected = None
+        low = status.lower()
+        if low.startswith("accepted on"):
+            accepted = status.replace("Accepted on", "").strip()
+        elif low.startswith("rejected on"):
+            rejected = status.replace("Rejected on", "").strip()
+        parsed = None
+        for fmt in ("%B %d, %Y", "%Y-%m-%d"):
+            try:
+                parsed = datetime.strptime(added.strip(), fmt).date()
+                break
+            except ValueError:
+                continue
+        out.append((accepted, rejected, parsed))
+    return out
+
+
+def _cached(rows):
+    """New path: split_status and parse_date_added, both memoized."""
+    out = []
+    for status, added in rows:
+        decision, when = status_parse.split_status(status)
+        out.append(
+            (
+                when if decision is status_parse.Decision.ACCEPTED else None,
+                when if decision is status_parse.Decision.REJECTED else None,
+                status_parse.parse_date_added(added),
+            )
+        )
+    return out
+
+
+def _typed(rows):
+    """Full typed parse: decision, inferred decision date, and added-on date."""
+    return [status_parse.parse_decision(status, added) for status, added in rows]
+
+
+def _time(function, rows):
+    """Return (best seconds of three runs, output) for function(rows)."""
+    best, output = None, None
+    for _ in range(3):
+        started = time.perf_counter()
+        output = function(rows)
+        seconds = time.perf_counter() - started
+        best = seconds if best is None else min(best, seconds)
+    return best, output
+
+
+def main(count=200_000):
+    """Print seconds and rows/s for each path and check the two paths agree."""
+    rows = _rows(count)
+    baseline, expected = _time(_baseline, rows)
+    cached, got = _time(_cached, rows)
+    typed, _parsed = _time(_typed, rows)
+    print(f"{count} rows, cached output identical: {got == expected}")
+    print(f"{'path':<22}{'s':>8}{'rows/s':>12}")
+    for name, seconds in (
+        ("startswith+strptime", baseline),
+        ("cached regex", cached),
+        ("parse_decision", typed),
+    ):
+        print(f"{name:<22}{seconds:>8.3f}{count / seconds:>12.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
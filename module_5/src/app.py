@@ -11,15 +11,58 @@ from flask import Flask, jsonify, redirect, render_template, request, url_for
 from db_config import read_database_url, read_db_params
 from load_data import run_load
 from query_data import QUERIES
-from module_2.clean import run_clean
+from module_2.clean import clean_data, run_typed_clean
+from module_2.dead_letter import DeadLetterStore
+from module_2.enrich_queue import EnrichmentQueue, EnrichmentWorker
+from module_2.metrics import ScrapeMetrics
+from module_2.record import CompactRecord, load_records, record_to_dict
+from module_2.parsers import detail_status
+from module_2.revisit import RevisitScheduler
 from module_2.llm_hosting import app as llm_app
-from module_2.scrape import run_scrape
-
-
-APP_STATE = {"is_pulling": False}
+from module_2.scrape import (
+    enrichment_predicate,
+    parse_detail_page,
+    retry_failed,
+    run_scrape,
+    save_data as save_scraped_rows,
+)
+from module_2.url_index import ResultIdSet
+
+
+APP_STATE = {
+    "is_pulling": False,
+    "enrichment_queue": None,
+    "enrichment_worker": None,
+    # Result pages revisited after each Pull Data (0 disables revisits).
+    "revisit_budget": 0,
+    # Listing-row predicate limiting which rows get detail pages (None fetches all).
+    "enrich_predicate": None,
+    # ScrapeMetrics of the latest (or running) Pull Data scrape.
+    "scrape_metrics": None,
+    # DeadLetterStore of failed fetches, retried on every Pull Data (None disables).
+    "dead_letters": None,
+}
 MIN_QUERY_LIMIT = 1
 MAX_QUERY_LIMIT = 100
 DEFAULT_QUERY_LIMIT = 25
+# Detail-page fields patched into an applicants row by the enrichment worker;
+# COALESCE keeps any value already stored when a field is missing. The llm
+# columns are re-standardized whenever the page supplies the program.
+PATCH_DETAILS_SQL = """
+UPDATE applicants SET
+  status = COALESCE(%s, status),
+  program = COALESCE(%s, program),
+  comments = COALESCE(%s, comments),
+  us_or_international = COALESCE(%s, us_or_international),
+  gpa = COALESCE(%s, gpa),
+  gre = COALESCE(%s, gre),
+  gre_v = COALESCE(%s, gre_v),
+  gre_aw = COALESCE(%s, gre_aw),
+  degree = COALESCE(%s, degree),
+  llm_generated_program = COALESCE(%s, llm_generated_program),
+  llm_generated_university = COALESCE(%s, llm_generated_university)
+WHERE url = %s;
+"""
 ALLOWED_FILTER_COLUMNS = {
     "program": "program",
     "university": "university",
@@ -127,17 +170,148 @@ def fetch_one_value(cursor, query):
     return row[0] if row else None
 
 
-def fetch_existing_urls():
-    """Read existing non-null URLs from the applicants table."""
+def fetch_existing_urls(compact=False):
+    """Read existing non-null URLs from the applicants table.
+
+    With ``compact=True`` the URLs are returned as a ``ResultIdSet`` keyed by
+    result id instead of a set of strings.
+    """
     conn = get_db_connection()
     cur = conn.cursor()
     cur.execute("SELECT url FROM applicants WHERE url IS NOT NULL;")
-    urls = {row[0] for row in cur.fetchall() if row and row[0]}
+    found = (row[0] for row in cur.fetchall() if row and row[0])
+    urls = ResultIdSet(found) if compact else set(found)
     cur.close()
     conn.close()
     return urls
 
 
+def _standardized_names(cur, url, program):
+    """Return the llm-generated (program, university) for a patched program.
+
+    Returns (None, None) when there is no program to standardize, and None
+    when no applicants row has this URL yet.
+    """
+    cur.execute("SELECT university FROM applicants WHERE url = %s;", (url,))
+    found = cur.fetchone()
+    if found is None:
+        return None
+    if not program:
+        return None, None
+    names = llm_app.standardize_row({"program": program, "university": found[0]})
+    return names["llm-generated-program"], names["llm-generated-university"]
+
+
+def patch_applicant_details(url, detail_fields, update_status=False):
+    """Patch one applicants row with cleaned detail fields; True if a row matched.
+
+    With ``update_status`` the detail page's decision also replaces the status.
+    A patched program is run through the LLM standardizer again, so the
+    llm-generated columns match it; rows not loaded yet are left alone.
+    """
+    row = clean_data([{**detail_fields, "url": url}], typed=True)[0]
+    conn = get_db_connection()
+    cur = conn.cursor()
+    try:
+        names = _standardized_names(cur, url, row["program"])
+        if names is None:
+            return False
+        cur.execute(
+            PATCH_DETAILS_SQL,
+            (
+                detail_status(detail_fields) if update_status else None,
+                row["program"],
+                row["comments"],
+                row["citizenship"],
+                row["gpa"],
+                row["gre_total"],
+                row["gre_verbal"],
+                row["gre_writing"],
+                row["degree_type"],
+                *names,
+                url,
+            ),
+        )
+        matched = cur.rowcount > 0
+        conn.commit()
+    finally:
+        cur.close()
+        conn.close()
+    return matched
+
+
+def enable_deferred_enrichment(queue_path=None, interval=30.0):
+    """Switch Pull Data to listing-only scrapes and start the enrichment worker.
+
+    Detail URLs go to a SQLite queue; the worker patches applicants rows once
+    they have been loaded (rows not loaded yet are retried on a later pass).
+    """
+    if APP_STATE["enrichment_worker"] is None:
+        queue = EnrichmentQueue(queue_path)
+        APP_STATE["enrichment_queue"] = queue
+        worker = EnrichmentWorker(queue, patch_applicant_details, parse_detail_page)
+        worker.batch_errors += (psycopg.Error,)
+        APP_STATE["enrichment_worker"] = worker
+    APP_STATE["enrichment_worker"].start(interval)
+    return APP_STATE["enrichment_worker"]
+
+
+def _fetch_revisited_applicant(url):
+    """Fetch a result page for the revisit pass, decision fields included."""
+    return parse_detail_page(url, decision=True)
+
+
+def _upsert_revisited_applicant(url, detail_fields):
+    """Write a revisited result page's changed fields, including its decision."""
+    return patch_applicant_details(url, detail_fields, update_status=True)
+
+
+def run_revisit_pass(limit=50, scheduler=None):
+    """Track loaded result rows, then re-fetch up to limit due pages and upsert changes."""
+    owned = scheduler is None
+    scheduler = scheduler or RevisitScheduler()
+    try:
+        conn = get_db_connection()
+        cur = conn.cursor()
+        cur.execute("SELECT url, status FROM applicants WHERE url LIKE '%/result/%';")
+        scheduler.track(cur.fetchall())
+        cur.close()
+        conn.close()
+        return scheduler.run_due(_fetch_revisited_applicant, _upsert_revisited_applicant, limit)
+    finally:
+        if owned:
+            scheduler.close()
+
+
+def _retry_dead_letters(entries, options):
+    """Re-fetch dead-lettered URLs and add recovered listing rows to the scrape output.
+
+    Returns the recovered detail fields by URL, to be patched in once this
+    pull's rows are loaded.
+    """
+    dead_letters = APP_STATE["dead_letters"]
+    if dead_letters is None:
+        return {}
+    options = {key: value for key, value in options.items() if key != "watermark"}
+    rows, details = retry_failed(dead_letters, options)
+    if rows:
+        save_scraped_rows(list(entries) + rows, _applicant_json_path())
+    return details
+
+
+def fetch_max_result_id():
+    """Return the highest GradCafe result id stored in applicants, or None."""
+    conn = get_db_connection()
+    cur = conn.cursor()
+    value = fetch_one_value(
+        cur,
+        "SELECT MAX(CAST(substring(url FROM '/result/([0-9]+)') AS BIGINT)) FROM applicants;",
+    )
+    cur.close()
+    conn.close()
+    return int(value) if value is not None else None
+
+
 def clamp_limit(raw_limit, min_limit=MIN_QUERY_LIMIT, max_limit=MAX_QUERY_LIMIT):
     """Clamp user-provided limits to a safe bounded integer range."""
     try:
@@ -256,28 +430,30 @@ def run_llm_and_write_out_json():
 
 
 def merge_out_into_module2_out():
-    """Append only new URLs from out.json into module_2_out.json."""
+    """Append only new URLs from out.json into module_2_out.json.
+
+    Rows are held as CompactRecords while merging; the file is rewritten
+    with the same bytes a plain list of dicts would give.
+    """
     master_path = _module2_out_path()
     batch_path = _out_json_path()
 
     if os.path.exists(master_path):
         with open(master_path, "r", encoding="utf-8") as file_in:
-            master_rows = json.load(file_in)
+            master_rows = load_records(file_in)
     else:
         master_rows = []
 
     with open(batch_path, "r", encoding="utf-8") as file_in:
-        batch_rows = json.load(file_in)
+        batch_rows = load_records(file_in)
 
-    seen_urls = {
-        (row.get("url") or "").strip()
-        for row in master_rows
-        if isinstance(row, dict) and row.get("url")
-    }
+    seen_urls = ResultIdSet(
+        row.get("url") for row in master_rows if isinstance(row, CompactRecord)
+    )
 
     added = 0
     for row in batch_rows:
-        if not isinstance(row, dict):
+        if not isinstance(row, CompactRecord):
             continue
         url = (row.get("url") or "").strip()
         if not url or url in seen_urls:
@@ -287,7 +463,7 @@ def merge_out_into_module2_out():
         added += 1
 
     with open(master_path, "w", encoding="utf-8") as file_out:
-        json.dump(master_rows, file_out, indent=2, ensure_ascii=False)
+        json.dump(master_rows, file_out, indent=2, ensure_ascii=False, default=record_to_dict)
 
     return added, len(master_rows)
 
@@ -371,15 +547,27 @@ def run_pull_data_pipeline():
     seeded_now = False
     try:
         seeded_now = ensure_initial_dataset_loaded()
-        existing_urls = fetch_existing_urls()
-        run_scrape(existing_urls=existing_urls, filename=_applicant_json_path())
-        run_clean(
+        APP_STATE["scrape_metrics"] = ScrapeMetrics()
+        options = {"watermark": fetch_max_result_id(), "metrics": APP_STATE["scrape_metrics"]}
+        if APP_STATE["enrichment_queue"] is not None:
+            options["enrichment_queue"] = APP_STATE["enrichment_queue"]
+        if APP_STATE["enrich_predicate"] is not None:
+            options["enrich_predicate"] = APP_STATE["enrich_predicate"]
+        if APP_STATE["dead_letters"] is not None:
+            options["dead_letters"] = APP_STATE["dead_letters"]
+        entries = run_scrape(filename=_applicant_json_path(), options=options)
+        recovered = _retry_dead_letters(entries, options)
+        run_typed_clean(
             input_file=_applicant_json_path(),
             output_file=_llm_input_json_path(),
         )
         run_llm_and_write_out_json()
         added_rows, total_rows = merge_out_into_module2_out()
         run_load(input_file=_module2_out_path())
+        for url, detail_fields in recovered.items():
+            patch_applicant_details(url, detail_fields)
+        if APP_STATE["revisit_budget"]:
+            run_revisit_pass(APP_STATE["revisit_budget"])
         status = (
             f"Pull Data completed. Added {added_rows} new rows. "
             f"module_2_out now has {total_rows} rows."
@@ -442,6 +630,14 @@ def api_update_analysis():
     return jsonify({"ok": True}), 200
 
 
+@app.route("/api/scrape-metrics", methods=["GET"])
+def api_scrape_metrics():
+    """Return timings and counters of the latest Pull Data scrape (null before one)."""
+    metrics = APP_STATE["scrape_metrics"]
+    summary = metrics.summary() if metrics is not None else None
+    return jsonify({"ok": True, "metrics": summary}), 200
+
+
 @app.route("/api/applicants", methods=["GET"])
 def api_list_applicants():
     """List applicant rows using SQL-composed filtering, sorting, and safe limits."""
@@ -477,4 +673,12 @@ def api_list_applicants():
 
 
 if __name__ == "__main__":
+    if os.getenv("DEFERRED_ENRICHMENT") == "1":
+        enable_deferred_enrichment()
+    APP_STATE["revisit_budget"] = int(os.getenv("REVISIT_BUDGET", "0"))
+    APP_STATE["dead_letters"] = DeadLetterStore()
+    if os.getenv("ENRICH_UNIVERSITIES"):
+        APP_STATE["enrich_predicate"] = enrichment_predicate(
+            [name.strip() for name in os.environ["ENRICH_UNIVERSITIES"].split(",") if name.strip()]
+        )
     app.run(host="0.0.0.0", port=8080, debug=True)
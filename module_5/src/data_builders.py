@@ -1,5 +1,7 @@
 """Shared test-data builders used across module_5 tests."""
 
+from module_2.rate_limit import AdaptiveRateLimiter
+
 
 def build_applicant_rows():
     """Return two representative applicant rows for DB/integration tests."""
@@ -39,3 +41,28 @@ def build_applicant_rows():
             "llm-generated-university": "Stanford University",
         },
     ]
+
+
+def listing_html_for_hrefs(hrefs):
+    """Return a GradCafe-style listing page with one linked row per detail href."""
+    rows = "".join(
+        f"<tr><td>U</td><td>P</td><td>Jan 1</td><td>Accepted</td>"
+        f"<td><a href=\"{href}\">x</a></td></tr>"
+        for href in hrefs
+    )
+    return f"<table><tr><th>h</th></tr>{rows}</table>"
+
+
+def listing_html(ids):
+    """Return a listing page with one linked row per result id."""
+    return listing_html_for_hrefs(f"/result/{rid}" for rid in ids)
+
+
+def server_options(server, **extra):
+    """Return scrape options pointed at a replay server, with no request pacing."""
+    return {
+        "base_url": server.base_url,
+        "rate_limiter": AdaptiveRateLimiter(rate=10_000, burst=10_000),
+        "parser": "html.parser",
+        **extra,
+    }
@@ -1,14 +1,14 @@
 """Load cleaned JSON records into PostgreSQL."""
 
-import json
 import os
-from datetime import datetime
 from pathlib import Path
 
 import psycopg
 from psycopg import OperationalError
 from psycopg import sql
 from db_config import read_database_url, read_db_params
+from module_2.record import load_records
+from module_2.status_parse import parse_date_added
 
 
 def create_connection(db_name, db_user, db_password, db_host, db_port):
@@ -89,20 +89,16 @@ def execute_query(connection, query):
         print(f"The error '{e}' occurred")
 
 def parse_date(s):
-    """Parse known date string formats into date objects."""
-    if not s:
-        return None
-    if isinstance(s, str):
-        s = s.strip()
-    for fmt in ("%B %d, %Y", "%Y-%m-%d"):
-        try:
-            return datetime.strptime(s, fmt).date()
-        except (TypeError, ValueError):
-            continue
-    return None
+    """Parse 'Month D, YYYY' and 'YYYY-MM-DD' strings into date objects (cached)."""
+    return parse_date_added(s)
 
 def parse_float(s):
-    """Convert numeric text to float while preserving empty values as NULL."""
+    """Convert numeric text to float while preserving empty values as NULL.
+
+    Floats from typed clean output are returned as they are.
+    """
+    if isinstance(s, float):
+        return s
     if s is None or s == "":
         return None
     return float(s)
@@ -183,7 +179,7 @@ def run_load(input_file="module_2_out.json"):
         data_path = Path(__file__).with_name(input_file)
 
     with open(data_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+        data = load_records(f)
 
     cursor = connection.cursor()
     for rec in data:
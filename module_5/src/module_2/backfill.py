@@ -0,0 +1,134 @@
+"""Rebuild historical GradCafe pages in parallel, sharded across processes."""
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from module_2.scrape import run_scrape
+
+
+DEFAULT_BACKFILL_DIR = "backfill"
+MERGED_FILENAME = "backfill.jsonl"
+
+
+def split_pages(pages, shards):
+    """Split a page range into at most ``shards`` contiguous, ordered sub-ranges."""
+    pages = list(pages)
+    shards = max(1, min(shards, len(pages)))
+    size, extra = divmod(len(pages), shards)
+    out = []
+    start = 0
+    for index in range(shards):
+        stop = start + size + (1 if index < extra else 0)
+        out.append(pages[start:stop])
+        start = stop
+    return [chunk for chunk in out if chunk]
+
+
+def _segment_path(out_dir, shard_index):
+    """Return the JSONL segment path for one shard."""
+    return os.path.join(out_dir, f"shard-{shard_index:03d}.jsonl")
+
+
+def scrape_shard(shard_index, pages, out_dir, options=None):
+    """Scrape one shard's pages into its own segment and return throughput stats.
+
+    Each shard keeps its own checkpoint next to its segment, so a rerun with
+    ``resume`` continues unfinished shards and skips completed ones. A shard
+    counts as completed only once its ``.done`` marker is written after the
+    scrape returns; a segment left by a crash, even within the first page,
+    is resumed.
+    """
+    options = dict(options or {})
+    path = _segment_path(out_dir, shard_index)
+    checkpoint_path = f"{path}.checkpoint.json"
+    done_path = f"{path}.done"
+    resume = bool(options.get("resume"))
+    started = time.perf_counter()
+    stats = {"shard": shard_index, "pages": len(pages), "path": path, "skipped": False}
+
+    if resume and os.path.exists(done_path):
+        stats.update(rows=0, seconds=0.0, rows_per_second=0.0, skipped=True)
+        return stats
+
+    if os.path.exists(done_path):
+        os.remove(done_path)
+    options.update(pages=pages, checkpoint_path=checkpoint_path, resume=resume)
+    rows = run_scrape(filename=path, options=options, stream=True)
+    with open(done_path, "w", encoding="utf-8"):
+        pass
+    seconds = time.perf_counter() - started
+    stats.update(
+        rows=rows,
+        seconds=round(seconds, 3),
+        rows_per_second=round(rows / seconds, 2) if seconds > 0 else 0.0,
+    )
+    return stats
+
+
+def merge_segments(paths, output_path):
+    """Concatenate JSONL segments in order, keeping the first row per URL."""
+    seen_urls = set()
+    written = 0
+    duplicates = 0
+    with open(output_path, "w", encoding="utf-8") as file_out:
+        for path in paths:
+            if not os.path.exists(path):
+                continue
+            with open(path, "r", encoding="utf-8") as file_in:
+                for line in file_in:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    url = json.loads(line).get("url")
+                    if url and url in seen_urls:
+                        duplicates += 1
+                        continue
+                    if url:
+                        seen_urls.add(url)
+                    file_out.write(line + "\n")
+                    written += 1
+    return written, duplicates
+
+
+def run_backfill(pages, out_dir=DEFAULT_BACKFILL_DIR, shards=4, workers=None, options=None):
+    """Scrape a page range as parallel shards and merge them, deduplicated by URL.
+
+    ``options`` are passed to each shard's scrape (for example ``detail_workers``
+    or ``resume``) and must be picklable. Returns a summary with per-shard
+    throughput and the merged output path.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    chunks = split_pages(pages, shards)
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers or len(chunks)) as pool:
+        futures = [
+            pool.submit(scrape_shard, index, chunk, out_dir, options)
+            for index, chunk in enumerate(chunks)
+        ]
+        shard_stats = [future.result() for future in futures]
+
+    merged_path = os.path.join(out_dir, MERGED_FILENAME)
+    written, duplicates = merge_segments(
+        [_segment_path(out_dir, index) for index in range(len(chunks))],
+        merged_path,
+    )
+    for stats in shard_stats:
+        print(
+            f"Shard {stats['shard']}: {stats['pages']} pages, {stats['rows']} rows, "
+            f"{stats['rows_per_second']} rows/s"
+        )
+    print(f"Merged {written} rows ({duplicates} duplicates dropped) into {merged_path}")
+    return {
+        "shards": shard_stats,
+        "rows": written,
+        "duplicates": duplicates,
+        "seconds": round(time.perf_counter() - started, 3),
+        "path": merged_path,
+    }
+
+
+if __name__ == "__main__":
+    # Same page range as the original one-off historical crawl.
+    run_backfill(range(3, 1605), shards=8, options={"resume": True})
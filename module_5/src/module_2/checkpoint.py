@@ -0,0 +1,76 @@
+"""Atomic JSON checkpoints so interrupted scrapes can resume.
+
+The checkpoint itself is rewritten after each page. URLs streamed in
+between are appended to a journal next to it (``<path>.emitted``), so a
+run interrupted partway through a page does not emit those rows again.
+"""
+
+import json
+import os
+import tempfile
+
+
+def new_state():
+    """Return the checkpoint state for a scrape that has processed nothing yet."""
+    return {"last_page": 0, "emitted_urls": set(), "consecutive_existing": 0}
+
+
+def journal_path(path):
+    """Return the path of the emitted-URL journal kept next to a checkpoint."""
+    return f"{path}.emitted"
+
+
+def record_emitted(path, url):
+    """Append one streamed row's URL to the checkpoint's journal."""
+    with open(journal_path(path), "a", encoding="utf-8") as file_out:
+        file_out.write(url + "\n")
+
+
+def load_checkpoint(path):
+    """Read checkpoint state (plus journaled URLs) from path, or a fresh state."""
+    if not path:
+        return new_state()
+    state = new_state()
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as file_in:
+            raw = json.load(file_in)
+        state = {
+            "last_page": int(raw.get("last_page", 0)),
+            "emitted_urls": set(raw.get("emitted_urls", [])),
+            "consecutive_existing": int(raw.get("consecutive_existing", 0)),
+        }
+    if os.path.exists(journal_path(path)):
+        with open(journal_path(path), "r", encoding="utf-8") as file_in:
+            state["emitted_urls"].update(line.strip() for line in file_in if line.strip())
+    return state
+
+
+def save_checkpoint(path, state):
+    """Write state atomically (temp file, fsync, rename), then drop the journal.
+
+    The journal's URLs are part of ``state["emitted_urls"]`` by then.
+    """
+    payload = {
+        "last_page": state["last_page"],
+        "emitted_urls": sorted(state["emitted_urls"]),
+        "consecutive_existing": state["consecutive_existing"],
+    }
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=directory, prefix=".checkpoint-", delete=False
+    ) as file_out:
+        json.dump(payload, file_out)
+        file_out.flush()
+        os.fsync(file_out.fileno())
+    os.replace(file_out.name, path)
+    if os.path.exists(journal_path(path)):
+        os.remove(journal_path(path))
+
+
+def clear_checkpoint(path):
+    """Remove a checkpoint file and its journal once its scrape has finished."""
+    if not path:
+        return
+    for name in (path, journal_path(path)):
+        if os.path.exists(name):
+            os.remove(name)
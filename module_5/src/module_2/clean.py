@@ -1,6 +1,34 @@
-"""Clean scraped GradCafe records into a normalized JSON shape."""
+"""Clean scraped GradCafe records into a normalized JSON shape.
+
+Besides the list-based ``load_data``/``clean_data``/``save_data`` path,
+``iter_entries``, ``iter_clean``, and ``write_rows`` stream one record at a
+time, so ``run_clean(stream=True)`` keeps peak memory independent of input
+size. Input may be a JSON array or JSONL; JSON output is written in the same
+layout as ``save_data``.
+``run_clean(incremental=True)`` cleans only records that are new or changed
+since the last run, per a URL + content-hash manifest kept next to the output.
+``typed=True`` (and ``run_typed_clean``) turns GPA and GRE fields into range-
+checked floats, written as JSON numbers the loader binds without re-parsing,
+and acceptance/rejection dates into ISO dates with the year filled in.
+"""
 
 import json
+import os
+import tempfile
+from itertools import islice
+
+from module_2.clean_manifest import (
+    LOOKUP_BATCH,
+    CleanManifest,
+    manifest_path,
+    record_digest,
+    record_key,
+)
+from module_2.record import CompactRecord, record_to_dict
+from module_2.status_parse import Decision, parse_decision, split_status
+
+READ_CHUNK_CHARS = 64 * 1024
+_DECODER = json.JSONDecoder()
 
 
 def load_data(filename="applicant_data.json"):
@@ -9,6 +37,76 @@ def load_data(filename="applicant_data.json"):
         return json.load(f)
 
 
+def _skip_space(buffer, pos):
+    """Return the index of the first non-whitespace character at or after pos."""
+    while pos < len(buffer) and buffer[pos] in " \t\r\n":
+        pos += 1
+    return pos
+
+
+def _iter_json_array(file_in, buffer):
+    """Yield the items of a JSON array read chunk by chunk; buffer starts after '['.
+
+    Only the unparsed tail plus one chunk is held in memory. An item is
+    accepted only once the ``,`` or ``]`` after it is in the buffer (or the
+    input has ended); otherwise it is decoded again after reading more, so a
+    number split across chunks (``3.`` + ``75``) is never cut short.
+    """
+    pos = 0
+    eof = False
+    expect_item = True
+    while True:
+        pos = _skip_space(buffer, pos)
+        item = end = None
+        if pos < len(buffer):
+            if buffer[pos] == "]":
+                return
+            if not expect_item:
+                if buffer[pos] != ",":
+                    raise ValueError("Malformed JSON array in clean input")
+                pos, expect_item = pos + 1, True
+                continue
+            try:
+                item, end = _DECODER.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                end = None
+        if end is not None:
+            after = _skip_space(buffer, end)
+            if not eof and (after == len(buffer) or buffer[after] not in ",]"):
+                end = None
+        if end is not None:
+            yield item
+            pos, expect_item = end, False
+            continue
+        if eof:
+            raise ValueError("Truncated or malformed JSON array in clean input")
+        chunk = file_in.read(READ_CHUNK_CHARS)
+        buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+
+
+def iter_entries(filename="applicant_data.json"):
+    """Yield raw entries one at a time from a JSON array or a JSONL file.
+
+    The format is detected from the first non-whitespace character: ``[``
+    means a JSON array, anything else is read as JSONL (blank lines skipped).
+    """
+    with open(filename, "r", encoding="utf-8") as file_in:
+        head = file_in.read(READ_CHUNK_CHARS)
+        while head.isspace():
+            more = file_in.read(READ_CHUNK_CHARS)
+            if not more:
+                break
+            head += more
+        start = _skip_space(head, 0)
+        if head[start:start + 1] == "[":
+            yield from _iter_json_array(file_in, head[start + 1:])
+            return
+        file_in.seek(0)
+        for line in file_in:
+            if line.strip():
+                yield json.loads(line)
+
+
 # Map scraped field names to cleaner output names.
 RENAME = {
     "program_raw": "program",
@@ -24,63 +122,281 @@ RENAME = {
     "gpa_raw": "gpa",
     "url": "url",
 }
+OUTPUT_KEYS = tuple(RENAME.values()) + ("applicant_status", "acceptance_date", "rejection_date")
+# Typed mode: inclusive (low, high) bounds; other values, and non-numbers, become None.
+NUMERIC_RANGES = {
+    "gre_total": (130.0, 340.0),
+    "gre_verbal": (130.0, 170.0),
+    "gre_writing": (0.0, 6.0),
+    "gpa": (0.0, 4.3),
+}
+# Text between consecutive items of a save_data / write_rows JSON array.
+ARRAY_ITEM_SEPARATOR = ",\n  "
 
 
-def clean_data(entries):
-    """Map raw fields to normalized keys and derive acceptance/rejection dates."""
-    cleaned = []
+def to_number(value, low, high):
+    """Return value as a float when it is a number in [low, high], else None."""
+    if isinstance(value, str):
+        try:
+            value = float(value)
+        except ValueError:
+            return None
+    elif isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value) if low <= value <= high else None
 
-    for e in entries:
-        row = {}
 
-        # rename keys + normalize strings
-        for old_key, new_key in RENAME.items():
-            value = e.get(old_key)
+def clean_entry(e, typed=False):
+    """Map one raw entry to normalized keys and derive acceptance/rejection dates.
+
+    With ``typed`` the NUMERIC_RANGES fields become floats (None when out of
+    range) and the decision date becomes an ISO date, its year inferred from
+    the added-on date when the status has none (None when unreadable).
+    """
+    row = {}
+
+    # rename keys + normalize strings
+    for old_key, new_key in RENAME.items():
+        value = e.get(old_key)
+
+        if isinstance(value, str):
+            value = value.strip()
+            value = value if value != "" else None
+
+        row[new_key] = value
+
+    # normalize GRE zeros to None
+    for k in ["gre_total", "gre_verbal", "gre_writing"]:
+        if row.get(k) in ["0", "0.0", "0.00"]:
+            row[k] = None
 
-            if isinstance(value, str):
-                value = value.strip()
-                value = value if value != "" else None
+    # normalize GPA zeros to None
+    if row.get("gpa") in ["0", "0.0", "0.00"]:
+        row["gpa"] = None
 
-            row[new_key] = value
+    # parse applicant status into dates (keep original status too)
+    status = e.get("applicant_status_raw")
+    row["applicant_status"] = status
 
-        # normalize GRE zeros to None
-        for k in ["gre_total", "gre_verbal", "gre_writing"]:
-            if row.get(k) in ["0", "0.0", "0.00"]:
-                row[k] = None
+    decision, when = split_status(status)
+    if typed and when is not None:
+        decided = parse_decision(status, row["date_added"]).decision_date
+        when = None if decided is None else decided.isoformat()
+    row["acceptance_date"] = when if decision is Decision.ACCEPTED else None
+    row["rejection_date"] = when if decision is Decision.REJECTED else None
 
-        # normalize GPA zeros to None
-        if row.get("gpa") in ["0", "0.0", "0.00"]:
-            row["gpa"] = None
+    if typed:
+        for key, (low, high) in NUMERIC_RANGES.items():
+            row[key] = to_number(row[key], low, high)
 
-        # parse applicant status into dates (keep original status too)
-        status = e.get("applicant_status_raw")
-        row["applicant_status"] = status
+    return row
 
-        row["acceptance_date"] = None
-        row["rejection_date"] = None
 
-        if isinstance(status, str):
-            low = status.lower()
-            if low.startswith("accepted on"):
-                row["acceptance_date"] = status.replace("Accepted on", "").strip()
-            elif low.startswith("rejected on"):
-                row["rejection_date"] = status.replace("Rejected on", "").strip()
+def clean_data(entries, typed=False, compact=False):
+    """Map raw fields to normalized keys and derive acceptance/rejection dates.
 
-        cleaned.append(row)
+    With ``compact`` the rows are CompactRecords instead of dicts.
+    """
+    if compact:
+        return [CompactRecord(clean_entry(e, typed)) for e in entries]
+    return [clean_entry(e, typed) for e in entries]
 
-    return cleaned
+
+def iter_clean(entries, typed=False):
+    """Generator stage: yield each raw entry cleaned, as it arrives."""
+    for e in entries:
+        yield clean_entry(e, typed)
 
 
 def save_data(data, filename="llm_extend_applicant_data.json"):
-    """Write normalized entries to JSON for downstream LLM processing."""
+    """Write normalized entries (dicts or CompactRecords) to JSON for the LLM step."""
     with open(filename, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+        json.dump(data, f, indent=2, ensure_ascii=False, default=record_to_dict)
+
+
+def array_item(row):
+    """Return row as it appears inside a save_data array (indented two extra spaces)."""
+    return json.dumps(row, indent=2, ensure_ascii=False).replace("\n", "\n  ")
+
+
+def write_rows(rows, filename="llm_extend_applicant_data.json"):
+    """Stream rows to disk and return the count written.
+
+    A ``.jsonl`` filename gets one JSON object per line; anything else gets
+    a JSON array byte-identical to ``save_data`` output.
+    """
+    count = 0
+    with open(filename, "w", encoding="utf-8") as f:
+        if filename.endswith(".jsonl"):
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+                count += 1
+            return count
+        for row in rows:
+            f.write(("[\n  " if count == 0 else ARRAY_ITEM_SEPARATOR) + array_item(row))
+            count += 1
+        f.write("\n]" if count else "[]")
+    return count
+
+
+def _batches(items, size):
+    """Yield lists of up to size items."""
+    items = iter(items)
+    while batch := list(islice(items, size)):
+        yield batch
+
+
+def _clean_delta(entries, manifest, typed=False):
+    """Clean records missing from the manifest or whose digest changed.
+
+    Returns ``(rows, digests, changed)``: cleaned rows and raw digests keyed
+    by record key, in first-seen order, and the keys the manifest already
+    had. A key repeated in the input keeps its last version.
+    """
+    rows, digests, changed = {}, {}, set()
+    for batch in _batches(entries, LOOKUP_BATCH):
+        keyed = []
+        for entry in batch:
+            digest = record_digest(entry)
+            keyed.append((record_key(entry, digest), digest, entry))
+        stored = manifest.lookup(key for key, _digest, _entry in keyed)
+        for key, digest, entry in keyed:
+            if digests.get(key, stored.get(key)) == digest:
+                continue
+            rows[key] = clean_entry(entry, typed)
+            digests[key] = digest
+            if key in stored:
+                changed.add(key)
+    return rows, digests, changed
+
+
+def _append_rows(rows, filename):
+    """Append cleaned rows to an existing JSONL file or save_data-style array."""
+    if not rows:
+        return
+    if filename.endswith(".jsonl"):
+        with open(filename, "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+        return
+    with open(filename, "r+b") as f:
+        size = f.seek(0, os.SEEK_END)
+        f.seek(max(0, size - 2))
+        tail = f.read()
+        if tail == b"[]" and size == 2:
+            f.seek(0)
+            f.truncate()
+            f.write(b"[\n  ")
+        elif tail == b"\n]":
+            f.seek(size - 2)
+            f.truncate()
+            f.write(ARRAY_ITEM_SEPARATOR.encode("utf-8"))
+        else:
+            raise ValueError(f"Cannot append to {filename}: not a save_data-style JSON array")
+        body = ARRAY_ITEM_SEPARATOR.join(array_item(row) for row in rows)
+        f.write((body + "\n]").encode("utf-8"))
+
+
+def _rewrite_with_changes(filename, rows, changed):
+    """Rewrite filename with changed rows replaced in place and new rows appended."""
+    updated = (
+        rows[row["url"]] if row.get("url") in changed else row
+        for row in iter_entries(filename)
+    )
+    added = (row for key, row in rows.items() if key not in changed)
+    directory = os.path.dirname(os.path.abspath(filename))
+    suffix = ".jsonl" if filename.endswith(".jsonl") else ".json"
+    handle, temp_path = tempfile.mkstemp(dir=directory, prefix=".clean-", suffix=suffix)
+    os.close(handle)
+    write_rows((row for part in (updated, added) for row in part), temp_path)
+    os.replace(temp_path, filename)
+
+
+def _run_incremental_clean(input_file, output_file, typed=False):
+    """Clean only new or changed records into output_file; return how many were cleaned.
+
+    New records are appended; changed ones (same URL, different raw hash)
+    are replaced in place, which rewrites the output once. When the output
+    is missing, the manifest is empty, or the output was cleaned in the
+    other mode (plain or typed) the output is written from scratch.
+    """
+    mode = "typed" if typed else "plain"
+    manifest = CleanManifest(manifest_path(output_file))
+    try:
+        if not os.path.exists(output_file) or manifest.mode() != mode:
+            manifest.clear()
+        fresh = len(manifest) == 0
+        rows, digests, changed = _clean_delta(iter_entries(input_file), manifest, typed)
+        if fresh:
+            write_rows(rows.values(), output_file)
+        elif changed:
+            _rewrite_with_changes(output_file, rows, changed)
+        else:
+            _append_rows(list(rows.values()), output_file)
+        manifest.update(digests)
+        manifest.set_mode(mode)
+    finally:
+        manifest.close()
+    print("New cleaned entries:", len(rows) - len(changed))
+    print("Changed cleaned entries:", len(changed))
+    return len(rows)
+
+
+def _first_seen(rows, first):
+    """Yield rows unchanged, keeping the first one in first[0]."""
+    for row in rows:
+        if not first:
+            first.append(row)
+        yield row
+
+
+def _run_stream_clean(input_file, output_file, typed=False):
+    """Stream-clean input_file into output_file and return the number of rows."""
+    first = []
+    rows = _first_seen(iter_clean(iter_entries(input_file), typed), first)
+    count = write_rows(rows, output_file)
+    print("Loaded entries:", count)
+    print("Saved cleaned entries:", count)
+    print("First cleaned entry:", first[0] if first else None)
+    return count
+
+
+def run_typed_clean(
+    input_file="applicant_data.json",
+    output_file="llm_extend_applicant_data.json",
+):
+    """Stream-clean with typed numbers and dates and return the number of rows.
+
+    Same as ``run_clean(input_file, output_file, stream=True, typed=True)``:
+    GPA and GRE fields are written as JSON numbers, or null when they are not
+    numbers within NUMERIC_RANGES, so ``run_load`` binds them as they are.
+    Acceptance and rejection dates are written as ISO dates.
+    """
+    return run_clean(input_file, output_file, stream=True, typed=True)
+
+
+def run_clean(
+    input_file="applicant_data.json",
+    output_file="llm_extend_applicant_data.json",
+    stream=False,
+    incremental=False,
+    typed=False,
+):
+    """Run the full clean pipeline and return cleaned records.
 
+    With ``stream=True`` entries are read, cleaned, and written one at a
+    time (JSON array or JSONL in, either out) and the number of rows is
+    returned instead of the full list. With ``incremental=True`` only
+    records that are new or changed since the last incremental run are
+    cleaned into the existing output, and their number is returned.
+    ``typed=True`` applies ``clean_entry``'s typed mode in every one of these.
+    """
+    if incremental:
+        return _run_incremental_clean(input_file, output_file, typed)
+    if stream:
+        return _run_stream_clean(input_file, output_file, typed)
 
-def run_clean(input_file="applicant_data.json", output_file="llm_extend_applicant_data.json"):
-    """Run the full clean pipeline and return cleaned records."""
     entries = load_data(input_file)
-    cleaned_entries = clean_data(entries)
+    cleaned_entries = clean_data(entries, typed)
     save_data(cleaned_entries, output_file)
 
     print("Loaded entries:", len(entries))
@@ -0,0 +1,107 @@
+"""Manifest of raw records already cleaned into an output file, for incremental clean.
+
+Each row maps a record key (its URL, or its digest when it has none) to a
+SHA-1 of the raw record as it was cleaned. A record whose key and digest
+match the manifest is skipped; a new key is appended to the output and a
+known key with a new digest replaces the earlier cleaned row. The manifest
+also records the clean mode (plain or typed) its output was written in.
+"""
+
+import hashlib
+import json
+import sqlite3
+
+CREATE_MANIFEST_TABLE = """
+CREATE TABLE IF NOT EXISTS clean_manifest (
+  key TEXT PRIMARY KEY,
+  digest TEXT NOT NULL
+);
+"""
+CREATE_MODE_TABLE = """
+CREATE TABLE IF NOT EXISTS clean_mode (
+  id INTEGER PRIMARY KEY CHECK (id = 0),
+  mode TEXT NOT NULL
+);
+"""
+# Manifests written before modes were recorded only ever held plain cleans.
+DEFAULT_MODE = "plain"
+# Keys per SELECT ... IN (...) lookup, below SQLite's bound-parameter limit.
+LOOKUP_BATCH = 500
+
+
+def manifest_path(output_file):
+    """Return the manifest path kept next to a clean output file."""
+    return f"{output_file}.manifest.sqlite3"
+
+
+def record_digest(entry):
+    """Return a stable SHA-1 hex digest of a raw record."""
+    payload = json.dumps(entry, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def record_key(entry, digest):
+    """Return the manifest key for a record: its URL, else its digest."""
+    return entry.get("url") or f"sha1:{digest}"
+
+
+class CleanManifest:
+    """SQLite map from record key to the digest of the raw record last cleaned."""
+
+    def __init__(self, path):
+        """Open (or create) the manifest database at path."""
+        self._db = sqlite3.connect(path)
+        self._db.execute(CREATE_MANIFEST_TABLE)
+        self._db.execute(CREATE_MODE_TABLE)
+        self._db.commit()
+
+    def __len__(self):
+        """Return the number of records in the manifest."""
+        return self._db.execute("SELECT COUNT(*) FROM clean_manifest").fetchone()[0]
+
+    def close(self):
+        """Close the manifest database."""
+        self._db.close()
+
+    def lookup(self, keys):
+        """Return {key: digest} for the given keys that are in the manifest."""
+        keys = list(keys)
+        found = {}
+        for start in range(0, len(keys), LOOKUP_BATCH):
+            batch = keys[start:start + LOOKUP_BATCH]
+            placeholders = ", ".join("?" * len(batch))
+            found.update(
+                self._db.execute(
+                    f"SELECT key, digest FROM clean_manifest WHERE key IN ({placeholders})",
+                    batch,
+                )
+            )
+        return found
+
+    def update(self, digests):
+        """Record {key: digest} pairs for records just written to the output."""
+        self._db.executemany(
+            "INSERT INTO clean_manifest (key, digest) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET digest = excluded.digest",
+            digests.items(),
+        )
+        self._db.commit()
+
+    def mode(self):
+        """Return the clean mode the output was written in."""
+        row = self._db.execute("SELECT mode FROM clean_mode").fetchone()
+        return row[0] if row else DEFAULT_MODE
+
+    def set_mode(self, mode):
+        """Record the clean mode the output was written in."""
+        self._db.execute(
+            "INSERT INTO clean_mode (id, mode) VALUES (0, ?) "
+            "ON CONFLICT(id) DO UPDATE SET mode = excluded.mode",
+            (mode,),
+        )
+        self._db.commit()
+
+    def clear(self):
+        """Forget every record, for example when the output file was removed."""
+        self._db.execute("DELETE FROM clean_manifest")
+        self._db.commit()
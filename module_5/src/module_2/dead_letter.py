@@ -0,0 +1,94 @@
+"""Persistent dead-letter store for listing pages and detail URLs that failed to fetch."""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+
+
+DEFAULT_DEAD_LETTER_PATH = os.path.join(os.path.dirname(__file__), "dead_letters.sqlite3")
+PAGE_RE = re.compile(r"[?&]page=(\d+)")
+MAX_ERROR_CHARS = 500
+ENTRY_COLUMNS = ("url", "kind", "page", "error_class", "error", "attempts", "last_failed")
+
+CREATE_DEAD_LETTER_TABLE = """
+CREATE TABLE IF NOT EXISTS dead_letters (
+  url TEXT PRIMARY KEY,
+  kind TEXT NOT NULL,
+  page INTEGER,
+  error_class TEXT NOT NULL,
+  error TEXT,
+  attempts INTEGER NOT NULL,
+  first_failed REAL NOT NULL,
+  last_failed REAL NOT NULL
+);
+"""
+
+
+def classify_url(url):
+    """Return ('listing', page number) for survey pages and ('detail', None) otherwise."""
+    match = PAGE_RE.search(url)
+    if "/survey/" in url and match:
+        return "listing", int(match.group(1))
+    return "detail", None
+
+
+class DeadLetterStore:
+    """SQLite record of failed fetches: error class, message, and attempt count.
+
+    A URL stays in the store until a later fetch of it succeeds; the
+    in-memory URL set keeps that success check free for healthy URLs.
+    """
+
+    def __init__(self, path=None):
+        """Open (or create) the store at path (DEFAULT_DEAD_LETTER_PATH if None)."""
+        self._db = sqlite3.connect(path or DEFAULT_DEAD_LETTER_PATH, check_same_thread=False)
+        self._db.execute(CREATE_DEAD_LETTER_TABLE)
+        self._db.commit()
+        self._lock = threading.Lock()
+        self._urls = {url for (url,) in self._db.execute("SELECT url FROM dead_letters")}
+
+    def __len__(self):
+        """Return the number of URLs currently dead-lettered."""
+        with self._lock:
+            return len(self._urls)
+
+    def close(self):
+        """Close the store database."""
+        self._db.close()
+
+    def record(self, url, error):
+        """Record a failed fetch of url, bumping its attempt count."""
+        kind, page = classify_url(url)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO dead_letters VALUES (?, ?, ?, ?, ?, 1, ?, ?) "
+                "ON CONFLICT(url) DO UPDATE SET error_class = excluded.error_class, "
+                "error = excluded.error, attempts = attempts + 1, "
+                "last_failed = excluded.last_failed",
+                (url, kind, page, type(error).__name__, str(error)[:MAX_ERROR_CHARS], now, now),
+            )
+            self._db.commit()
+            self._urls.add(url)
+
+    def resolve(self, url):
+        """Drop url after a successful fetch; a no-op for URLs never dead-lettered."""
+        with self._lock:
+            if url not in self._urls:
+                return
+            self._db.execute("DELETE FROM dead_letters WHERE url = ?", (url,))
+            self._db.commit()
+            self._urls.discard(url)
+
+    def entries(self, kind=None):
+        """Return dead-lettered fetches as dicts, optionally only one kind, oldest first."""
+        query = f"SELECT {', '.join(ENTRY_COLUMNS)} FROM dead_letters"
+        params = ()
+        if kind is not None:
+            query += " WHERE kind = ?"
+            params = (kind,)
+        with self._lock:
+            rows = self._db.execute(query + " ORDER BY first_failed, url", params).fetchall()
+        return [dict(zip(ENTRY_COLUMNS, row)) for row in rows]
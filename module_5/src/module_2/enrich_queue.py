@@ -0,0 +1,231 @@
+"""Persistent detail-page enrichment queue and the background worker that drains it.
+
+In deferred mode the scraper emits listing-level rows at once and pushes
+their detail URLs here. ``EnrichmentWorker`` later fetches those pages and
+hands the parsed fields to a callback that patches the stored records.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+DEFAULT_QUEUE_PATH = os.path.join(os.path.dirname(__file__), "enrichment_queue.sqlite3")
+# A claimed URL that is neither completed nor released within this many
+# seconds (for example, the worker died) becomes claimable again.
+DEFAULT_LEASE_SECONDS = 5 * 60
+# Claim order: every NORMAL_PRIORITY URL is handed out before any LOW_PRIORITY one.
+NORMAL_PRIORITY = 0
+LOW_PRIORITY = 1
+
+CREATE_QUEUE_TABLE = """
+CREATE TABLE IF NOT EXISTS enrichment_queue (
+  url TEXT PRIMARY KEY,
+  enqueued_at REAL NOT NULL,
+  attempts INTEGER NOT NULL DEFAULT 0,
+  claimed_at REAL,
+  priority INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+class EnrichmentQueue:
+    """SQLite-backed set of detail URLs waiting to be fetched, with leased claims."""
+
+    def __init__(self, path=None, lease_seconds=DEFAULT_LEASE_SECONDS):
+        """Open (or create) the queue database at path (DEFAULT_QUEUE_PATH if None)."""
+        self._db = sqlite3.connect(path or DEFAULT_QUEUE_PATH, check_same_thread=False)
+        self._db.execute(CREATE_QUEUE_TABLE)
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(enrichment_queue)")}
+        if "priority" not in columns:
+            self._db.execute(
+                "ALTER TABLE enrichment_queue ADD COLUMN priority INTEGER NOT NULL DEFAULT 0"
+            )
+        self._db.commit()
+        self._lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+        self._stats = {"enqueued": 0, "completed": 0, "released": 0}
+
+    def stats(self):
+        """Return enqueue/complete/release counters plus the pending count."""
+        with self._lock:
+            return {**self._stats, "pending": self._pending_locked()}
+
+    def _pending_locked(self):
+        """Count queued URLs; caller holds the lock."""
+        return self._db.execute("SELECT COUNT(*) FROM enrichment_queue").fetchone()[0]
+
+    def pending(self):
+        """Return the number of URLs still queued (claimed or not)."""
+        with self._lock:
+            return self._pending_locked()
+
+    def enqueue(self, urls, priority=NORMAL_PRIORITY):
+        """Queue URLs not already queued and return how many were added.
+
+        A URL already queued at a lower priority (higher number) is promoted.
+        """
+        now = time.time()
+        urls = [url for url in urls if url]
+        with self._lock:
+            self._db.executemany(
+                "UPDATE enrichment_queue SET priority = ? WHERE url = ? AND priority > ?",
+                [(priority, url, priority) for url in urls],
+            )
+            before = self._db.total_changes
+            self._db.executemany(
+                "INSERT OR IGNORE INTO enrichment_queue (url, enqueued_at, priority) "
+                "VALUES (?, ?, ?)",
+                [(url, now, priority) for url in urls],
+            )
+            self._db.commit()
+            added = self._db.total_changes - before
+            self._stats["enqueued"] += added
+        return added
+
+    def claim(self, limit):
+        """Lease up to limit unclaimed (or expired) URLs as [(url, attempts)].
+
+        Higher-priority URLs come first, oldest first within a priority.
+        """
+        now = time.time()
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT url, attempts FROM enrichment_queue "
+                "WHERE claimed_at IS NULL OR claimed_at < ? "
+                "ORDER BY priority, enqueued_at, url LIMIT ?",
+                (now - self._lease_seconds, limit),
+            ).fetchall()
+            self._db.executemany(
+                "UPDATE enrichment_queue SET claimed_at = ?, attempts = attempts + 1 "
+                "WHERE url = ?",
+                [(now, url) for url, _ in rows],
+            )
+            self._db.commit()
+        return [(url, attempts + 1) for url, attempts in rows]
+
+    def complete(self, url):
+        """Remove a URL whose record has been patched (or given up on)."""
+        with self._lock:
+            self._db.execute("DELETE FROM enrichment_queue WHERE url = ?", (url,))
+            self._db.commit()
+            self._stats["completed"] += 1
+
+    def release(self, url, requeue=False):
+        """Return a claimed URL to the queue for a later attempt.
+
+        With ``requeue`` the claim does not count as an attempt and the URL
+        moves behind everything already queued at its priority.
+        """
+        with self._lock:
+            if requeue:
+                self._db.execute(
+                    "UPDATE enrichment_queue SET claimed_at = NULL, "
+                    "attempts = attempts - 1, enqueued_at = ? WHERE url = ?",
+                    (time.time(), url),
+                )
+            else:
+                self._db.execute(
+                    "UPDATE enrichment_queue SET claimed_at = NULL WHERE url = ?", (url,)
+                )
+            self._db.commit()
+            self._stats["released"] += 1
+
+    def close(self):
+        """Close the queue database."""
+        self._db.close()
+
+
+class EnrichmentWorker:
+    """Drain an EnrichmentQueue in batches, off the scrape's critical path.
+
+    ``fetch_detail(url)`` returns detail fields ({} on failure) and
+    ``apply(url, fields)`` patches the stored record, returning False while
+    the record has not been loaded yet. Failed fetches are released for
+    retry and dropped after ``max_attempts``. URLs whose record is not
+    loaded yet are requeued without using an attempt, and their fields are
+    kept so the page is not fetched again. A ``batch_errors`` error from
+    either callback is printed and the batch's unsettled URLs are released
+    like failed fetches, so the worker thread keeps running.
+    """
+
+    max_attempts = 3
+    # Callers add their storage errors (the app adds psycopg.Error).
+    batch_errors = (OSError, RuntimeError, ValueError, LookupError, TypeError, sqlite3.Error)
+
+    def __init__(self, queue, apply, fetch_detail, batch_size=16):
+        """Bind the queue, the record patcher, and the detail fetcher."""
+        self.queue = queue
+        self._apply = apply
+        self._fetch_detail = fetch_detail
+        self._batch_size = batch_size
+        self._fetched = {}
+        self._thread = None
+        self._stop = threading.Event()
+
+    def run_once(self):
+        """Claim one batch, fetch its detail pages concurrently, and patch records.
+
+        Returns the number of records patched.
+        """
+        claimed = self.queue.claim(self._batch_size)
+        if not claimed:
+            return 0
+        unsettled = dict(claimed)
+        try:
+            return self._settle(claimed, unsettled)
+        except self.batch_errors as err:
+            print(f"Enrichment batch failed: {err}")
+            for url, attempts in unsettled.items():
+                self._give_back(url, attempts)
+            return 0
+
+    def _give_back(self, url, attempts):
+        """Release a failed URL for retry, or drop it once out of attempts."""
+        if attempts >= self.max_attempts:
+            self.queue.complete(url)
+        else:
+            self.queue.release(url)
+
+    def _settle(self, claimed, unsettled):
+        """Fetch and patch a claimed batch, removing URLs from unsettled as they finish."""
+        urls = [url for url, _ in claimed if url not in self._fetched]
+        if urls:
+            with ThreadPoolExecutor(max_workers=len(urls)) as pool:
+                self._fetched.update(zip(urls, pool.map(self._fetch_detail, urls)))
+        patched = 0
+        for url, attempts in claimed:
+            fields = self._fetched.pop(url)
+            if not fields:
+                self._give_back(url, attempts)
+            elif self._apply(url, fields):
+                self.queue.complete(url)
+                patched += 1
+            else:
+                self._fetched[url] = fields
+                self.queue.release(url, requeue=True)
+            del unsettled[url]
+        return patched
+
+    def _loop(self, interval):
+        """Drain batches until the queue is empty, then sleep until stopped."""
+        while not self._stop.is_set():
+            if not self.run_once():
+                self._stop.wait(interval)
+
+    def start(self, interval=30.0):
+        """Run the worker on a daemon thread, polling every interval seconds when idle."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._loop, args=(interval,), name="enrichment-worker", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        """Signal the worker thread to stop and wait for it."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
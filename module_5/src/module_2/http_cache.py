@@ -0,0 +1,218 @@
+"""Content-addressed on-disk HTTP response cache with conditional GET."""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from module_2.http_client import HttpError, HttpResponse
+
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(__file__), "http_cache")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_TTL_SECONDS = 60 * 60
+# First matching pattern wins: listing pages change constantly, result pages rarely.
+DEFAULT_TTL_RULES = (
+    (re.compile(r"/survey/"), 15 * 60),
+    (re.compile(r"/result/\d+"), 30 * 24 * 60 * 60),
+)
+
+CREATE_ENTRIES_TABLE = """
+CREATE TABLE IF NOT EXISTS entries (
+  url TEXT PRIMARY KEY,
+  digest TEXT NOT NULL,
+  size INTEGER NOT NULL,
+  content_type TEXT,
+  etag TEXT,
+  last_modified TEXT,
+  stored_at REAL NOT NULL,
+  last_access REAL NOT NULL
+);
+"""
+
+
+class CacheMiss(LookupError):
+    """Raised in offline mode when a URL has never been cached."""
+
+
+class ResponseCache:
+    """Serve GETs from disk, revalidating stale entries with ETag/Last-Modified.
+
+    Bodies are stored once per SHA-256 digest under ``blobs/``; a SQLite index
+    maps URLs to digests and validators. When the summed entry size exceeds
+    ``max_bytes`` the least recently accessed entries are evicted. In offline
+    mode cached bodies are always served and misses raise ``CacheMiss``.
+    """
+
+    def __init__(self, session, root=None, max_bytes=DEFAULT_MAX_BYTES, offline=False):
+        """Open (or create) the cache index under root (DEFAULT_CACHE_DIR if None)."""
+        root = root or DEFAULT_CACHE_DIR
+        self._session = session
+        self._root = root
+        self._policy = {
+            "max_bytes": max_bytes,
+            "offline": offline,
+            "ttl_rules": DEFAULT_TTL_RULES,
+        }
+        os.makedirs(os.path.join(root, "blobs"), exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(root, "index.sqlite3"), check_same_thread=False)
+        self._db.execute(CREATE_ENTRIES_TABLE)
+        self._db.commit()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "revalidated": 0, "stored": 0, "evicted": 0}
+
+    @property
+    def session(self):
+        """Return the session used for network requests."""
+        return self._session
+
+    def stats(self):
+        """Return a copy of hit/miss/revalidation/eviction counters."""
+        with self._lock:
+            return dict(self._stats)
+
+    def set_ttl(self, pattern, seconds):
+        """Give URLs matching a regex pattern their own TTL, ahead of existing rules."""
+        rule = (re.compile(pattern), seconds)
+        self._policy["ttl_rules"] = (rule,) + tuple(self._policy["ttl_rules"])
+
+    def ttl_for(self, url):
+        """Return freshness lifetime in seconds for a URL."""
+        for pattern, ttl in self._policy["ttl_rules"]:
+            if pattern.search(url):
+                return ttl
+        return DEFAULT_TTL_SECONDS
+
+    def total_bytes(self):
+        """Return the summed body size of all cached entries."""
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def close(self):
+        """Close the index database."""
+        self._db.close()
+
+    def _blob_path(self, digest):
+        """Return the on-disk path for a body digest."""
+        return os.path.join(self._root, "blobs", digest[:2], digest)
+
+    def _lookup(self, url):
+        """Return the index row for url as a dict, or None."""
+        row = self._db.execute(
+            "SELECT digest, content_type, etag, last_modified, stored_at "
+            "FROM entries WHERE url = ?",
+            (url,),
+        ).fetchone()
+        if row is None:
+            return None
+        keys = ("digest", "content_type", "etag", "last_modified", "stored_at")
+        return dict(zip(keys, row))
+
+    def _read(self, url, entry, counter):
+        """Load a cached body, bump its access time, and count the event."""
+        with open(self._blob_path(entry["digest"]), "rb") as file_in:
+            body = file_in.read()
+        with self._lock:
+            self._db.execute("UPDATE entries SET last_access = ? WHERE url = ?", (time.time(), url))
+            self._db.commit()
+            self._stats[counter] += 1
+        return HttpResponse(url, 200, {"content-type": entry["content_type"] or ""}, body)
+
+    def _store(self, url, response):
+        """Write a 200 response body and validators, then enforce the size bound."""
+        digest = hashlib.sha256(response.body).hexdigest()
+        path = self._blob_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as file_out:
+                file_out.write(response.body)
+            os.replace(tmp_path, path)
+        now = time.time()
+        with self._lock:
+            previous = self._lookup(url)
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    digest,
+                    len(response.body),
+                    response.header("content-type"),
+                    response.header("etag"),
+                    response.header("last-modified"),
+                    now,
+                    now,
+                ),
+            )
+            self._stats["stored"] += 1
+            if previous and previous["digest"] != digest:
+                self._drop_blob_if_unused(previous["digest"])
+            self._evict()
+            self._db.commit()
+
+    def _drop_blob_if_unused(self, digest):
+        """Delete a blob file once no index entry references it."""
+        in_use = self._db.execute(
+            "SELECT 1 FROM entries WHERE digest = ? LIMIT 1", (digest,)
+        ).fetchone()
+        if in_use is None and os.path.exists(self._blob_path(digest)):
+            os.remove(self._blob_path(digest))
+
+    def _evict(self):
+        """Evict least recently accessed entries until under max_bytes."""
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self._policy["max_bytes"]:
+            return
+        victims = self._db.execute(
+            "SELECT url, digest, size FROM entries ORDER BY last_access ASC, stored_at ASC"
+        ).fetchall()
+        for url, digest, size in victims:
+            if total <= self._policy["max_bytes"]:
+                break
+            self._db.execute("DELETE FROM entries WHERE url = ?", (url,))
+            self._drop_blob_if_unused(digest)
+            total -= size
+            self._stats["evicted"] += 1
+
+    def fetch(self, url, session=None):
+        """Return an HttpResponse from cache, revalidation, or a fresh download.
+
+        ``session`` replaces the cache's own session for this call's network
+        request, for example a rate_limit.PacedSession that wraps it.
+        """
+        with self._lock:
+            entry = self._lookup(url)
+        if entry is not None:
+            age = time.time() - entry["stored_at"]
+            if self._policy["offline"] or age < self.ttl_for(url):
+                return self._read(url, entry, "hits")
+        elif self._policy["offline"]:
+            raise CacheMiss(url)
+
+        headers = {}
+        if entry is not None and entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry is not None and entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = (session or self._session).request(url, headers=headers)
+        if response.status == 304 and entry is not None:
+            with self._lock:
+                self._db.execute(
+                    "UPDATE entries SET stored_at = ? WHERE url = ?", (time.time(), url)
+                )
+            return self._read(url, entry, "revalidated")
+        if response.status >= 400:
+            raise HttpError(url, response.status, response.headers)
+
+        with self._lock:
+            self._stats["misses"] += 1
+        if response.status == 200:
+            self._store(url, response)
+        return response
+
+    def get_text(self, url, session=None):
+        """Return decoded text for url, matching HttpSession.get_text."""
+        return self.fetch(url, session).text()
@@ -0,0 +1,175 @@
+"""Pooled keep-alive HTTP client shared by the GradCafe scraper."""
+
+import gzip
+import http.client
+import threading
+import zlib
+from urllib.parse import urljoin, urlsplit
+
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0",
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+}
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+MAX_REDIRECTS = 5
+# Errors raised when a pooled keep-alive socket was closed by the server.
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    BrokenPipeError,
+    ConnectionResetError,
+)
+
+
+class HttpError(Exception):
+    """Raised when a response status is 400 or above."""
+
+    def __init__(self, url, status, headers=None):
+        """Store the failing URL, status code, and response headers."""
+        super().__init__(f"HTTP {status} for {url}")
+        self.url = url
+        self.status = status
+        self.headers = headers or {}
+
+
+class HttpResponse:
+    """Fully read HTTP response with decoded body bytes."""
+
+    def __init__(self, url, status, headers, body):
+        """Store final URL, status, lower-cased headers, and body bytes."""
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def header(self, name, default=None):
+        """Return a response header value by case-insensitive name."""
+        return self.headers.get(name.lower(), default)
+
+    def text(self):
+        """Decode the body using the Content-Type charset, defaulting to UTF-8."""
+        charset = "utf-8"
+        for part in self.header("content-type", "").split(";"):
+            key, _, value = part.strip().partition("=")
+            if key.lower() == "charset" and value:
+                charset = value.strip('"')
+        return self.body.decode(charset)
+
+
+def decode_body(body, encoding):
+    """Undo gzip/deflate content encoding; other encodings pass through."""
+    encoding = (encoding or "").strip().lower()
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    if encoding == "deflate":
+        try:
+            return zlib.decompress(body)
+        except zlib.error:
+            # Some servers send raw deflate streams without the zlib header.
+            return zlib.decompress(body, -zlib.MAX_WBITS)
+    return body
+
+
+class HttpSession:
+    """Thread-safe HTTP client that reuses keep-alive connections per host."""
+
+    def __init__(self, max_idle_per_host=8, timeout=30, headers=None):
+        """Create an empty pool; connections are opened lazily."""
+        self._max_idle = max_idle_per_host
+        self._timeout = timeout
+        self._headers = {**DEFAULT_HEADERS, **(headers or {})}
+        self._pool = {}
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "connections_opened": 0, "connections_reused": 0}
+
+    def stats(self):
+        """Return a copy of request and connection open/reuse counters."""
+        with self._lock:
+            return dict(self._stats)
+
+    def reset_stats(self):
+        """Zero all counters without touching pooled connections."""
+        with self._lock:
+            for key in self._stats:
+                self._stats[key] = 0
+
+    def close(self):
+        """Close every idle pooled connection."""
+        with self._lock:
+            pooled = [conn for idle in self._pool.values() for conn in idle]
+            self._pool = {}
+        for conn in pooled:
+            conn.close()
+
+    def _acquire(self, key):
+        """Return (connection, reused) for a host key, opening one if none is idle."""
+        with self._lock:
+            idle = self._pool.get(key)
+            if idle:
+                self._stats["connections_reused"] += 1
+                return idle.pop(), True
+            self._stats["connections_opened"] += 1
+        scheme, host, port = key
+        conn_cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return conn_cls(host, port, timeout=self._timeout), False
+
+    def _release(self, key, conn, keep_alive):
+        """Return a connection to the idle pool, or close it."""
+        if keep_alive:
+            with self._lock:
+                idle = self._pool.setdefault(key, [])
+                if len(idle) < self._max_idle:
+                    idle.append(conn)
+                    return
+        conn.close()
+
+    def _send(self, key, target, headers):
+        """Send one GET on a pooled connection, retrying once if it went stale."""
+        conn, reused = self._acquire(key)
+        try:
+            conn.request("GET", target, headers=headers)
+            resp = conn.getresponse()
+            body = resp.read()
+        except STALE_CONNECTION_ERRORS:
+            conn.close()
+            if not reused:
+                raise
+            return self._send(key, target, headers)
+        except Exception:
+            conn.close()
+            raise
+        self._release(key, conn, not resp.will_close)
+        return resp, body
+
+    def request(self, url, headers=None):
+        """GET a URL following redirects; 304 and error statuses are returned as-is."""
+        merged = {**self._headers, **(headers or {})}
+        redirects = 0
+        while True:
+            parts = urlsplit(url)
+            key = (parts.scheme, parts.hostname, parts.port)
+            target = parts.path or "/"
+            if parts.query:
+                target = f"{target}?{parts.query}"
+            with self._lock:
+                self._stats["requests"] += 1
+            resp, body = self._send(key, target, merged)
+            resp_headers = {name.lower(): value for name, value in resp.getheaders()}
+            location = resp_headers.get("location")
+            if resp.status in REDIRECT_STATUSES and location:
+                redirects += 1
+                if redirects > MAX_REDIRECTS:
+                    raise HttpError(url, resp.status, resp_headers)
+                url = urljoin(url, location)
+                continue
+            body = decode_body(body, resp_headers.get("content-encoding"))
+            return HttpResponse(url, resp.status, resp_headers, body)
+
+    def get_text(self, url, headers=None):
+        """GET a URL and return decoded text, raising HttpError on 4xx/5xx."""
+        response = self.request(url, headers=headers)
+        if response.status >= 400:
+            raise HttpError(url, response.status, response.headers)
+        return response.text()
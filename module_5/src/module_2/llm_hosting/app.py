@@ -275,6 +275,17 @@ def _fallback_university(row: Dict[str, Any], model_university: str) -> str:
     return u
 
 
+def standardize_row(row: Dict[str, Any]) -> Dict[str, str]:
+    """Return the llm-generated program/university fields for one row."""
+    result = _call_llm(_build_program_text(row))
+    return {
+        "llm-generated-program": result["standardized_program"],
+        "llm-generated-university": _fallback_university(
+            row, result["standardized_university"]
+        ),
+    }
+
+
 def _normalize_input(payload: Any) -> List[Dict[str, Any]]:
     """Accept either a list of rows or {'rows': [...]}."""
     if isinstance(payload, list):
@@ -298,12 +309,7 @@ def standardize() -> Any:
 
     out: List[Dict[str, Any]] = []
     for row in rows:
-        program_text = _build_program_text(row or {})
-        result = _call_llm(program_text)
-        row["llm-generated-program"] = result["standardized_program"]
-        row["llm-generated-university"] = _fallback_university(
-            row or {}, result["standardized_university"]
-        )
+        row.update(standardize_row(row or {}))
         out.append(row)
 
     return jsonify({"rows": out})
@@ -312,12 +318,7 @@ def standardize() -> Any:
 def _write_rows_as_jsonl(rows: List[Dict[str, Any]], sink) -> None:
     """Write standardized rows as newline-delimited JSON."""
     for row in rows:
-        program_text = _build_program_text(row or {})
-        result = _call_llm(program_text)
-        row["llm-generated-program"] = result["standardized_program"]
-        row["llm-generated-university"] = _fallback_university(
-            row or {}, result["standardized_university"]
-        )
+        row.update(standardize_row(row or {}))
 
         json.dump(row, sink, ensure_ascii=False)
         sink.write("\n")
@@ -0,0 +1,174 @@
+"""Per-run scraper metrics: fetch/parse latency histograms and throughput counters.
+
+``ScrapeMetrics`` is shared by every worker in a scrape run. Fetch latency
+and parse time are kept per page kind (listing or detail) in fixed-bucket
+histograms, so memory stays constant however long the run is. The summary
+also folds in the stats of the run's rate limiter, retry policy, HTTP client
+(cache hits and misses when a ResponseCache is used), and parse pipeline.
+"""
+
+import bisect
+import threading
+import time
+
+
+# Upper bounds (milliseconds) of the histogram buckets; a final bucket is open-ended.
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+PAGE_KINDS = ("listing", "detail")
+COUNTERS = (
+    "pages",
+    "rows",
+    "bytes_downloaded",
+    "fetch_failures",
+    "detail_hits",
+    "detail_misses",
+    "detail_deferred",
+    "detail_skipped",
+)
+
+
+def page_kind(url):
+    """Return 'listing' for survey pages and 'detail' for everything else."""
+    return "listing" if "/survey/" in url else "detail"
+
+
+class Histogram:
+    """Fixed-bucket histogram of durations in milliseconds; not thread-safe alone."""
+
+    def __init__(self, bounds=LATENCY_BUCKETS_MS):
+        """Create empty buckets for the given ascending upper bounds."""
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.totals = {"count": 0, "sum_ms": 0.0, "max_ms": 0.0}
+
+    def observe(self, millis):
+        """Add one duration."""
+        self.counts[bisect.bisect_left(self.bounds, millis)] += 1
+        self.totals["count"] += 1
+        self.totals["sum_ms"] += millis
+        self.totals["max_ms"] = max(self.totals["max_ms"], millis)
+
+    def quantile(self, fraction):
+        """Return the bucket upper bound holding the given quantile (None if empty).
+
+        Observations past the last bound report the largest value seen.
+        """
+        if not self.totals["count"]:
+            return None
+        rank = fraction * self.totals["count"]
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return float(bound)
+        return round(self.totals["max_ms"], 3)
+
+    def summary(self):
+        """Return count, total, mean, max, p50/p95 bounds, and bucket counts."""
+        count = self.totals["count"]
+        labels = [f"le_{bound}" for bound in self.bounds] + ["inf"]
+        return {
+            "count": count,
+            "total_ms": round(self.totals["sum_ms"], 3),
+            "mean_ms": round(self.totals["sum_ms"] / count, 3) if count else 0.0,
+            "max_ms": round(self.totals["max_ms"], 3),
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class ScrapeMetrics:
+    """Thread-safe metrics for one scrape run.
+
+    ``start(sources)`` marks the run start and records objects with a
+    ``stats()`` method (limiter, retry policy, client, pipeline) whose
+    counters are included in the summary; ``finish()`` freezes the clock.
+    Fetch and parse seconds are summed across workers, and the summary's
+    ``bound`` field names the larger of the two: ``network`` or ``parse``.
+    """
+
+    def __init__(self):
+        """Create empty histograms and zeroed counters."""
+        self._lock = threading.Lock()
+        self._fetch = {kind: Histogram() for kind in PAGE_KINDS}
+        self._parse = {kind: Histogram() for kind in PAGE_KINDS}
+        self._counters = dict.fromkeys(COUNTERS, 0)
+        self._clock = {"started": None, "finished": None}
+        self._sources = {}
+
+    def start(self, sources=None):
+        """Start (or resume) the run clock and register stats sources by name.
+
+        Calling start again after finish keeps the original start time, so
+        one ScrapeMetrics can span several passes of the same run.
+        """
+        with self._lock:
+            if self._clock["started"] is None:
+                self._clock["started"] = time.perf_counter()
+            self._clock["finished"] = None
+            self._sources.update(
+                (name, source) for name, source in (sources or {}).items() if source is not None
+            )
+
+    def finish(self):
+        """Stop the run clock."""
+        with self._lock:
+            self._clock["finished"] = time.perf_counter()
+
+    def count(self, name, amount=1):
+        """Add amount to a named counter."""
+        with self._lock:
+            self._counters[name] += amount
+
+    def observe_fetch(self, url, seconds, html=None):
+        """Record one fetch (including retries and pacing) and its decoded size.
+
+        ``html`` is None for a fetch that failed after all retries.
+        """
+        with self._lock:
+            self._fetch[page_kind(url)].observe(seconds * 1e3)
+            if html is None:
+                self._counters["fetch_failures"] += 1
+            else:
+                self._counters["bytes_downloaded"] += len(html.encode("utf-8"))
+
+    def observe_parse(self, kind, seconds):
+        """Record the time spent parsing one listing or detail page."""
+        with self._lock:
+            self._parse[kind].observe(seconds * 1e3)
+
+    def elapsed(self):
+        """Return seconds since start (up to finish), or 0.0 before start."""
+        with self._lock:
+            started, finished = self._clock["started"], self._clock["finished"]
+        if started is None:
+            return 0.0
+        return (finished if finished is not None else time.perf_counter()) - started
+
+    def summary(self):
+        """Return a JSON-serializable snapshot; safe to call while the run is going."""
+        elapsed = self.elapsed()
+        with self._lock:
+            counters = dict(self._counters)
+            fetch = {kind: hist.summary() for kind, hist in self._fetch.items()}
+            parse = {kind: hist.summary() for kind, hist in self._parse.items()}
+            sources = dict(self._sources)
+            running = self._clock["started"] is not None and self._clock["finished"] is None
+        fetch_ms = sum(hist["total_ms"] for hist in fetch.values())
+        parse_ms = sum(hist["total_ms"] for hist in parse.values())
+        summary = {
+            **counters,
+            "running": running,
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round(counters["rows"] / elapsed, 3) if elapsed else 0.0,
+            "pages_per_second": round(counters["pages"] / elapsed, 3) if elapsed else 0.0,
+            "fetch_seconds": round(fetch_ms / 1e3, 3),
+            "parse_seconds": round(parse_ms / 1e3, 3),
+            "bound": "network" if fetch_ms >= parse_ms else "parse",
+            "fetch_latency": fetch,
+            "parse_time": parse,
+        }
+        for name, source in sources.items():
+            summary[name] = source.stats()
+        return summary
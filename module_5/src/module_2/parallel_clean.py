@@ -0,0 +1,124 @@
+"""Clean large JSONL inputs in parallel, one byte range per worker process.
+
+The input is split into ``chunk_bytes`` ranges. Each worker opens the file
+itself, seeks to its range, cleans the lines that start inside it, and
+writes them to a part file, so no rows are pickled between processes. The
+parent concatenates the parts in input order into the same output
+``run_clean(stream=True)`` would write.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from module_2.clean import ARRAY_ITEM_SEPARATOR, array_item, clean_entry, run_clean
+
+
+DEFAULT_CHUNK_BYTES = 4 * 1024 * 1024
+
+
+def split_byte_ranges(size, chunk_bytes):
+    """Return [(start, end)] ranges of at most chunk_bytes covering size bytes."""
+    if chunk_bytes < 1:
+        raise ValueError("chunk_bytes must be at least 1")
+    return [(start, min(size, start + chunk_bytes)) for start in range(0, size, chunk_bytes)]
+
+
+def _iter_range_lines(file_in, start, end):
+    """Yield the lines of a binary file that start at a byte offset in [start, end)."""
+    if start > 0:
+        file_in.seek(start - 1)
+        file_in.readline()
+    while file_in.tell() < end:
+        line = file_in.readline()
+        if not line:
+            return
+        yield line
+
+
+def clean_chunk(input_file, start, end, part_file, jsonl):
+    """Clean the JSONL rows starting in [start, end) into part_file; return the count.
+
+    Runs in a worker process. JSON-array parts hold items joined by the
+    array separator, without the surrounding brackets.
+    """
+    count = 0
+    with open(input_file, "rb") as file_in, open(part_file, "w", encoding="utf-8") as out:
+        for line in _iter_range_lines(file_in, start, end):
+            if not line.strip():
+                continue
+            row = clean_entry(json.loads(line))
+            if jsonl:
+                out.write(json.dumps(row, ensure_ascii=False) + "\n")
+            else:
+                out.write((ARRAY_ITEM_SEPARATOR if count else "") + array_item(row))
+            count += 1
+    return count
+
+
+def _is_json_array(filename):
+    """Return True when the file's first non-whitespace byte opens a JSON array."""
+    with open(filename, "rb") as file_in:
+        while True:
+            block = file_in.read(4096)
+            stripped = block.lstrip()
+            if not block or stripped:
+                return stripped[:1] == b"["
+
+
+def _concatenate(parts, output_file, jsonl):
+    """Write (count, part path) pairs, in order, into output_file as one document."""
+    written = 0
+    with open(output_file, "w", encoding="utf-8") as out:
+        for count, part in parts:
+            if not count:
+                continue
+            if not jsonl:
+                out.write("[\n  " if not written else ARRAY_ITEM_SEPARATOR)
+            with open(part, "r", encoding="utf-8") as part_in:
+                shutil.copyfileobj(part_in, out)
+            written += count
+        if not jsonl:
+            out.write("\n]" if written else "[]")
+    return written
+
+
+def _submit_chunks(pool, input_file, ranges, part_dir, jsonl):
+    """Submit one clean_chunk per byte range; return [(future, part path)] in order."""
+    parts = []
+    for index, (start, end) in enumerate(ranges):
+        part = os.path.join(part_dir, f"part-{index:05d}")
+        parts.append((pool.submit(clean_chunk, input_file, start, end, part, jsonl), part))
+    return parts
+
+
+def run_parallel_clean(
+    input_file="applicant_data.jsonl",
+    output_file="llm_extend_applicant_data.json",
+    workers=None,
+    chunk_bytes=DEFAULT_CHUNK_BYTES,
+):
+    """Clean a JSONL file across worker processes and return the row count.
+
+    ``workers`` defaults to the CPU count. Output is JSONL for a ``.jsonl``
+    output_file and a save_data-style JSON array otherwise, in input order.
+    JSON-array input cannot be split by byte offset, so it is cleaned by
+    ``run_clean(stream=True)`` in this process instead.
+    """
+    if _is_json_array(input_file):
+        return run_clean(input_file, output_file, stream=True)
+
+    jsonl = output_file.endswith(".jsonl")
+    ranges = split_byte_ranges(os.path.getsize(input_file), chunk_bytes)
+    out_dir = os.path.dirname(os.path.abspath(output_file))
+    with tempfile.TemporaryDirectory(dir=out_dir) as part_dir:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+            parts = _submit_chunks(pool, input_file, ranges, part_dir, jsonl)
+            count = _concatenate(
+                ((future.result(), part) for future, part in parts), output_file, jsonl
+            )
+    print("Saved cleaned entries:", count)
+    print("Chunks:", len(ranges))
+    return count
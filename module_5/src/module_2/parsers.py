@@ -0,0 +1,388 @@
+"""HTML parser backends for GradCafe listing and detail pages.
+
+Both backends expose the same methods and return identical records:
+
+- ``SoupBackend`` uses BeautifulSoup with the pure-Python ``html.parser``.
+- ``LxmlBackend`` walks an ``lxml.html`` tree directly (C parser, no soup layer).
+
+With ``partial=True`` a backend first slices the raw HTML down to the one
+element it needs (the first ``<table>``, or the ``<dl>`` inside ``<main>``)
+and parses only that fragment, falling back to a full parse whenever the
+slice looks unsafe.
+"""
+
+import importlib
+import re
+from functools import lru_cache
+
+from bs4 import BeautifulSoup
+
+from module_2.status_parse import MONTH_NAMES
+
+
+SITE_ROOT = "https://www.thegradcafe.com"
+SEASONS = {"fall", "spring", "summer", "winter"}
+RESULT_ID_RE = re.compile(r"/result/(\d+)(?=$|[/?#])")
+XML_DECLARATION_RE = re.compile(r"^\s*<\?xml[^>]*>")
+# Raw-text elements: their text is code, and BeautifulSoup get_text leaves it out.
+NON_TEXT_TAGS = ("script", "style")
+# Detail-page notifications read "on 29/01/2026 via E-mail" (day first).
+NOTIFIED_ON_RE = re.compile(r"on\s+(\d{1,2})/(\d{1,2})/\d{4}\b", re.I)
+# Decision labels, read only when revisiting a page (see ``parse_detail``).
+DECISION_FIELDS = {"decision": "decision_raw", "notification": "notification_raw"}
+
+
+RESULT_PREFIX = f"{SITE_ROOT}/result/"
+
+
+def result_id(url):
+    """Return the numeric GradCafe result id at the end of a result URL, or None."""
+    url = url or ""
+    if url.startswith(RESULT_PREFIX) and url[len(RESULT_PREFIX):].isdigit():
+        return int(url[len(RESULT_PREFIX):])
+    match = RESULT_ID_RE.search(url)
+    return int(match.group(1)) if match else None
+
+
+def has_meta_info(row_text):
+    """Return True when row text likely contains semester/citizenship metadata."""
+    lowered = row_text.lower()
+    markers = ("fall", "spring", "summer", "winter", "international", "american")
+    return any(marker in lowered for marker in markers)
+
+
+def extract_semester(meta_text):
+    """Extract season and year (for example, 'Fall 2026') from free text."""
+    tokens = meta_text.split()
+    for idx in range(len(tokens) - 1):
+        season = tokens[idx].lower()
+        year = tokens[idx + 1]
+        if season in SEASONS and year.isdigit() and len(year) == 4:
+            return f"{tokens[idx]} {year}"
+    return None
+
+
+def apply_detail_field(detail_data, label, value, decision=False):
+    """Map one detail-page label/value pair into output fields.
+
+    The decision and notification labels are mapped only when ``decision``
+    is True, so scraped records keep their listing fields only.
+    """
+    field_map = {
+        "undergrad gpa": "gpa_raw",
+        "program": "program_raw",
+        "degree type": "degree_type_raw",
+        "note": "comments_raw",
+        **(DECISION_FIELDS if decision else {}),
+    }
+    for marker, key in field_map.items():
+        if marker in label:
+            detail_data[key] = value
+            return
+    if "degree's country of origin" in label:
+        detail_data["international_american_raw"] = (
+            "American" if value == "American" else "International"
+        )
+
+
+def detail_status(detail_data):
+    """Build a listing-style status ('Accepted on 12 Feb') from detail fields.
+
+    The notification date is rewritten the way listing rows show it; when it
+    cannot be read the status is the decision word alone.
+    """
+    decision = (detail_data.get("decision_raw") or "").strip()
+    if not decision:
+        return None
+    match = NOTIFIED_ON_RE.match((detail_data.get("notification_raw") or "").strip())
+    if match is None or not 1 <= int(match.group(2)) <= 12:
+        return decision
+    month = MONTH_NAMES[int(match.group(2)) - 1][:3].title()
+    return f"{decision} on {int(match.group(1))} {month}"
+
+
+def apply_gre_field(detail_data, label, value):
+    """Map GRE labels while preserving the first observed value per field."""
+    rules = (
+        ("gre general", "gre_score_raw"),
+        ("gre verbal", "gre_v_score_raw"),
+        ("analytical writing", "gre_aw_raw"),
+    )
+    for marker, key in rules:
+        if marker in label and not detail_data.get(key):
+            detail_data[key] = value
+            return
+
+
+@lru_cache(maxsize=None)
+def _tag_patterns(tag):
+    """Return compiled (opening, closing) tag regexes for a tag name."""
+    return (
+        re.compile(rf"<{tag}[\s>/]", re.IGNORECASE),
+        re.compile(rf"</{tag}\s*>", re.IGNORECASE),
+    )
+
+
+def _in_raw_text(html, pos):
+    """Return True when pos falls inside a comment, script, or style block."""
+    for opener, closer in (("<!--", "-->"), ("<script", "</script"), ("<style", "</style")):
+        if html.rfind(opener, 0, pos) > html.rfind(closer, 0, pos):
+            return True
+    return False
+
+
+def _search_markup(pattern, html, start, end=None):
+    """Return the first pattern match at or after start that is real markup."""
+    end = len(html) if end is None else end
+    found = pattern.search(html, start, end)
+    while found and _in_raw_text(html, found.start()):
+        found = pattern.search(html, found.end(), end)
+    return found
+
+
+def slice_element(html, tag, parent=None):
+    """Return the source text of the first <tag> element (inside <parent>), or None.
+
+    Matches inside comments, scripts, and styles are skipped. None means the
+    cheap slice is not trustworthy (missing or nested tags, or the element
+    outside its parent) and the caller should parse the whole document.
+    """
+    start = 0
+    parent_close = None
+    if parent:
+        parent_open, parent_close = _tag_patterns(parent)
+        found = _search_markup(parent_open, html, 0)
+        if not found:
+            return None
+        start = found.end()
+    tag_open, tag_close = _tag_patterns(tag)
+    opened = _search_markup(tag_open, html, start)
+    if not opened:
+        return None
+    closed = _search_markup(tag_close, html, opened.end())
+    if not closed or _search_markup(tag_open, html, opened.end(), closed.start()):
+        return None
+    if parent_close is not None:
+        parent_end = _search_markup(parent_close, html, start)
+        if parent_end and parent_end.start() < closed.end():
+            return None
+    return html[opened.start():closed.end()]
+
+
+def build_row_record(cells, href, meta_text):
+    """Build the raw listing record from cell texts, link href, and meta text."""
+    return {
+        "program_raw": None,
+        "university_raw": cells[0],
+        "comments_raw": None,
+        "date_added_raw": cells[2],
+        "url": f"{SITE_ROOT}{href}" if href is not None else None,
+        "applicant_status_raw": cells[3],
+        "semester_year_start_raw": extract_semester(meta_text) if meta_text else None,
+        "international_american_raw": None,
+        "gre_score_raw": None,
+        "gre_v_score_raw": None,
+        "degree_type_raw": None,
+        "gpa_raw": None,
+        "gre_aw_raw": None,
+    }
+
+
+def find_element(first, html, tag, parent=None, partial=False):
+    """Return first(html, tag, parent), trying a sliced fragment first when partial."""
+    if partial:
+        fragment = slice_element(html, tag, parent)
+        if fragment is not None:
+            element = first(fragment, tag)
+            if element is not None:
+                return element
+    return first(html, tag, parent)
+
+
+class SoupBackend:
+    """BeautifulSoup backend using the stdlib html.parser (always available)."""
+
+    name = "html.parser"
+
+    def __init__(self, partial=False):
+        """Parse only the needed fragment of each page when partial is True."""
+        self.partial = partial
+
+    def _first(self, html, tag, parent=None):
+        """Parse html and return the first tag element (inside parent), or None."""
+        scope = BeautifulSoup(html, "html.parser")
+        if parent:
+            scope = scope.find(parent)
+        return scope.find(tag) if scope is not None else None
+
+    def row_text(self, row):
+        """Return whitespace-joined text of a listing row."""
+        return row.get_text(" ", strip=True)
+
+    def listing_rows(self, html):
+        """Return data rows of the first table, or [] when there is no table."""
+        table = find_element(self._first, html, "table", partial=self.partial)
+        if table is None:
+            return []
+        return table.find_all("tr")[1:]
+
+    def parse_row(self, main_row, meta_row):
+        """Parse one listing row and optional metadata row into raw schema fields."""
+        tds = main_row.find_all("td")
+        if len(tds) < 4:
+            return None
+        cells = [td.get_text(" ", strip=True) for td in tds[:4]]
+        href = None
+        link = main_row.find("a")
+        if link and link.has_attr("href"):
+            href = link["href"]
+        meta_text = self.row_text(meta_row) if meta_row else None
+        return build_row_record(cells, href, meta_text)
+
+    def extract_detail_from_dl(self, dl, decision=False):
+        """Parse detail fields from a detail-page definition list."""
+        detail_data = {}
+        for block in dl.find_all("div"):
+            dt = block.find("dt")
+            dd = block.find("dd")
+            if not dt or not dd:
+                continue
+            label = dt.get_text(" ", strip=True).lower()
+            apply_detail_field(detail_data, label, dd.get_text(" ", strip=True), decision)
+
+        ul = dl.find("ul")
+        if not ul:
+            return detail_data
+        for li in ul.find_all("li"):
+            spans = li.find_all("span")
+            if len(spans) < 2:
+                continue
+            label = spans[0].get_text(" ", strip=True).lower()
+            apply_gre_field(detail_data, label, spans[1].get_text(" ", strip=True))
+        return detail_data
+
+    def parse_detail(self, html, decision=False):
+        """Return detail fields from the first <main><dl>, or {} when absent.
+
+        ``decision=True`` also reads the decision and notification fields.
+        """
+        dl = find_element(self._first, html, "dl", "main", self.partial)
+        if dl is None:
+            return {}
+        return self.extract_detail_from_dl(dl, decision)
+
+
+def _lxml_text(element):
+    """Match BeautifulSoup get_text(' ', strip=True) for an lxml element."""
+    return " ".join(part.strip() for part in element.itertext() if part.strip())
+
+
+class LxmlBackend:
+    """lxml.html backend: same records as SoupBackend, parsed by libxml2."""
+
+    name = "lxml"
+
+    def __init__(self, lxml_html, partial=False):
+        """Bind the imported lxml.html module; see SoupBackend for partial."""
+        self._html = lxml_html
+        self.partial = partial
+
+    def _first(self, html, tag, parent=None):
+        """Parse html and return the first tag element (inside parent), or None."""
+        if not html or not html.strip():
+            return None
+        scope = self._parse(html)
+        if scope is not None and parent:
+            scope = next(scope.iter(parent), None)
+        return next(scope.iter(tag), None) if scope is not None else None
+
+    def _parse(self, html):
+        """Return the lxml tree for html without its raw-text elements, or None.
+
+        lxml refuses str input with an encoding declaration, so a leading
+        ``<?xml ...?>`` declaration is dropped first. A page lxml still cannot read (no
+        elements at all, say only a comment) gives None, so one bad page is
+        skipped like a page without the wanted element instead of stopping
+        the scrape.
+        """
+        try:
+            root = self._html.fromstring(XML_DECLARATION_RE.sub("", html, count=1))
+        except (ValueError, self._html.etree.ParserError):
+            return None
+        self._html.etree.strip_elements(root, *NON_TEXT_TAGS, with_tail=False)
+        return root
+
+    def row_text(self, row):
+        """Return whitespace-joined text of a listing row."""
+        return _lxml_text(row)
+
+    def listing_rows(self, html):
+        """Return data rows of the first table, or [] when there is no table."""
+        table = find_element(self._first, html, "table", partial=self.partial)
+        if table is None:
+            return []
+        return list(table.iter("tr"))[1:]
+
+    def parse_row(self, main_row, meta_row):
+        """Parse one listing row and optional metadata row into raw schema fields."""
+        tds = list(main_row.iter("td"))
+        if len(tds) < 4:
+            return None
+        cells = [_lxml_text(td) for td in tds[:4]]
+        link = next(main_row.iter("a"), None)
+        href = link.get("href") if link is not None else None
+        meta_text = self.row_text(meta_row) if meta_row is not None else None
+        return build_row_record(cells, href, meta_text)
+
+    def extract_detail_from_dl(self, dl, decision=False):
+        """Parse detail fields from a detail-page definition list."""
+        detail_data = {}
+        for block in dl.iterdescendants("div"):
+            dt = next(block.iterdescendants("dt"), None)
+            dd = next(block.iterdescendants("dd"), None)
+            if dt is None or dd is None:
+                continue
+            apply_detail_field(detail_data, _lxml_text(dt).lower(), _lxml_text(dd), decision)
+
+        ul = next(dl.iterdescendants("ul"), None)
+        if ul is None:
+            return detail_data
+        for li in ul.iterdescendants("li"):
+            spans = list(li.iterdescendants("span"))
+            if len(spans) < 2:
+                continue
+            apply_gre_field(detail_data, _lxml_text(spans[0]).lower(), _lxml_text(spans[1]))
+        return detail_data
+
+    def parse_detail(self, html, decision=False):
+        """Return detail fields from the first <main><dl>, or {} when absent."""
+        dl = find_element(self._first, html, "dl", "main", self.partial)
+        if dl is None:
+            return {}
+        return self.extract_detail_from_dl(dl, decision)
+
+
+def _import_lxml_html():
+    """Return the lxml.html module, or None when lxml is not installed."""
+    try:
+        return importlib.import_module("lxml.html")
+    except ImportError:
+        return None
+
+
+def get_parser_backend(name="auto", partial=False):
+    """Return a parser backend by name: 'auto', 'lxml', or 'html.parser'.
+
+    'auto' picks lxml when it is installed and falls back to html.parser.
+    ``partial`` turns on fragment parsing (see ``slice_element``).
+    """
+    if name == SoupBackend.name:
+        return SoupBackend(partial)
+    if name not in ("auto", LxmlBackend.name):
+        raise ValueError(f"Unknown parser backend: {name}")
+    lxml_html = _import_lxml_html()
+    if lxml_html is not None:
+        return LxmlBackend(lxml_html, partial)
+    if name == LxmlBackend.name:
+        raise ValueError("Parser backend 'lxml' requested but lxml is not installed")
+    return SoupBackend(partial)
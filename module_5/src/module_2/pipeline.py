@@ -0,0 +1,143 @@
+"""Two-stage detail pipeline: I/O threads download, a process pool parses.
+
+Fetching is I/O-bound and parsing is GIL-bound CPU work, so the two run in
+separate pools joined by a bounded queue. When parsers fall behind, the
+queue fills and downloads block, which caps memory held in raw HTML.
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import suppress
+from functools import lru_cache
+
+from module_2.parsers import get_parser_backend
+
+
+@lru_cache(maxsize=None)
+def _worker_backend(parser, partial):
+    """Return the parser backend for this worker process, built once."""
+    return get_parser_backend(parser, partial)
+
+
+def parse_detail_html(html, parser="auto", partial=True):
+    """Parse detail-page HTML into raw fields (runs inside a parser process)."""
+    return _worker_backend(parser, partial).parse_detail(html)
+
+
+class ParsePipeline:
+    """Download detail pages on I/O threads and parse them in worker processes.
+
+    ``io_workers`` threads fetch raw HTML into a queue holding at most
+    ``queue_size`` pages; ``parse_workers`` processes (default: CPU count)
+    turn each page into fields. Use as a context manager, or call close().
+    """
+
+    def __init__(self, io_workers=8, parse_workers=None, queue_size=32):
+        """Start both pools; sizes must be at least 1."""
+        parse_workers = parse_workers or os.cpu_count() or 1
+        if min(io_workers, parse_workers, queue_size) < 1:
+            raise ValueError("Pipeline pool and queue sizes must be at least 1")
+        self.sizes = {
+            "io_workers": io_workers,
+            "parse_workers": parse_workers,
+            "queue_size": queue_size,
+        }
+        self._io = ThreadPoolExecutor(max_workers=io_workers)
+        self._parse = ProcessPoolExecutor(max_workers=parse_workers)
+        self._lock = threading.Lock()
+        self._stats = {
+            "fetched": 0,
+            "fetch_failed": 0,
+            "parsed": 0,
+            "queue_samples": 0,
+            "queue_depth_total": 0,
+            "max_queue_depth": 0,
+            "parse_wait_seconds": 0.0,
+        }
+
+    def __enter__(self):
+        """Return the pipeline for use in a with block."""
+        return self
+
+    def __exit__(self, *_exc):
+        """Shut both pools down."""
+        self.close()
+
+    def close(self):
+        """Wait for in-flight work and shut both pools down."""
+        self._io.shutdown(wait=True)
+        self._parse.shutdown(wait=True)
+
+    def stats(self):
+        """Return counters, queue-depth metrics, and pool sizes."""
+        with self._lock:
+            stats = dict(self._stats)
+        samples = stats.pop("queue_samples")
+        total = stats.pop("queue_depth_total")
+        stats["mean_queue_depth"] = round(total / samples, 2) if samples else 0.0
+        return {**stats, **self.sizes}
+
+    def _download(self, pages, fetch, index, url):
+        """Fetch one page and queue (index, html); html is None on failure."""
+        html = None
+        with suppress(Exception):
+            html = fetch(url)
+        with self._lock:
+            self._stats["fetched" if html is not None else "fetch_failed"] += 1
+        pages.put((index, html))
+
+    def _next_page(self, pages):
+        """Take one downloaded page off the queue and sample its depth."""
+        depth = pages.qsize()
+        item = pages.get()
+        with self._lock:
+            self._stats["queue_samples"] += 1
+            self._stats["queue_depth_total"] += depth
+            self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], depth)
+        return item
+
+    def _result(self, future):
+        """Wait for one parse result and count it; failed fetches yield {}."""
+        if future is None:
+            return {}
+        started = time.perf_counter()
+        fields = future.result()
+        with self._lock:
+            self._stats["parsed"] += 1
+            self._stats["parse_wait_seconds"] += time.perf_counter() - started
+        return fields
+
+    def map(self, fetch, urls, parser_spec=("auto", True)):
+        """Yield parsed fields for each URL in input order.
+
+        ``fetch(url)`` returns HTML text and runs on the I/O threads;
+        ``parser_spec`` is the (backend name, partial) pair used by workers.
+        Each call has its own bounded queue; the pools are shared.
+        """
+        urls = list(urls)
+        pages = queue.Queue(maxsize=self.sizes["queue_size"])
+        downloads = [
+            self._io.submit(self._download, pages, fetch, index, url)
+            for index, url in enumerate(urls)
+        ]
+        parsing = {}
+        received = 0
+        try:
+            for index in range(len(urls)):
+                while index not in parsing:
+                    page_index, html = self._next_page(pages)
+                    received += 1
+                    parsing[page_index] = (
+                        self._parse.submit(parse_detail_html, html, *parser_spec)
+                        if html is not None
+                        else None
+                    )
+                yield self._result(parsing.pop(index))
+        finally:
+            # Abandoned early: unblock downloads still waiting on a full queue.
+            pending = sum(1 for download in downloads if not download.cancel())
+            for _ in range(pending - received):
+                pages.get()
@@ -0,0 +1,206 @@
+"""Shared request pacing and retry policy for scraper workers."""
+
+import http.client
+import random
+import threading
+import time
+
+from module_2.http_client import HttpError
+
+
+# Statuses that mean "slow down": they shrink the limiter rate and are retried.
+THROTTLE_STATUSES = {429, 503}
+# Other transient statuses that are retried without touching the rate.
+RETRY_STATUSES = THROTTLE_STATUSES | {500, 502, 504}
+TRANSIENT_ERRORS = (OSError, http.client.HTTPException)
+
+
+class AdaptiveRateLimiter:
+    """Thread-safe token bucket whose refill rate adapts AIMD-style.
+
+    Every success adds ``increase`` requests/second (additive increase) up to
+    the upper bound; every throttling response multiplies the rate by
+    ``decrease`` (multiplicative decrease) down to the lower bound.
+    """
+
+    increase = 0.25
+    decrease = 0.5
+
+    def __init__(self, rate=8.0, burst=8, bounds=(0.5, 32.0)):
+        """Start with a full bucket refilling at rate tokens/second."""
+        self._burst = burst
+        self._bounds = bounds
+        self._bucket = {"rate": float(rate), "tokens": float(burst), "updated": time.monotonic()}
+        self._lock = threading.Lock()
+        self._stats = {"acquired": 0, "waited_seconds": 0.0, "throttled": 0}
+
+    @property
+    def rate(self):
+        """Return the current refill rate in requests per second."""
+        with self._lock:
+            return self._bucket["rate"]
+
+    def stats(self):
+        """Return a copy of acquire/wait/throttle counters plus the current rate."""
+        with self._lock:
+            return {**self._stats, "rate": self._bucket["rate"]}
+
+    def acquire(self):
+        """Block until a token is available, then take it."""
+        while True:
+            with self._lock:
+                bucket = self._bucket
+                now = time.monotonic()
+                elapsed = max(0.0, now - bucket["updated"])
+                bucket["tokens"] = min(self._burst, bucket["tokens"] + elapsed * bucket["rate"])
+                bucket["updated"] = now
+                if bucket["tokens"] >= 1:
+                    bucket["tokens"] -= 1
+                    self._stats["acquired"] += 1
+                    return
+                wait = (1 - bucket["tokens"]) / bucket["rate"]
+                self._stats["waited_seconds"] += wait
+            time.sleep(wait)
+
+    def on_success(self):
+        """Additively raise the rate after a successful request."""
+        with self._lock:
+            self._bucket["rate"] = min(self._bounds[1], self._bucket["rate"] + self.increase)
+
+    def on_throttle(self):
+        """Multiplicatively cut the rate after a 429/503 response."""
+        with self._lock:
+            self._bucket["rate"] = max(self._bounds[0], self._bucket["rate"] * self.decrease)
+            self._stats["throttled"] += 1
+
+
+class RetryPolicy:
+    """Jittered exponential backoff with a retry budget shared across workers."""
+
+    def __init__(self, max_attempts=4, base_delay=0.5, max_delay=30.0, budget=50):
+        """Allow up to max_attempts tries per URL and budget retries per run."""
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._budget = budget
+        self._lock = threading.Lock()
+        self._stats = {"retries": 0, "budget_exhausted": 0}
+
+    def stats(self):
+        """Return a copy of retry counters and the remaining budget."""
+        with self._lock:
+            return {**self._stats, "budget_remaining": self._budget}
+
+    def consume(self):
+        """Take one retry from the shared budget; False once it is spent."""
+        with self._lock:
+            if self._budget <= 0:
+                self._stats["budget_exhausted"] += 1
+                return False
+            self._budget -= 1
+            self._stats["retries"] += 1
+            return True
+
+    def delay(self, attempt, retry_after=None):
+        """Return a full-jitter backoff delay, never shorter than Retry-After."""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+        wait = random.uniform(0, ceiling)
+        if retry_after is not None:
+            wait = max(wait, min(self.max_delay, retry_after))
+        return wait
+
+
+class RefillingRetryPolicy(RetryPolicy):
+    """RetryPolicy whose budget refills over time, for callers outside a scrape run.
+
+    A run's budget caps retries for that run; a process-wide default (used by
+    the enrichment worker and revisit passes) would otherwise be spent once
+    and never come back. Here spent retries return evenly over ``window``
+    seconds, so at most ``budget`` retries happen in any window.
+    """
+
+    def __init__(self, budget=50, window=60.0):
+        """Allow budget retries per window seconds."""
+        super().__init__(budget=budget)
+        self._capacity = budget
+        self._seconds_per_retry = window / budget
+        self._refilled = time.monotonic()
+
+    def consume(self):
+        """Credit retries earned since the last call, then take one as RetryPolicy does."""
+        with self._lock:
+            now = time.monotonic()
+            earned = int((now - self._refilled) / self._seconds_per_retry)
+            self._budget = min(self._capacity, self._budget + earned)
+            if self._budget == self._capacity:
+                self._refilled = now
+            else:
+                self._refilled += earned * self._seconds_per_retry
+        return super().consume()
+
+
+def _retry_after(err):
+    """Return a numeric Retry-After header (seconds) from an HttpError, if any."""
+    value = (err.headers or {}).get("retry-after", "")
+    return float(value) if value.strip().isdigit() else None
+
+
+def fetch_with_retry(fetch, url, limiter, policy):
+    """Call fetch(url) paced by limiter, retrying transient failures per policy."""
+    attempt = 0
+    while True:
+        limiter.acquire()
+        try:
+            result = fetch(url)
+        except HttpError as err:
+            if err.status in THROTTLE_STATUSES:
+                limiter.on_throttle()
+            retryable = err.status in RETRY_STATUSES
+            wait_floor = _retry_after(err)
+            failure = err
+        except TRANSIENT_ERRORS as err:
+            retryable = True
+            wait_floor = None
+            failure = err
+        else:
+            limiter.on_success()
+            return result
+
+        attempt += 1
+        if not retryable or attempt >= policy.max_attempts or not policy.consume():
+            raise failure
+        time.sleep(policy.delay(attempt - 1, wait_floor))
+
+
+class PacedSession:
+    """HttpSession wrapper that paces and retries every network request.
+
+    Pass it to ``ResponseCache.fetch(url, session=...)`` around the cache's
+    own session rather than wrapping the cache, so cache hits neither wait
+    for a token nor raise the limiter's rate.
+    """
+
+    def __init__(self, session, limiter, policy):
+        """Pace session's requests with limiter and retry them per policy."""
+        self._session = session
+        self._limiter = limiter
+        self._policy = policy
+
+    def request(self, url, headers=None):
+        """Return session.request(url), retrying statuses in RETRY_STATUSES.
+
+        A retryable status that is still failing after the last attempt is
+        raised as HttpError; other statuses (304, 404) are returned as-is.
+        """
+
+        def _request(target):
+            response = self._session.request(target, headers=headers)
+            if response.status in RETRY_STATUSES:
+                raise HttpError(target, response.status, response.headers)
+            return response
+
+        return fetch_with_retry(_request, url, self._limiter, self._policy)
+
+    def get_text(self, url):
+        """Return session.get_text(url), paced and retried."""
+        return fetch_with_retry(self._session.get_text, url, self._limiter, self._policy)
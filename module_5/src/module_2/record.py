@@ -0,0 +1,104 @@
+"""Compact in-memory form of cleaned applicant rows.
+
+A ``CompactRecord`` stores the known row fields in ``__slots__`` instead
+of a per-row dict, and interns repeated string values (university names,
+terms, statuses, scores) so equal strings share one object across rows.
+The original key order is kept as a shared tuple, and unknown keys are
+kept aside, so ``to_dict`` gives back exactly the row that was read and
+JSON written from records is byte-identical to JSON written from dicts.
+"""
+
+import json
+import sys
+
+
+# Cleaned row keys (clean.OUTPUT_KEYS) followed by the fields the LLM step adds.
+RECORD_KEYS = (
+    "program",
+    "university",
+    "comments",
+    "date_added",
+    "semester_year_start",
+    "citizenship",
+    "gre_total",
+    "gre_verbal",
+    "gre_writing",
+    "degree_type",
+    "gpa",
+    "url",
+    "applicant_status",
+    "acceptance_date",
+    "rejection_date",
+    "llm-generated-program",
+    "llm-generated-university",
+)
+# Free-text or unique per row, so interning would only grow the intern table.
+NOT_INTERNED = frozenset(("comments", "url"))
+SLOT_NAMES = {key: key.replace("-", "_") for key in RECORD_KEYS}
+MAX_KEY_ORDERS = 1024
+_KEY_ORDERS = {}
+
+
+def _shared_keys(keys):
+    """Return one shared tuple per distinct key order (up to MAX_KEY_ORDERS of them)."""
+    shared = _KEY_ORDERS.get(keys)
+    if shared is None:
+        if len(_KEY_ORDERS) >= MAX_KEY_ORDERS:
+            return keys
+        shared = _KEY_ORDERS[keys] = keys
+    return shared
+
+
+class CompactRecord:
+    """One row with slot-stored fields and interned string values.
+
+    Reads go through ``get(key, default)`` like a dict. Keys the row
+    never had return the default, so missing and null stay distinguishable
+    in ``to_dict``.
+    """
+
+    __slots__ = (*SLOT_NAMES.values(), "_keys", "_extra")
+
+    def __init__(self, row):
+        """Copy a row dict's values into slots, interning repeated strings."""
+        extra = None
+        for key, value in row.items():
+            slot = SLOT_NAMES.get(key)
+            if slot is None:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+                continue
+            if isinstance(value, str) and key not in NOT_INTERNED:
+                value = sys.intern(value)
+            setattr(self, slot, value)
+        self._keys = _shared_keys(tuple(row))
+        self._extra = extra
+
+    def get(self, key, default=None):
+        """Return the value stored for key, or default when the row has no such key."""
+        slot = SLOT_NAMES.get(key)
+        if slot is None:
+            return default if self._extra is None else self._extra.get(key, default)
+        return getattr(self, slot, default)
+
+    def to_dict(self):
+        """Return the row as a dict with its original keys, in their original order."""
+        return {key: self.get(key) for key in self._keys}
+
+
+def load_records(file_in):
+    """Read a JSON array of rows from an open file as CompactRecords.
+
+    Each object is compacted as soon as it is decoded, so the full list of
+    row dicts never exists at once. Nested objects are compacted too and
+    ``record_to_dict`` writes them back unchanged.
+    """
+    return json.load(file_in, object_hook=CompactRecord)
+
+
+def record_to_dict(obj):
+    """json default hook: serialize a CompactRecord as its row dict."""
+    if isinstance(obj, CompactRecord):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
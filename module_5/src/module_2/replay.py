@@ -0,0 +1,222 @@
+"""Local GradCafe stand-in for scraper tests and benchmarks.
+
+``ReplayServer`` serves ``/survey/?page=N`` and ``/result/<id>`` on
+127.0.0.1 from a page source. The source is either a ``RecordedCorpus``
+(saved ``listing_page_N.html`` / ``detail_ID.html`` files) or a
+``SyntheticSite`` generator. Latency and error injection are configurable.
+Point the scraper at it with the ``base_url`` scrape option.
+"""
+
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+NO_RESULTS_HTML = "<html><body><main><p>No results found.</p></main></body></html>"
+RESULT_PATH_RE = re.compile(r"^/result/(\d+)$")
+UNIVERSITIES = (
+    "Johns Hopkins University",
+    "Stanford University",
+    "Carnegie Mellon University",
+    "University of Michigan",
+    "Georgia Institute of Technology",
+)
+PROGRAMS = ("Computer Science", "Data Science", "Electrical Engineering", "Statistics")
+DECISIONS = ("Accepted", "Rejected", "Wait listed", "Interview")
+TERMS = ("Fall 2026", "Spring 2026", "Fall 2025")
+
+
+class SyntheticSite:
+    """Deterministic generator of listing and detail pages shaped like GradCafe.
+
+    Page 1 holds the newest ids; each of ``pages`` pages lists
+    ``rows_per_page`` results, each followed by a semester/citizenship row.
+    """
+
+    def __init__(self, pages=20, rows_per_page=20, newest_id=990000):
+        """Describe a site with ids counting down from newest_id."""
+        self.pages = pages
+        self.rows_per_page = rows_per_page
+        self.newest_id = newest_id
+
+    def _pick(self, options, result_id, salt=0):
+        """Choose one of options deterministically for a result id."""
+        return options[(result_id * 7 + salt) % len(options)]
+
+    def listing(self, page):
+        """Return listing HTML for a 1-based page, or a no-results page past the end."""
+        if not 1 <= page <= self.pages:
+            return NO_RESULTS_HTML
+        first = self.newest_id - (page - 1) * self.rows_per_page
+        rows = []
+        for result_id in range(first, first - self.rows_per_page, -1):
+            decision = self._pick(DECISIONS, result_id)
+            rows.append(
+                f"<tr><td>{self._pick(UNIVERSITIES, result_id)}</td>"
+                f"<td>{self._pick(PROGRAMS, result_id, 1)}</td><td>January 30, 2026</td>"
+                f"<td>{decision} on 29 Jan</td>"
+                f'<td><a href="/result/{result_id}">See More</a></td></tr>'
+                f'<tr><td colspan="4">{self._pick(TERMS, result_id)} &nbsp; '
+                f"{'International' if result_id % 3 else 'American'}</td></tr>"
+            )
+        header = "<tr><th>School</th><th>Program</th><th>Added On</th><th>Decision</th></tr>"
+        return f"<html><body><table>{header}{''.join(rows)}</table></body></html>"
+
+    def detail(self, result_id):
+        """Return detail HTML for a result id listed on some page, else None."""
+        oldest = self.newest_id - self.pages * self.rows_per_page
+        if not oldest < result_id <= self.newest_id:
+            return None
+        fields = (
+            ("Institution", self._pick(UNIVERSITIES, result_id)),
+            ("Program", self._pick(PROGRAMS, result_id, 1)),
+            ("Degree Type", "Masters" if result_id % 2 else "PhD"),
+            ("Degree's Country of Origin", "International" if result_id % 3 else "American"),
+            ("Decision", self._pick(DECISIONS, result_id)),
+            ("Notification", "on 29/01/2026 via E-mail"),
+            ("Undergrad GPA", f"{3 + (result_id % 100) / 100:.2f}"),
+        )
+        blocks = "".join(f"<div><dt>{label}</dt><dd>{value}</dd></div>" for label, value in fields)
+        gre = (
+            f"<li><span>GRE General:</span> <span>{300 + result_id % 40}</span></li>"
+            f"<li><span>GRE Verbal:</span> <span>{150 + result_id % 20}</span></li>"
+            "<li><span>Analytical Writing:</span> <span>4.00</span></li>"
+        )
+        return (
+            f"<html><body><main><h1>Result {result_id}</h1><dl>{blocks}"
+            f"<div><dt>GRE General:</dt><dd><ul>{gre}</ul></dd></div></dl></main></body></html>"
+        )
+
+
+class RecordedCorpus:
+    """Serve saved pages named listing_page_N.html and detail_ID.html from a directory."""
+
+    def __init__(self, directory):
+        """Read pages lazily from directory."""
+        self.directory = directory
+
+    def _read(self, name):
+        """Return a saved page's text, or None when it was never recorded."""
+        path = os.path.join(self.directory, name)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as file_in:
+            return file_in.read()
+
+    def listing(self, page):
+        """Return the recorded listing page, or a no-results page."""
+        return self._read(f"listing_page_{page}.html") or NO_RESULTS_HTML
+
+    def detail(self, result_id):
+        """Return the recorded detail page, or None."""
+        return self._read(f"detail_{result_id}.html")
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    """Route survey and result paths to the server's page source."""
+
+    protocol_version = "HTTP/1.1"
+
+    def _send(self, status, body, headers=None):
+        """Write a response with Content-Length so keep-alive works."""
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def serve(self):
+        """Serve one page after the configured latency, or an injected error."""
+        status, body, headers = self.server.replay.respond(self.path)
+        self._send(status, body, headers)
+
+    do_GET = serve
+
+    def log_message(self, *_args):
+        """Keep request logging quiet."""
+
+
+class ReplayServer:
+    """Threaded local HTTP server replaying a page source.
+
+    Each request waits ``latency`` seconds; a fraction ``error_rate`` of
+    requests gets a 503 with ``Retry-After: 0`` instead of the page.
+    """
+
+    def __init__(self, site, latency=0.0, error_rate=0.0, seed=0):
+        """Bind to an ephemeral 127.0.0.1 port; call start() or use as a context manager."""
+        self.site = site
+        self._faults = {
+            "latency": latency,
+            "error_rate": error_rate,
+            "random": random.Random(seed),
+        }
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "errors": 0, "not_found": 0}
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _ReplayHandler)
+        self._server.daemon_threads = True
+        self._server.replay = self
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        """Return the server root, for the scraper's base_url option."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        """Start serving and return the server."""
+        self.start()
+        return self
+
+    def __exit__(self, *_exc):
+        """Stop serving."""
+        self.stop()
+
+    def start(self):
+        """Serve requests on a background thread."""
+        self._thread.start()
+
+    def stop(self):
+        """Shut the server down and release the port."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def stats(self):
+        """Return request, injected-error, and not-found counters."""
+        with self._lock:
+            return dict(self._stats)
+
+    def respond(self, raw_path):
+        """Return (status, body, headers) for a request path."""
+        with self._lock:
+            self._stats["requests"] += 1
+            faults = self._faults
+            failed = faults["error_rate"] and faults["random"].random() < faults["error_rate"]
+            if failed:
+                self._stats["errors"] += 1
+        if faults["latency"]:
+            time.sleep(faults["latency"])
+        if failed:
+            return 503, "busy", {"Retry-After": "0"}
+
+        parts = urlsplit(raw_path)
+        body = None
+        if parts.path.rstrip("/") == "/survey":
+            page = parse_qs(parts.query).get("page", ["1"])[0]
+            body = self.site.listing(int(page)) if page.isdigit() else None
+        else:
+            match = RESULT_PATH_RE.match(parts.path)
+            body = self.site.detail(int(match.group(1))) if match else None
+        if body is None:
+            with self._lock:
+                self._stats["not_found"] += 1
+            return 404, "not found", {}
+        return 200, body, {}
@@ -0,0 +1,200 @@
+"""Prioritized revisit schedule for result pages whose decision may still change.
+
+Each tracked result URL has a status class and a revisit interval. Pending
+rows (wait listed, interview, other) start at one day and final decisions
+(accepted, rejected) at two weeks. An unchanged visit doubles the interval up
+to the class cap; a change resets it to the base for the new class. The
+fetch budget of each pass goes to the most overdue, least settled URLs.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from module_2.parsers import detail_status
+
+
+DAY_SECONDS = 24 * 60 * 60
+DEFAULT_REVISIT_PATH = os.path.join(os.path.dirname(__file__), "revisit_schedule.sqlite3")
+# Status class -> (priority, base interval, maximum interval); lower priority runs first.
+STATUS_CLASSES = {
+    "pending": (0, 1 * DAY_SECONDS, 14 * DAY_SECONDS),
+    "final": (1, 14 * DAY_SECONDS, 180 * DAY_SECONDS),
+}
+FINAL_PREFIXES = ("accepted", "rejected")
+INTERVAL_GROWTH = 2.0
+# Detail fields whose change triggers an upsert.
+TRACKED_FIELDS = (
+    "decision_raw",
+    "notification_raw",
+    "program_raw",
+    "comments_raw",
+    "degree_type_raw",
+    "international_american_raw",
+    "gpa_raw",
+    "gre_score_raw",
+    "gre_v_score_raw",
+    "gre_aw_raw",
+)
+
+ENTRY_COLUMNS = (
+    "status",
+    "status_class",
+    "interval",
+    "next_due",
+    "fingerprint",
+    "visits",
+    "changes",
+)
+
+CREATE_REVISIT_TABLE = """
+CREATE TABLE IF NOT EXISTS revisits (
+  url TEXT PRIMARY KEY,
+  status TEXT,
+  status_class TEXT NOT NULL,
+  priority INTEGER NOT NULL,
+  interval REAL NOT NULL,
+  next_due REAL NOT NULL,
+  fingerprint TEXT,
+  visits INTEGER NOT NULL DEFAULT 0,
+  changes INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+def status_class(status):
+    """Return 'final' for accepted/rejected statuses and 'pending' otherwise."""
+    lowered = (status or "").strip().lower()
+    return "final" if lowered.startswith(FINAL_PREFIXES) else "pending"
+
+
+def _decision(status):
+    """Return the decision word(s) of a status, without its date ('accepted')."""
+    return (status or "").split(" on ", 1)[0].strip().lower()
+
+
+def fingerprint(detail_fields):
+    """Return a stable digest of the tracked detail fields."""
+    tracked = {key: detail_fields.get(key) for key in TRACKED_FIELDS}
+    return hashlib.sha1(json.dumps(tracked, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class RevisitScheduler:
+    """SQLite-backed revisit schedule with decaying per-URL intervals."""
+
+    def __init__(self, path=None):
+        """Open (or create) the schedule at path (DEFAULT_REVISIT_PATH if None)."""
+        self._db = sqlite3.connect(path or DEFAULT_REVISIT_PATH, check_same_thread=False)
+        self._db.execute(CREATE_REVISIT_TABLE)
+        self._db.commit()
+        self._lock = threading.Lock()
+
+    def close(self):
+        """Close the schedule database."""
+        self._db.close()
+
+    def track(self, rows):
+        """Start tracking (url, status) pairs not yet scheduled; return how many were new.
+
+        The first visit is due one base interval after tracking starts.
+        """
+        now = time.time()
+        params = []
+        for url, status in rows:
+            if not url:
+                continue
+            name = status_class(status)
+            priority, base, _cap = STATUS_CLASSES[name]
+            params.append((url, status, name, priority, base, now + base))
+        with self._lock:
+            before = self._db.total_changes
+            self._db.executemany(
+                "INSERT OR IGNORE INTO revisits "
+                "(url, status, status_class, priority, interval, next_due) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                params,
+            )
+            self._db.commit()
+            return self._db.total_changes - before
+
+    def due(self, limit, now=None):
+        """Return up to limit overdue URLs, pending before final, most overdue first."""
+        now = time.time() if now is None else now
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT url FROM revisits WHERE next_due <= ? "
+                "ORDER BY priority, next_due LIMIT ?",
+                (now, limit),
+            ).fetchall()
+        return [url for (url,) in rows]
+
+    def entry(self, url):
+        """Return the schedule row for url as a dict, or None."""
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {', '.join(ENTRY_COLUMNS)} FROM revisits WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(ENTRY_COLUMNS, row))
+
+    def record(self, url, detail_fields, now=None):
+        """Record a visit and reschedule; return True when the row needs an upsert.
+
+        A row changed when its decision differs from the stored status, or
+        when any tracked field differs from the previous visit.
+        """
+        now = time.time() if now is None else now
+        current = self.entry(url)
+        digest = fingerprint(detail_fields)
+        status = detail_status(detail_fields) or current["status"]
+        changed = _decision(status) != _decision(current["status"]) or (
+            current["fingerprint"] not in (None, digest)
+        )
+        name = status_class(status)
+        priority, base, cap = STATUS_CLASSES[name]
+        if changed:
+            interval = base
+        else:
+            interval = min(cap, current["interval"] * INTERVAL_GROWTH)
+        with self._lock:
+            self._db.execute(
+                "UPDATE revisits SET status = ?, status_class = ?, priority = ?, "
+                "interval = ?, next_due = ?, fingerprint = ?, visits = visits + 1, "
+                "changes = changes + ? WHERE url = ?",
+                (status, name, priority, interval, now + interval, digest, int(changed), url),
+            )
+            self._db.commit()
+        return changed
+
+    def postpone(self, url, now=None):
+        """Push a URL whose fetch failed back by its current interval."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._db.execute(
+                "UPDATE revisits SET next_due = ? + interval WHERE url = ?", (now, url)
+            )
+            self._db.commit()
+
+    def run_due(self, fetch_detail, upsert, limit=50):
+        """Revisit up to limit due URLs, upserting those whose fields changed.
+
+        ``fetch_detail(url)`` returns detail fields ({} on failure) and
+        ``upsert(url, fields)`` writes them. Returns checked/changed/failed counts.
+        """
+        stats = {"checked": 0, "changed": 0, "failed": 0}
+        for url in self.due(limit):
+            fields = fetch_detail(url)
+            if not fields:
+                self.postpone(url)
+                stats["failed"] += 1
+                continue
+            stats["checked"] += 1
+            if self.record(url, fields):
+                upsert(url, fields)
+                stats["changed"] += 1
+        return stats
@@ -1,104 +1,255 @@
 """Scrape GradCafe survey pages and extract application records."""
 
+import contextvars
+import functools
 import json
-from contextlib import suppress
-from urllib import request
-
-from bs4 import BeautifulSoup
-
-
-def _fetch_html(url):
-    """Fetch and decode HTML for a URL with a browser-like user agent."""
-    req = request.Request(url)
-    req.add_header("User-Agent", "Mozilla/5.0")
-    page = request.urlopen(req)
-    if hasattr(page, "__enter__") and hasattr(page, "__exit__"):
-        with page as opened:
-            return opened.read().decode("utf-8")
-    return page.read().decode("utf-8")
-
-
-def _has_meta_info(row_text):
-    """Return True when row text likely contains semester/citizenship metadata."""
-    lowered = row_text.lower()
-    markers = ("fall", "spring", "summer", "winter", "international", "american")
-    return any(marker in lowered for marker in markers)
-
-
-def _extract_semester(meta_text):
-    """Extract season and year (for example, 'Fall 2026') from free text."""
-    tokens = meta_text.split()
-    for idx in range(len(tokens) - 1):
-        season = tokens[idx].lower()
-        year = tokens[idx + 1]
-        if season in {"fall", "spring", "summer", "winter"} and year.isdigit() and len(year) == 4:
-            return f"{tokens[idx]} {year}"
-    return None
-
-
-def _apply_detail_field(detail_data, label, value):
-    """Map one detail-page label/value pair into output fields."""
-    field_map = {
-        "undergrad gpa": "gpa_raw",
-        "program": "program_raw",
-        "degree type": "degree_type_raw",
-        "note": "comments_raw",
-    }
-    for marker, key in field_map.items():
-        if marker in label:
-            detail_data[key] = value
-            return
-    if "degree's country of origin" in label:
-        detail_data["international_american_raw"] = (
-            "American" if value == "American" else "International"
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, suppress
+
+from module_2.checkpoint import (
+    clear_checkpoint,
+    load_checkpoint,
+    new_state,
+    record_emitted,
+    save_checkpoint,
+)
+from module_2.http_cache import ResponseCache
+from module_2.enrich_queue import LOW_PRIORITY
+from module_2.http_client import HttpSession
+from module_2.metrics import ScrapeMetrics
+from module_2.parsers import (
+    SITE_ROOT,
+    SoupBackend,
+    get_parser_backend,
+    has_meta_info,
+    result_id,
+)
+from module_2.rate_limit import (
+    AdaptiveRateLimiter,
+    PacedSession,
+    RefillingRetryPolicy,
+    RetryPolicy,
+)
+
+
+# Defaults for scrape_data(options=...); unknown keys are rejected.
+DEFAULT_SCRAPE_OPTIONS = {
+    # Maximum number of detail pages fetched in flight for one listing page.
+    "detail_workers": 8,
+    # Optional module_2.http_cache.ResponseCache used for every fetch in the run.
+    "http_cache": None,
+    # Parser backend: "auto" (lxml when installed), "lxml", or "html.parser".
+    "parser": "auto",
+    # Parse only the listing <table> / detail <dl> slice, with a full-parse fallback.
+    "partial_parse": True,
+    # JSON checkpoint written after every fully processed page (None disables it).
+    "checkpoint_path": None,
+    # Continue from checkpoint_path instead of page 1; streamed output is appended.
+    "resume": False,
+    # Shared AdaptiveRateLimiter / RetryPolicy for the run (None builds fresh defaults).
+    "rate_limiter": None,
+    "retry_policy": None,
+    # Optional module_2.pipeline.ParsePipeline: detail pages are downloaded on its
+    # I/O threads and parsed in its process pool (detail_workers is then unused).
+    "parse_pipeline": None,
+    # Optional module_2.enrich_queue.EnrichmentQueue: emit listing-level rows at once
+    # and queue their detail URLs for a background EnrichmentWorker instead.
+    "enrichment_queue": None,
+    # Optional predicate on listing-level fields (see enrichment_predicate): only
+    # matching rows get detail pages. With an enrichment_queue the other rows are
+    # queued at low priority; without one they are emitted listing-only.
+    "enrich_predicate": None,
+    # Optional module_2.dead_letter.DeadLetterStore recording every failed fetch;
+    # retry_failed(store) later re-fetches just those URLs.
+    "dead_letters": None,
+    # Site root to fetch from (for example a module_2.replay.ReplayServer); rows keep
+    # canonical thegradcafe.com URLs either way.
+    "base_url": SITE_ROOT,
+    # Optional module_2.metrics.ScrapeMetrics collecting fetch/parse timings and
+    # counters for the run (None uses a fresh one).
+    "metrics": None,
+    # Listing page numbers to walk, in ascending order (None means pages 1-99).
+    "pages": None,
+    # Highest result id already stored; the walk stops at the first row at or below it.
+    # A listing page that still fails after retries then aborts the scrape (RuntimeError):
+    # loading the other rows would move the watermark past the lost page for good.
+    "watermark": None,
+}
+
+
+# One pooled keep-alive client shared by listing and detail fetches.
+HTTP_SESSION = HttpSession()
+# BeautifulSoup backend behind the public parse_row/_extract_detail_from_dl helpers.
+SOUP_BACKEND = SoupBackend()
+
+
+def _paced_fetch(client, limiter, retry):
+    """Return client's get_text with pacing and retries around network requests only.
+
+    For a ResponseCache the limiter wraps the cache's session, so cache hits
+    are served without taking a token.
+    """
+    if isinstance(client, ResponseCache):
+        return functools.partial(
+            client.get_text, session=PacedSession(client.session, limiter, retry)
         )
+    return PacedSession(client, limiter, retry).get_text
+
+
+# Fetch client (HTTP_SESSION or a ResponseCache), parser, pacing and retry policy
+# used outside any scrape run, for example by the background enrichment worker.
+# Its retry budget refills, since the worker and revisit passes never end a run.
+_DEFAULT_LIMITER = AdaptiveRateLimiter()
+_DEFAULT_RETRY = RefillingRetryPolicy()
+DEFAULT_RUN_STATE = {
+    "client": HTTP_SESSION,
+    "fetch": _paced_fetch(HTTP_SESSION, _DEFAULT_LIMITER, _DEFAULT_RETRY),
+    "parser": SOUP_BACKEND,
+    "limiter": _DEFAULT_LIMITER,
+    "retry": _DEFAULT_RETRY,
+    "pipeline": None,
+    "dead_letters": None,
+    "base_url": SITE_ROOT,
+    "metrics": ScrapeMetrics(),
+}
+# State of the scrape run active in the current context. Each iter_scrape run
+# steps its generator in a context of its own, and worker threads are handed
+# the state explicitly (_bind_state), so concurrent runs never see each other's.
+_RUN_STATE = contextvars.ContextVar("scrape_run_state")
+
+
+def current_run_state():
+    """Return the active run's state, or DEFAULT_RUN_STATE outside any run."""
+    return _RUN_STATE.get(DEFAULT_RUN_STATE)
+
+
+def _bind_state(function):
+    """Return function wrapped to run with the current run's state in any thread."""
+    state = current_run_state()
+
+    def _bound(*args):
+        token = _RUN_STATE.set(state)
+        try:
+            return function(*args)
+        finally:
+            _RUN_STATE.reset(token)
+
+    return _bound
 
 
-def _apply_gre_field(detail_data, label, value):
-    """Map GRE labels while preserving the first observed value per field."""
-    rules = (
-        ("gre general", "gre_score_raw"),
-        ("gre verbal", "gre_v_score_raw"),
-        ("analytical writing", "gre_aw_raw"),
-    )
-    for marker, key in rules:
-        if marker in label and not detail_data.get(key):
-            detail_data[key] = value
-            return
+def _fetch_html(url):
+    """Fetch and decode HTML for a URL, paced and retried per the run's policies.
+
+    With a dead-letter store in the run, a final failure is recorded there
+    and a success clears any earlier record for the URL. Latency (including
+    retries and pacing) and page size go to the run's metrics.
+    """
+    state = current_run_state()
+    dead_letters = state["dead_letters"]
+    metrics = state["metrics"]
+    fetch_url = url
+    if state["base_url"] != SITE_ROOT and url.startswith(SITE_ROOT):
+        fetch_url = state["base_url"].rstrip("/") + url[len(SITE_ROOT):]
+    started = time.perf_counter()
+    try:
+        html = state["fetch"](fetch_url)
+    except Exception as err:
+        metrics.observe_fetch(url, time.perf_counter() - started)
+        if dead_letters is not None:
+            dead_letters.record(url, err)
+        raise
+    metrics.observe_fetch(url, time.perf_counter() - started, html)
+    if dead_letters is not None:
+        dead_letters.resolve(url)
+    return html
 
 
 def _extract_detail_from_dl(dl):
-    """Parse detail fields from a detail-page definition list."""
-    detail_data = {}
-
-    for block in dl.find_all("div"):
-        dt = block.find("dt")
-        dd = block.find("dd")
-        if not dt or not dd:
-            continue
-
-        label = dt.get_text(" ", strip=True).lower()
-        value = dd.get_text(" ", strip=True)
-        _apply_detail_field(detail_data, label, value)
-
-    ul = dl.find("ul")
-    if not ul:
-        return detail_data
-
-    for li in ul.find_all("li"):
-        spans = li.find_all("span")
-        if len(spans) < 2:
-            continue
-
-        label = spans[0].get_text(" ", strip=True).lower()
-        value = spans[1].get_text(" ", strip=True)
-        _apply_gre_field(detail_data, label, value)
-
-    return detail_data
-
-
-def _parse_page_rows(rows, all_entries, existing_urls, consecutive_existing, stop_after_existing):
-    """Parse all listing rows on one page."""
+    """Parse detail fields from a BeautifulSoup detail-page definition list."""
+    return SOUP_BACKEND.extract_detail_from_dl(dl)
+
+
+def _scrape_options(options):
+    """Merge caller options over DEFAULT_SCRAPE_OPTIONS and validate keys."""
+    merged = dict(DEFAULT_SCRAPE_OPTIONS)
+    for key, value in (options or {}).items():
+        if key not in DEFAULT_SCRAPE_OPTIONS:
+            raise ValueError(f"Unknown scrape option: {key}")
+        merged[key] = value
+    if int(merged["detail_workers"]) < 1:
+        raise ValueError("detail_workers must be at least 1")
+    return merged
+
+
+def _fetch_details(urls, max_workers):
+    """Yield detail pages in input order as they complete, with bounded concurrency."""
+    state = current_run_state()
+    pipeline = state["pipeline"]
+    if pipeline is not None:
+        parser = state["parser"]
+        yield from pipeline.map(_bind_state(_fetch_html), urls, (parser.name, parser.partial))
+    elif max_workers <= 1 or len(urls) <= 1:
+        yield from map(parse_detail_page, urls)
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as pool:
+            yield from pool.map(_bind_state(parse_detail_page), urls)
+
+
+def enrichment_predicate(universities=(), statuses=()):
+    """Return a listing-row predicate for the enrich_predicate scrape option.
+
+    A row matches when its ``university_raw`` contains any of
+    ``universities`` and its ``applicant_status_raw`` contains any of
+    ``statuses`` (case-insensitive substrings); an empty list matches all.
+    """
+    universities = [name.lower() for name in universities]
+    statuses = [name.lower() for name in statuses]
+
+    def _matches(entry):
+        university = (entry.get("university_raw") or "").lower()
+        status = (entry.get("applicant_status_raw") or "").lower()
+        return (
+            not universities or any(name in university for name in universities)
+        ) and (not statuses or any(name in status for name in statuses))
+
+    return _matches
+
+
+def _enrich_entries(entries, max_workers, predicate=None):
+    """Yield entries in order, merging detail-page fields into those with a URL.
+
+    With a ``predicate`` only matching rows are fetched; the others are
+    yielded with their listing fields and counted as skipped.
+    """
+    targets = [
+        bool(entry.get("url")) and (predicate is None or predicate(entry)) for entry in entries
+    ]
+    details = _fetch_details(
+        [entry["url"] for entry, target in zip(entries, targets) if target], max_workers
+    )
+    metrics = current_run_state()["metrics"]
+    for entry, target in zip(entries, targets):
+        if target:
+            fields = next(details, {})
+            metrics.count("detail_hits" if fields else "detail_misses")
+            entry.update(fields)
+        elif entry.get("url"):
+            metrics.count("detail_skipped")
+        yield entry
+
+
+def _parse_page_rows(
+    rows, existing_urls, consecutive_existing, stop_after_existing, watermark=None
+):
+    """Parse listing rows on one page into new entries before the stop point.
+
+    Result ids only grow, so with a ``watermark`` the first row whose id is at
+    or below it ends the scrape immediately; ``existing_urls`` then only
+    matters for rows without a result id.
+    """
+    backend = current_run_state()["parser"]
+    entries = []
     row_index = 0
     while row_index < len(rows):
         main_row = rows[row_index]
@@ -106,107 +257,233 @@ def _parse_page_rows(rows, all_entries, existing_urls, consecutive_existing, sto
         step = 1
 
         if row_index + 1 < len(rows):
-            next_text = rows[row_index + 1].get_text(" ", strip=True)
-            if _has_meta_info(next_text):
+            next_text = backend.row_text(rows[row_index + 1])
+            if has_meta_info(next_text):
                 meta_row = rows[row_index + 1]
                 step = 2
 
-        entry = parse_row(main_row, meta_row)
+        entry = backend.parse_row(main_row, meta_row)
         if entry:
             entry_url = entry.get("url")
+            entry_id = result_id(entry_url)
+            if watermark is not None and entry_id is not None and entry_id <= watermark:
+                return entries, consecutive_existing, True
             if entry_url and entry_url in existing_urls:
                 consecutive_existing += 1
                 if consecutive_existing >= stop_after_existing:
-                    return consecutive_existing, True
+                    return entries, consecutive_existing, True
                 row_index += step
                 continue
 
             consecutive_existing = 0
-            if entry_url:
-                entry.update(parse_detail_page(entry_url))
-            all_entries.append(entry)
+            entries.append(entry)
 
         row_index += step
 
-    return consecutive_existing, False
-
-
-def scrape_data(existing_urls=None, stop_after_existing=100):
-    """Scrape listing pages and collect rows until stop threshold for known URLs."""
-    all_entries = []
-    existing_urls = existing_urls or set()
-    consecutive_existing = 0
-    base_url = "https://www.thegradcafe.com/survey/"
-
-    for page_num in range(1, 100):
+    return entries, consecutive_existing, False
+
+
+def _emit_page(page_entries, state, opts):
+    """Yield a page's enriched rows, skipping and recording checkpointed URLs.
+
+    With an ``enrichment_queue`` the rows are yielded without detail fields
+    and their URLs are queued for later enrichment; rows failing the
+    ``enrich_predicate`` are queued at low priority.
+    """
+    tracking = opts["checkpoint_path"] is not None
+    if tracking:
+        page_entries = [
+            entry for entry in page_entries
+            if entry.get("url") not in state["emitted_urls"]
+        ]
+    queue = opts["enrichment_queue"]
+    predicate = opts["enrich_predicate"]
+    if queue is not None:
+        linked = [entry for entry in page_entries if entry.get("url")]
+        wanted = [predicate is None or predicate(entry) for entry in linked]
+        queue.enqueue(entry["url"] for entry, keep in zip(linked, wanted) if keep)
+        queue.enqueue(
+            (entry["url"] for entry, keep in zip(linked, wanted) if not keep),
+            priority=LOW_PRIORITY,
+        )
+        current_run_state()["metrics"].count("detail_deferred", len(linked))
+        enriched = iter(page_entries)
+    else:
+        enriched = _enrich_entries(page_entries, int(opts["detail_workers"]), predicate)
+    for entry in enriched:
+        yield entry
+        # Resumed only once the consumer has written the row.
+        if tracking and entry.get("url"):
+            state["emitted_urls"].add(entry["url"])
+            record_emitted(opts["checkpoint_path"], entry["url"])
+
+
+def _iter_pages(existing_urls, stop_after_existing, opts):
+    """Walk listing pages, yielding enriched new rows, until the stop condition.
+
+    With ``checkpoint_path`` set, progress is saved after each page (and
+    each streamed row's URL is journaled as soon as the row is written), and
+    the checkpoint is removed once the walk finishes; ``resume`` picks up
+    after the last saved page with the saved counter and emitted URLs.
+    """
+    checkpoint_path = opts["checkpoint_path"]
+    state = load_checkpoint(checkpoint_path) if opts["resume"] else new_state()
+    base_url = f"{SITE_ROOT}/survey/"
+
+    for page_num in opts["pages"] or range(1, 100):
+        if page_num <= state["last_page"]:
+            continue
         full_url = f"{base_url}?page={page_num}"
         html = None
         with suppress(Exception):
             html = _fetch_html(full_url)
         if html is None:
             print("Page fetch failed:", page_num)
+            if opts["watermark"] is not None:
+                raise RuntimeError(
+                    f"Listing page {page_num} could not be fetched; stopping so the "
+                    "watermark does not move past its rows"
+                )
             continue
 
-        soup = BeautifulSoup(html, "html.parser")
-        table = soup.find("table")
-        if not table:
-            break
-
-        rows = table.find_all("tr")[1:]
+        started = time.perf_counter()
+        run_state = current_run_state()
+        rows = run_state["parser"].listing_rows(html)
         if not rows:
             break
 
-        consecutive_existing, should_stop = _parse_page_rows(
+        page_entries, state["consecutive_existing"], should_stop = _parse_page_rows(
             rows,
-            all_entries,
             existing_urls,
-            consecutive_existing,
+            state["consecutive_existing"],
             stop_after_existing,
+            opts["watermark"],
         )
+        run_state["metrics"].observe_parse("listing", time.perf_counter() - started)
+        run_state["metrics"].count("pages")
+        yield from _emit_page(page_entries, state, opts)
+        state["last_page"] = page_num
+        if checkpoint_path:
+            save_checkpoint(checkpoint_path, state)
         if should_stop:
-            return all_entries
+            break
 
-    return all_entries
+    clear_checkpoint(checkpoint_path)
+
+
+@contextmanager
+def _run_state(opts):
+    """Make the run's client, parser, pacing, and stores the active state, then restore."""
+    client = opts["http_cache"] if opts["http_cache"] is not None else HTTP_SESSION
+    limiter = opts["rate_limiter"] or AdaptiveRateLimiter()
+    retry = opts["retry_policy"] or RetryPolicy()
+    state = {
+        "client": client,
+        "fetch": _paced_fetch(client, limiter, retry),
+        "parser": get_parser_backend(opts["parser"], opts["partial_parse"]),
+        "limiter": limiter,
+        "retry": retry,
+        "pipeline": opts["parse_pipeline"],
+        "dead_letters": opts["dead_letters"],
+        "base_url": opts["base_url"],
+        "metrics": opts["metrics"] or ScrapeMetrics(),
+    }
+    metrics = state["metrics"]
+    metrics.start({
+        "rate_limiter": state["limiter"],
+        "retry": state["retry"],
+        "http": state["client"],
+        "pipeline": state["pipeline"],
+    })
+    token = _RUN_STATE.set(state)
+    try:
+        yield metrics
+    finally:
+        metrics.finish()
+        _RUN_STATE.reset(token)
+
+
+def _iter_run(existing_urls, stop_after_existing, opts):
+    """Yield a run's rows with its state active; see iter_scrape."""
+    with _run_state(opts) as metrics:
+        for entry in _iter_pages(existing_urls or set(), stop_after_existing, opts):
+            metrics.count("rows")
+            yield entry
+
+
+def iter_scrape(existing_urls=None, stop_after_existing=100, options=None):
+    """Lazily yield scraped rows, each as soon as its detail page is merged.
+
+    Detail pages for each listing page are fetched concurrently, bounded by
+    the ``detail_workers`` option, and yielded in listing order. When
+    ``http_cache`` is given, every fetch in the run goes through that cache.
+    Pages are parsed with the ``parser`` backend (lxml when available).
+    ``checkpoint_path``/``resume`` make interrupted runs restartable. All
+    fetches share one rate limiter and retry budget (``rate_limiter`` and
+    ``retry_policy``), so 429/503 responses slow every worker down. With a
+    ``parse_pipeline``, detail HTML is parsed in worker processes; with an
+    ``enrichment_queue``, detail fetches are deferred entirely, and an
+    ``enrich_predicate`` limits detail fetches to matching rows. Failed
+    fetches go to the ``dead_letters`` store when one is given, and
+    ``base_url`` redirects every fetch to another host (such as a local
+    replay server). For incremental pulls, pass the highest stored result
+    id as ``watermark`` instead of the full ``existing_urls`` set. Timings
+    and counters are collected in the ``metrics`` ScrapeMetrics.
+    """
+    opts = _scrape_options(options)
+    # Step the run in a context of its own, so its state stays active only
+    # inside the run even while this generator is suspended between rows.
+    context = contextvars.copy_context()
+    rows = _iter_run(existing_urls, stop_after_existing, opts)
+    try:
+        while True:
+            try:
+                entry = context.run(next, rows)
+            except StopIteration:
+                return
+            yield entry
+    finally:
+        context.run(rows.close)
+
+
+def scrape_data(existing_urls=None, stop_after_existing=100, options=None):
+    """Scrape listing pages and collect rows until stop threshold for known URLs."""
+    return list(iter_scrape(existing_urls, stop_after_existing, options))
+
+
+def retry_failed(dead_letters, options=None):
+    """Re-fetch only the URLs in a dead-letter store and return what was recovered.
+
+    Failed listing pages are scraped again (rows and details, as in a normal
+    run) and failed detail URLs are re-fetched on their own. Returns
+    ``(rows, details)``, where ``details`` maps each recovered detail URL to
+    its fields; Pull Data adds the rows to its scrape output and patches the
+    details into the loaded applicants. URLs that still fail stay in the
+    store with a higher attempt count.
+    """
+    opts = _scrape_options({**(options or {}), "dead_letters": dead_letters})
+    pages = sorted(entry["page"] for entry in dead_letters.entries("listing"))
+    urls = [entry["url"] for entry in dead_letters.entries("detail")]
+    rows = []
+    if pages:
+        rows = list(iter_scrape(options={**opts, "pages": pages}))
+    with _run_state(opts):
+        fetched = _fetch_details(urls, int(opts["detail_workers"]))
+        details = {url: fields for url, fields in zip(urls, fetched) if fields}
+    return rows, details
 
 
 def parse_row(main_row, meta_row):
-    """Parse one listing row and optional metadata row into raw schema fields."""
-    tds = main_row.find_all("td")
-    if len(tds) < 4:
-        return None
-
-    university_raw = tds[0].get_text(" ", strip=True)
-    date_raw = tds[2].get_text(" ", strip=True)
-    decision_raw = tds[3].get_text(" ", strip=True)
-
-    semester = None
-    if meta_row:
-        semester = _extract_semester(meta_row.get_text(" ", strip=True))
-
-    url = None
-    link = main_row.find("a")
-    if link and link.has_attr("href"):
-        url = f"https://www.thegradcafe.com{link['href']}"
-
-    return {
-        "program_raw": None,
-        "university_raw": university_raw,
-        "comments_raw": None,
-        "date_added_raw": date_raw,
-        "url": url,
-        "applicant_status_raw": decision_raw,
-        "semester_year_start_raw": semester,
-        "international_american_raw": None,
-        "gre_score_raw": None,
-        "gre_v_score_raw": None,
-        "degree_type_raw": None,
-        "gpa_raw": None,
-        "gre_aw_raw": None,
-    }
+    """Parse one BeautifulSoup listing row and optional metadata row into raw fields."""
+    return SOUP_BACKEND.parse_row(main_row, meta_row)
+
 
+def parse_detail_page(url, decision=False):
+    """Fetch and parse a detail page to augment listing-row fields.
 
-def parse_detail_page(url):
-    """Fetch and parse a detail page to augment listing-row fields."""
+    ``decision=True`` also returns the page's decision and notification
+    fields, which the revisit pass uses to update a row's status.
+    """
     html = None
     with suppress(Exception):
         html = _fetch_html(url)
@@ -214,16 +491,16 @@ def parse_detail_page(url):
     if html is None:
         return {}
 
-    soup = BeautifulSoup(html, "html.parser")
-    main = soup.find("main")
-    if not main:
-        return {}
+    started = time.perf_counter()
+    state = current_run_state()
+    fields = state["parser"].parse_detail(html, decision)
+    state["metrics"].observe_parse("detail", time.perf_counter() - started)
+    return fields
 
-    dl = main.find("dl")
-    if not dl:
-        return {}
 
-    return _extract_detail_from_dl(dl)
+def print_metrics(metrics):
+    """Print a run's metrics summary as one structured JSON document."""
+    print("Scrape metrics:", json.dumps(metrics.summary(), indent=2, sort_keys=True))
 
 
 def save_data(data, filename="applicant_data.json"):
@@ -232,14 +509,48 @@ def save_data(data, filename="applicant_data.json"):
         json.dump(data, file_out, indent=2, ensure_ascii=False)
 
 
-def run_scrape(existing_urls=None, filename="applicant_data.json"):
-    """Run scrape pipeline and write output file."""
-    entries = scrape_data(existing_urls=existing_urls)
+def stream_jsonl(entries, filename, mode="a"):
+    """Write each entry to a JSONL file as it arrives and return the count written."""
+    count = 0
+    with open(filename, mode, encoding="utf-8") as file_out:
+        for entry in entries:
+            file_out.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            file_out.flush()
+            count += 1
+    return count
+
+
+def run_scrape(existing_urls=None, filename="applicant_data.json", options=None, stream=False):
+    """Run scrape pipeline and write output file.
+
+    With ``stream=True`` rows are written to ``filename`` as JSONL while the
+    scrape runs (memory stays flat) and the number of rows is returned
+    instead of the full list. When resuming from a checkpoint the JSONL file
+    is appended to rather than truncated. ``checkpoint_path`` requires
+    ``stream=True``: the list path writes nothing until the scrape ends, so
+    rows the checkpoint already counts as emitted would be lost on a crash.
+    The run's metrics summary is printed as JSON at the end.
+    """
+    options = dict(options or {})
+    if not stream and options.get("checkpoint_path") is not None:
+        raise ValueError("checkpoint_path requires stream=True")
+    metrics = options.get("metrics") or ScrapeMetrics()
+    options["metrics"] = metrics
+    if stream:
+        rows = iter_scrape(existing_urls=existing_urls, options=options)
+        mode = "a" if options.get("resume") else "w"
+        count = stream_jsonl(rows, filename, mode=mode)
+        print("Number of entries:", count)
+        print_metrics(metrics)
+        return count
+
+    entries = scrape_data(existing_urls=existing_urls, options=options)
     print("Number of entries:", len(entries))
     print("First entry dict:", entries[0] if entries else "None")
     save_data(entries, filename)
+    print_metrics(metrics)
     return entries
 
 
 if __name__ == "__main__":
-    run_scrape()
+    run_scrape(options={"http_cache": ResponseCache(HTTP_SESSION)})
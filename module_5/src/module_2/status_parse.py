@@ -0,0 +1,142 @@
+"""Cached parsers for applicant decision statuses and added-on dates.
+
+Statuses such as ``Accepted on Jan 01, 2025`` or ``Wait listed on 13 Feb``
+and dates such as ``February 13, 2026`` repeat across thousands of rows, so
+each distinct string is matched once with a compiled regex and memoized.
+``parse_decision`` combines both: the decision, the decision date (its year
+inferred from the added-on date when the status omits it), and the typed
+added-on date.
+"""
+
+import enum
+import re
+from collections import namedtuple
+from datetime import date
+from functools import lru_cache
+
+
+CACHE_SIZE = 4096
+STATUS_RE = re.compile(r"(accepted|rejected|wait listed|interview)(?: on\b(.*))?", re.I | re.S)
+# Added-on dates in the formats load_data has always accepted: "%B %d, %Y" and "%Y-%m-%d".
+LONG_DATE_RE = re.compile(r"([A-Za-z]+)\s+(\d{1,2}),\s+(\d{4})")
+ISO_DATE_RE = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})")
+# Status dates: "13 Feb", "29 January 2026", "Jan 01, 2025", "Feb 13".
+DAY_MONTH_RE = re.compile(r"(\d{1,2})\s+([A-Za-z]+)\.?(?:,?\s+(\d{4}))?")
+MONTH_DAY_RE = re.compile(r"([A-Za-z]+)\.?\s+(\d{1,2})(?:,?\s+(\d{4}))?")
+MONTH_NAMES = (
+    "january", "february", "march", "april", "may", "june",
+    "july", "august", "september", "october", "november", "december",
+)
+FULL_MONTHS = {name: number for number, name in enumerate(MONTH_NAMES, start=1)}
+MONTHS = {**FULL_MONTHS, **{name[:3]: number for name, number in FULL_MONTHS.items()}, "sept": 9}
+
+ParsedDecision = namedtuple("ParsedDecision", ("decision", "decision_date", "date_added"))
+
+
+class Decision(enum.Enum):
+    """Decision named at the start of an applicant status."""
+
+    ACCEPTED = "accepted"
+    REJECTED = "rejected"
+    WAIT_LISTED = "wait listed"
+    INTERVIEW = "interview"
+    OTHER = "other"
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _split_status(status):
+    """Return (Decision, date text or None) for a status string."""
+    match = STATUS_RE.match(status)
+    if match is None:
+        return Decision.OTHER, None
+    when = match.group(2)
+    return Decision(match.group(1).lower()), None if when is None else when.strip()
+
+
+def split_status(status):
+    """Return (Decision, text after 'on') for a status; (None, None) if not a string.
+
+    ``"Accepted on 1 Feb"`` gives ``(Decision.ACCEPTED, "1 Feb")``; a status
+    without ``on`` has no date text, and unknown statuses are ``OTHER``.
+    """
+    if not isinstance(status, str):
+        return None, None
+    return _split_status(status)
+
+
+def _make_date(year, month, day):
+    """Return date(year, month, day), or None when that day does not exist."""
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_date_added(text):
+    """Parse a stripped 'Month D, YYYY' or 'YYYY-MM-DD' string."""
+    match = LONG_DATE_RE.fullmatch(text)
+    if match:
+        month = FULL_MONTHS.get(match.group(1).lower())
+        if month is None:
+            return None
+        return _make_date(int(match.group(3)), month, int(match.group(2)))
+    match = ISO_DATE_RE.fullmatch(text)
+    if match:
+        return _make_date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+    return None
+
+
+def parse_date_added(value):
+    """Return the date for an added-on string, or None for blanks and unknown formats."""
+    if not value or not isinstance(value, str):
+        return None
+    return _parse_date_added(value.strip())
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _status_day(text):
+    """Return (year or None, month, day) for a status date text, or None."""
+    match = DAY_MONTH_RE.fullmatch(text)
+    if match:
+        day, name, year = match.groups()
+    else:
+        match = MONTH_DAY_RE.fullmatch(text)
+        if match is None:
+            return None
+        name, day, year = match.groups()
+    month = MONTHS.get(name.lower())
+    if month is None:
+        return None
+    return (int(year) if year else None), month, int(day)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_decision(status, date_added):
+    """Cached body of parse_decision for string (or None) arguments."""
+    decision, when = split_status(status)
+    added = parse_date_added(date_added)
+    parts = _status_day(when) if when else None
+    decided = None
+    if parts is not None:
+        year, month, day = parts
+        if year is not None:
+            decided = _make_date(year, month, day)
+        elif added is not None:
+            decided = _make_date(added.year, month, day)
+            if decided is not None and decided > added:
+                decided = _make_date(added.year - 1, month, day)
+    return ParsedDecision(decision, decided, added)
+
+
+def parse_decision(status, date_added=None):
+    """Return ParsedDecision(decision, decision_date, date_added) for one row.
+
+    A status date without a year takes the added-on year, or the year
+    before when that would put the decision after the row was added.
+    """
+    if not isinstance(status, str):
+        status = None
+    if not isinstance(date_added, str):
+        date_added = None
+    return _parse_decision(status, date_added)
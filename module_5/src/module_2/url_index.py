@@ -0,0 +1,78 @@
+"""Compact membership for GradCafe result URLs, keyed by integer result id.
+
+A ``set`` of ~50-character URL strings costs well over 100 bytes per entry.
+``ResultIdSet`` stores result ids in a sorted ``array('I')`` (4 bytes each)
+and answers lookups by binary search. URLs without a result id are kept as
+strings on the side.
+"""
+
+from array import array
+from bisect import bisect_left, insort
+
+from module_2.parsers import result_id
+
+
+# Largest id that fits an unsigned 32-bit array slot; bigger ids are kept as strings.
+MAX_PACKED_ID = 2 ** 32 - 1
+
+
+class ResultIdSet:
+    """Set-like URL membership backed by a sorted array of result ids.
+
+    Supports ``in``, ``add``, ``len`` and iteration over ids, so it can stand
+    in for the ``set[str]`` of existing URLs in the scraper and the merge
+    dedupe.
+    """
+
+    def __init__(self, urls=()):
+        """Index the given URLs; strip whitespace the same way the merge does."""
+        ids = array("I")
+        self._others = set()
+        for url in urls:
+            self._split(url, ids.append)
+        self._ids = array("I", sorted(set(ids)))
+
+    def _split(self, url, add_id):
+        """Route one URL to add_id (packable result id) or the string side set."""
+        url = (url or "").strip()
+        if not url:
+            return
+        rid = result_id(url)
+        if rid is None or rid > MAX_PACKED_ID:
+            self._others.add(url)
+        else:
+            add_id(rid)
+
+    def _has_id(self, rid):
+        """Return True when rid is stored."""
+        index = bisect_left(self._ids, rid)
+        return index < len(self._ids) and self._ids[index] == rid
+
+    def _insert_id(self, rid):
+        """Insert rid in sorted position (O(n) move; meant for small batches)."""
+        if not self._has_id(rid):
+            insort(self._ids, rid)
+
+    def __contains__(self, url):
+        """Return True when url (or its result id) has been added."""
+        url = (url or "").strip()
+        rid = result_id(url)
+        if rid is None or rid > MAX_PACKED_ID:
+            return url in self._others
+        return self._has_id(rid)
+
+    def __len__(self):
+        """Return the number of distinct ids and id-less URLs stored."""
+        return len(self._ids) + len(self._others)
+
+    def __iter__(self):
+        """Iterate stored result ids in ascending order."""
+        return iter(self._ids)
+
+    def add(self, url):
+        """Add one URL."""
+        self._split(url, self._insert_id)
+
+    def nbytes(self):
+        """Return the bytes held by the id array buffer."""
+        return self._ids.itemsize * len(self._ids)
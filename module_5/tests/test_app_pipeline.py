@@ -15,6 +15,8 @@ if SRC_PATH not in sys.path:
 
 app_module = importlib.import_module("app")
 llm_app = importlib.import_module("module_2.llm_hosting.app")
+dead_letter_mod = importlib.import_module("module_2.dead_letter")
+listing_html = importlib.import_module("data_builders").listing_html
 
 
 @pytest.mark.buttons
@@ -152,7 +154,79 @@ def test_run_llm_and_write_out_json(monkeypatch):
 
 
 @pytest.mark.buttons
-def test_app_main(monkeypatch):
-    """__main__ path can run without starting a real server."""
+def test_app_main(monkeypatch, tmp_path):
+    """__main__ path can run without starting a real server and opens the dead letters."""
     monkeypatch.setattr(flask.Flask, "run", lambda *_, **__: None)
-    runpy.run_module("app", run_name="__main__")
+    monkeypatch.setattr(dead_letter_mod, "DEFAULT_DEAD_LETTER_PATH", str(tmp_path / "dl.sqlite3"))
+    namespace = runpy.run_module("app", run_name="__main__")
+    assert isinstance(namespace["APP_STATE"]["dead_letters"], dead_letter_mod.DeadLetterStore)
+    namespace["APP_STATE"]["dead_letters"].close()
+
+
+@pytest.mark.buttons
+def test_pull_data_loads_nothing_when_a_listing_page_fails(monkeypatch):
+    """A failed listing page under the watermark fails the pull before clean/load."""
+    scrape_mod = importlib.import_module("module_2.scrape")
+    called = []
+
+    def _fake_fetch_html(url):
+        if url.endswith("page=2"):
+            raise OSError("listing down")
+        return listing_html([30])
+
+    monkeypatch.setattr(app_module, "ensure_initial_dataset_loaded", lambda: False)
+    monkeypatch.setattr(app_module, "fetch_max_result_id", lambda: 5)
+    monkeypatch.setattr(app_module, "_applicant_json_path", lambda: os.devnull)
+    monkeypatch.setattr(scrape_mod, "_fetch_html", _fake_fetch_html)
+    monkeypatch.setattr(scrape_mod, "parse_detail_page", lambda _url: {})
+    monkeypatch.setattr(app_module, "run_typed_clean", lambda **_kw: called.append("clean"))
+    monkeypatch.setattr(app_module, "run_load", lambda **_kw: called.append("load"))
+    app_module.is_pulling = False
+    ok, status, _ = app_module.run_pull_data_pipeline()
+    assert ok is False
+    assert "Listing page 2" in status
+    assert not called
+
+
+@pytest.mark.buttons
+def test_pull_data_retries_dead_letters_and_patches_details(monkeypatch, tmp_path):
+    """Pull Data records failures, retries earlier ones, and patches recovered details."""
+    store = dead_letter_mod.DeadLetterStore(str(tmp_path / "dl.sqlite3"))
+    scraped_path = tmp_path / "applicant_data.json"
+    calls = []
+    scraped = {}
+
+    def _fake_run_scrape(filename, options):
+        scraped.update(options)
+        with open(filename, "w", encoding="utf-8") as file_out:
+            json.dump([{"url": "u1"}], file_out)
+        return [{"url": "u1"}]
+
+    def _fake_retry_failed(dead_letters, options):
+        calls.append(("retry", dead_letters, "watermark" in options))
+        return [{"url": "u2"}], {"u3": {"gpa_raw": "3.9"}}
+
+    monkeypatch.setitem(app_module.APP_STATE, "dead_letters", store)
+    monkeypatch.setitem(app_module.APP_STATE, "scrape_metrics", None)
+    monkeypatch.setattr(app_module, "ensure_initial_dataset_loaded", lambda: False)
+    monkeypatch.setattr(app_module, "fetch_max_result_id", lambda: 5)
+    monkeypatch.setattr(app_module, "_applicant_json_path", lambda: str(scraped_path))
+    monkeypatch.setattr(app_module, "run_scrape", _fake_run_scrape)
+    monkeypatch.setattr(app_module, "retry_failed", _fake_retry_failed)
+    monkeypatch.setattr(app_module, "run_typed_clean", lambda **_kw: None)
+    monkeypatch.setattr(app_module, "run_llm_and_write_out_json", lambda: None)
+    monkeypatch.setattr(app_module, "merge_out_into_module2_out", lambda: (2, 2))
+    monkeypatch.setattr(app_module, "run_load", lambda **_kw: calls.append("load"))
+    monkeypatch.setattr(
+        app_module,
+        "patch_applicant_details",
+        lambda url, fields: calls.append(("patch", url, fields)),
+    )
+    app_module.is_pulling = False
+    ok, _status, _seeded = app_module.run_pull_data_pipeline()
+
+    assert ok
+    assert scraped["dead_letters"] is store
+    assert calls == [("retry", store, False), "load", ("patch", "u3", {"gpa_raw": "3.9"})]
+    assert json.loads(scraped_path.read_text(encoding="utf-8")) == [{"url": "u1"}, {"url": "u2"}]
+    store.close()
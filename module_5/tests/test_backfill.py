@@ -0,0 +1,144 @@
+"""Tests sharded historical backfill: page splitting, shard resume, and URL-deduped merge."""
+
+import importlib
+import json
+import os
+import runpy
+import sys
+from concurrent import futures
+
+import pytest
+
+SRC_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+
+backfill_mod = importlib.import_module("module_2.backfill")
+scrape_mod = importlib.import_module("module_2.scrape")
+listing_html = importlib.import_module("data_builders").listing_html
+
+
+def _fake_site(url):
+    """Serve pages 1-6 with two rows each; page 4 repeats a page-3 row (listing shift)."""
+    page = int(url.rsplit("=", 1)[-1])
+    if page > 6:
+        return ""
+    return listing_html([page * 10, page * 10 + 1] if page != 4 else [31, 40])
+
+
+@pytest.fixture(name="fake_site")
+def fixture_fake_site(monkeypatch):
+    """Route scraper fetches to the fake site with empty detail pages."""
+    monkeypatch.setattr(scrape_mod, "_fetch_html", _fake_site)
+    monkeypatch.setattr(scrape_mod, "parse_detail_page", lambda _url: {})
+
+
+@pytest.mark.db
+def test_split_pages():
+    """Ranges split into contiguous ordered chunks, never more than the page count."""
+    assert backfill_mod.split_pages(range(3, 13), 3) == [
+        [3, 4, 5, 6],
+        [7, 8, 9],
+        [10, 11, 12],
+    ]
+    assert backfill_mod.split_pages(range(1, 3), 8) == [[1], [2]]
+    assert not backfill_mod.split_pages([], 4)
+
+
+@pytest.mark.db
+@pytest.mark.usefixtures("fake_site")
+def test_run_backfill_merges_and_dedupes(monkeypatch, tmp_path):
+    """Shards write their own segments; the merge keeps one row per URL in page order."""
+    monkeypatch.setattr(backfill_mod, "ProcessPoolExecutor", futures.ThreadPoolExecutor)
+    summary = backfill_mod.run_backfill(range(1, 9), str(tmp_path), shards=3)
+
+    assert [stats["pages"] for stats in summary["shards"]] == [3, 3, 2]
+    assert sum(stats["rows"] for stats in summary["shards"]) == 12
+    assert summary["duplicates"] == 1
+    merged = [
+        json.loads(line)["url"].rsplit("/", 1)[-1]
+        for line in open(summary["path"], encoding="utf-8")
+    ]
+    assert merged == ["10", "11", "20", "21", "30", "31", "40", "50", "51", "60", "61"]
+    assert sorted(os.listdir(tmp_path)) == [
+        "backfill.jsonl",
+        "shard-000.jsonl",
+        "shard-000.jsonl.done",
+        "shard-001.jsonl",
+        "shard-001.jsonl.done",
+        "shard-002.jsonl",
+        "shard-002.jsonl.done",
+    ]
+
+
+@pytest.mark.db
+@pytest.mark.usefixtures("fake_site")
+def test_run_backfill_in_process_pool(tmp_path):
+    """The default process pool produces the same merged output."""
+    summary = backfill_mod.run_backfill(range(1, 5), str(tmp_path), shards=2, workers=2)
+    assert summary["rows"] == 7
+
+
+@pytest.mark.db
+@pytest.mark.usefixtures("fake_site")
+def test_scrape_shard_resume_skips_finished_segments(tmp_path):
+    """A finished segment (marked done) is skipped when resuming."""
+    first = backfill_mod.scrape_shard(0, [1, 2], str(tmp_path))
+    assert first["rows"] == 4
+    again = backfill_mod.scrape_shard(0, [1, 2], str(tmp_path), {"resume": True})
+    assert again["skipped"] is True
+    assert again["rows"] == 0
+    fresh = backfill_mod.scrape_shard(0, [1, 2], str(tmp_path))
+    assert fresh["skipped"] is False
+    assert fresh["rows"] == 4
+
+
+@pytest.mark.db
+def test_scrape_shard_resumes_crash_within_first_page(monkeypatch, tmp_path):
+    """A shard that died before its first checkpoint is resumed, not skipped."""
+    crash = {"on": "/11"}
+
+    def _fake_detail(url):
+        if crash["on"] and url.endswith(crash["on"]):
+            raise KeyboardInterrupt
+        return {}
+
+    monkeypatch.setattr(scrape_mod, "_fetch_html", _fake_site)
+    monkeypatch.setattr(scrape_mod, "parse_detail_page", _fake_detail)
+    options = {"detail_workers": 1}
+    with pytest.raises(KeyboardInterrupt):
+        backfill_mod.scrape_shard(0, [1, 2], str(tmp_path), options)
+    segment = tmp_path / "shard-000.jsonl"
+    assert segment.exists()
+    assert not (tmp_path / "shard-000.jsonl.checkpoint.json").exists()
+
+    crash["on"] = None
+    resumed = backfill_mod.scrape_shard(0, [1, 2], str(tmp_path), {**options, "resume": True})
+    assert resumed["skipped"] is False
+    assert resumed["rows"] == 3
+    urls = [json.loads(line)["url"] for line in segment.read_text().splitlines()]
+    assert [url.rsplit("/", 1)[-1] for url in urls] == ["10", "11", "20", "21"]
+    again = backfill_mod.scrape_shard(0, [1, 2], str(tmp_path), {"resume": True})
+    assert again["skipped"] is True
+
+
+@pytest.mark.db
+def test_merge_segments_handles_gaps(tmp_path):
+    """Missing segments, blank lines, and URL-less rows are handled."""
+    seg = tmp_path / "a.jsonl"
+    seg.write_text('{"url": null, "n": 1}\n\n{"url": "u"}\n{"url": "u"}\n', encoding="utf-8")
+    written, duplicates = backfill_mod.merge_segments(
+        [str(seg), str(tmp_path / "missing.jsonl")],
+        str(tmp_path / "out.jsonl"),
+    )
+    assert (written, duplicates) == (2, 1)
+
+
+@pytest.mark.db
+@pytest.mark.usefixtures("fake_site")
+def test_backfill_main(monkeypatch, tmp_path):
+    """module_2.backfill __main__ runs the historical range into ./backfill."""
+    monkeypatch.setattr(futures, "ProcessPoolExecutor", futures.ThreadPoolExecutor)
+    monkeypatch.chdir(tmp_path)
+    runpy.run_module("module_2.backfill", run_name="__main__")
+    assert (tmp_path / "backfill" / "backfill.jsonl").exists()
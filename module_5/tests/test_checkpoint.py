@@ -0,0 +1,147 @@
+"""Tests scrape checkpoints: atomic save/load and resuming an interrupted run."""
+
+import importlib
+import json
+import os
+import sys
+
+import pytest
+
+SRC_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+
+checkpoint_mod = importlib.import_module("module_2.checkpoint")
+scrape_mod = importlib.import_module("module_2.scrape")
+listing_html = importlib.import_module("data_builders").listing_html
+
+
+@pytest.mark.db
+def test_checkpoint_roundtrip_and_clear(tmp_path):
+    """State survives save/load, leaves no temp files, and clear removes it."""
+    path = tmp_path / "scrape.checkpoint.json"
+    assert checkpoint_mod.load_checkpoint(str(path)) == checkpoint_mod.new_state()
+    assert checkpoint_mod.load_checkpoint(None)["last_page"] == 0
+
+    state = {"last_page": 7, "emitted_urls": {"u2", "u1"}, "consecutive_existing": 3}
+    checkpoint_mod.save_checkpoint(str(path), state)
+    assert json.loads(path.read_text())["emitted_urls"] == ["u1", "u2"]
+    assert checkpoint_mod.load_checkpoint(str(path)) == state
+    assert os.listdir(tmp_path) == ["scrape.checkpoint.json"]
+
+    checkpoint_mod.clear_checkpoint(str(path))
+    checkpoint_mod.clear_checkpoint(str(path))
+    assert not path.exists()
+
+
+@pytest.mark.db
+def test_run_scrape_resumes_after_interruption(monkeypatch, tmp_path):
+    """A crash on page 2 resumes from page 2 without re-emitting page 1 rows."""
+    listing = {1: listing_html([10, 9]), 2: listing_html([9, 8]), 3: ""}
+    out_path = tmp_path / "rows.jsonl"
+    ckpt_path = tmp_path / "scrape.checkpoint.json"
+    fetched = []
+    crash = {"on": "/8"}
+
+    def _fake_fetch_html(url):
+        fetched.append(url)
+        return listing[int(url.rsplit("=", 1)[-1])]
+
+    def _fake_detail(url):
+        if crash["on"] and url.endswith(crash["on"]):
+            raise KeyboardInterrupt
+        return {"gpa_raw": url.rsplit("/", 1)[-1]}
+
+    monkeypatch.setattr(scrape_mod, "_fetch_html", _fake_fetch_html)
+    monkeypatch.setattr(scrape_mod, "parse_detail_page", _fake_detail)
+    options = {"checkpoint_path": str(ckpt_path), "detail_workers": 1}
+
+    with pytest.raises(KeyboardInterrupt):
+        scrape_mod.run_scrape(filename=str(out_path), options=options, stream=True)
+    saved = checkpoint_mod.load_checkpoint(str(ckpt_path))
+    assert saved["last_page"] == 1
+    assert saved["emitted_urls"] == {
+        "https://www.thegradcafe.com/result/10",
+        "https://www.thegradcafe.com/result/9",
+    }
+
+    crash["on"] = None
+    fetched.clear()
+    count = scrape_mod.run_scrape(
+        filename=str(out_path),
+        options={**options, "resume": True},
+        stream=True,
+    )
+    assert count == 1
+    assert fetched[0].endswith("page=2")
+    rows = [json.loads(line) for line in out_path.read_text().splitlines()]
+    assert [row["gpa_raw"] for row in rows] == ["10", "9", "8"]
+    assert not ckpt_path.exists()
+
+
+@pytest.mark.db
+def test_resume_restores_existing_counter(monkeypatch, tmp_path):
+    """The saved consecutive_existing counter carries over into the resumed run."""
+    ckpt_path = tmp_path / "scrape.checkpoint.json"
+    checkpoint_mod.save_checkpoint(
+        str(ckpt_path),
+        {"last_page": 4, "emitted_urls": set(), "consecutive_existing": 1},
+    )
+    monkeypatch.setattr(scrape_mod, "_fetch_html", lambda _url: listing_html([5, 4]))
+    monkeypatch.setattr(scrape_mod, "parse_detail_page", lambda _url: {})
+
+    entries = scrape_mod.scrape_data(
+        existing_urls={"https://www.thegradcafe.com/result/5"},
+        stop_after_existing=2,
+        options={"checkpoint_path": str(ckpt_path), "resume": True},
+    )
+    assert not entries
+    assert not ckpt_path.exists()
+
+
+@pytest.mark.db
+def test_resume_after_mid_page_crash_does_not_repeat_rows(monkeypatch, tmp_path):
+    """Rows streamed before a crash inside a page are not written again on resume."""
+    listing = {1: listing_html([10, 9]), 2: ""}
+    out_path = tmp_path / "rows.jsonl"
+    ckpt_path = tmp_path / "scrape.checkpoint.json"
+    crash = {"on": "/9"}
+
+    def _fake_detail(url):
+        if crash["on"] and url.endswith(crash["on"]):
+            raise KeyboardInterrupt
+        return {"gpa_raw": url.rsplit("/", 1)[-1]}
+
+    monkeypatch.setattr(
+        scrape_mod, "_fetch_html", lambda url: listing[int(url.rsplit("=", 1)[-1])]
+    )
+    monkeypatch.setattr(scrape_mod, "parse_detail_page", _fake_detail)
+    options = {"checkpoint_path": str(ckpt_path), "detail_workers": 1}
+
+    with pytest.raises(KeyboardInterrupt):
+        scrape_mod.run_scrape(filename=str(out_path), options=options, stream=True)
+    assert not ckpt_path.exists()
+    assert checkpoint_mod.load_checkpoint(str(ckpt_path))["emitted_urls"] == {
+        "https://www.thegradcafe.com/result/10"
+    }
+
+    crash["on"] = None
+    scrape_mod.run_scrape(filename=str(out_path), options={**options, "resume": True}, stream=True)
+    rows = [json.loads(line)["gpa_raw"] for line in out_path.read_text().splitlines()]
+    assert rows == ["10", "9"]
+    assert sorted(os.listdir(tmp_path)) == ["rows.jsonl"]
+
+
+@pytest.mark.db
+def test_run_scrape_rejects_checkpoint_without_stream(monkeypatch, tmp_path):
+    """The list path cannot honour a checkpoint, so it refuses before fetching anything."""
+    fetched = []
+    monkeypatch.setattr(scrape_mod, "_fetch_html", fetched.append)
+    out_path = tmp_path / "rows.json"
+    with pytest.raises(ValueError, match="stream=True"):
+        scrape_mod.run_scrape(
+            filename=str(out_path),
+            options={"checkpoint_path": str(tmp_path / "scrape.checkpoint.json")},
+        )
+    assert not fetched
+    assert not out_path.exists()
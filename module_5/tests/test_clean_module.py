@@ -5,6 +5,7 @@ import json
 import os
 import runpy
 import sys
+import tracemalloc
 
 import pytest
 
@@ -88,3 +89,192 @@ def test_run_clean_main(monkeypatch, tmp_path):
 
     monkeypatch.chdir(tmp_path)
     runpy.run_module("module_2.clean", run_name="__main__")
+
+
+def _raw_rows(count):
+    """Build count raw scraped rows with varied fields."""
+    return [
+        {
+            "program_raw": f" Program {i} ",
+            "university_raw": "Stanford University",
+            "gpa_raw": "0" if i % 5 == 0 else f"3.{i % 10}",
+            "url": f"https://www.thegradcafe.com/result/{i}",
+            "applicant_status_raw": "Accepted on 1 Feb" if i % 2 else "Rejected on 2 Feb",
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.mark.db
+@pytest.mark.parametrize("indent", [None, 2])
+def test_iter_entries_reads_json_arrays_across_chunk_boundaries(monkeypatch, tmp_path, indent):
+    """The incremental array reader matches json.load whatever the chunk size."""
+    data = _raw_rows(7) + [12345, "a],[b", None, [1, {"x": 2}]]
+    path = tmp_path / "in.json"
+    path.write_text(json.dumps(data, indent=indent))
+    for chunk in (1, 3, 64):
+        monkeypatch.setattr(clean_mod, "READ_CHUNK_CHARS", chunk)
+        assert list(clean_mod.iter_entries(str(path))) == data
+    monkeypatch.setattr(clean_mod, "READ_CHUNK_CHARS", 2)
+    path.write_text("   \n  []  ")
+    assert not list(clean_mod.iter_entries(str(path)))
+    path.write_text("  \n\n ")
+    assert not list(clean_mod.iter_entries(str(path)))
+
+
+@pytest.mark.db
+@pytest.mark.parametrize("chunk", [4, 8, 16])
+def test_iter_entries_keeps_numbers_split_across_chunks(monkeypatch, tmp_path, chunk):
+    """A float cut after its '.', 'e' or '-' is read whole, not as its integer part."""
+    data = [{"c": "xx"}, 3.75, 1e-7, -2.5e+3]
+    path = tmp_path / "in.json"
+    path.write_text(json.dumps(data))
+    monkeypatch.setattr(clean_mod, "READ_CHUNK_CHARS", chunk)
+    assert list(clean_mod.iter_entries(str(path))) == data
+
+
+@pytest.mark.db
+@pytest.mark.parametrize("text", ["[", "[1,", "[1 2]", "[{\"a\": }]"])
+def test_iter_entries_rejects_malformed_arrays(monkeypatch, tmp_path, text):
+    """Truncated or malformed arrays raise ValueError instead of yielding garbage."""
+    monkeypatch.setattr(clean_mod, "READ_CHUNK_CHARS", 2)
+    path = tmp_path / "bad.json"
+    path.write_text(text)
+    with pytest.raises(ValueError):
+        list(clean_mod.iter_entries(str(path)))
+
+
+@pytest.mark.db
+def test_iter_entries_reads_jsonl(tmp_path):
+    """Non-array input is read as JSONL with blank lines skipped."""
+    path = tmp_path / "in.jsonl"
+    path.write_text('{"url": "a"}\n\n{"url": "b"}\n')
+    assert [row["url"] for row in clean_mod.iter_entries(str(path))] == ["a", "b"]
+
+
+@pytest.mark.db
+@pytest.mark.parametrize("rows", [[], _raw_rows(3)])
+def test_stream_clean_output_matches_list_path(tmp_path, rows, capsys):
+    """Streaming clean writes the same bytes as the list path, for JSON and JSONL."""
+    inp = tmp_path / "in.json"
+    inp.write_text(json.dumps(rows, indent=2))
+    list_out = tmp_path / "list.json"
+    stream_out = tmp_path / "stream.json"
+    cleaned = clean_mod.run_clean(str(inp), str(list_out))
+    assert clean_mod.run_clean(str(inp), str(stream_out), stream=True) == len(cleaned)
+    assert stream_out.read_bytes() == list_out.read_bytes()
+    assert "Saved cleaned entries: " + str(len(rows)) in capsys.readouterr().out
+
+    jsonl_out = tmp_path / "out.jsonl"
+    assert clean_mod.run_clean(str(inp), str(jsonl_out), stream=True) == len(rows)
+    lines = jsonl_out.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == cleaned
+
+
+@pytest.mark.db
+def test_iter_clean_is_a_lazy_generator_stage():
+    """iter_clean pulls one raw entry per cleaned row it yields."""
+    pulled = []
+
+    def _source():
+        for row in _raw_rows(3):
+            pulled.append(row["url"])
+            yield row
+
+    stage = clean_mod.iter_clean(_source())
+    first = next(stage)
+    assert first["program"] == "Program 0" and first["gpa"] is None
+    assert len(pulled) == 1
+    assert [row["url"] for row in stage] == pulled[1:]
+
+
+@pytest.mark.db
+def test_stream_clean_peak_memory_is_flat(tmp_path):
+    """Peak traced memory of a streaming clean does not grow with input size."""
+    peaks = []
+    for count in (500, 5000):
+        inp = tmp_path / f"in_{count}.json"
+        inp.write_text(json.dumps(_raw_rows(count), indent=2))
+        tracemalloc.start()
+        clean_mod.run_clean(str(inp), str(tmp_path / "out.jsonl"), stream=True)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    assert peaks[1] < peaks[0] * 2
+
+
+@pytest.mark.db
+@pytest.mark.parametrize(
+    "value, bounds, expected",
+    [
+        ("3.91", (0.0, 4.3), 3.91),
+        ("4.5", (0.0, 4.3), None),
+        ("-1", (0.0, 4.3), None),
+        ("nan", (0.0, 4.3), None),
+        ("abc", (130.0, 340.0), None),
+        ("325", (130.0, 340.0), 325.0),
+        (165, (130.0, 170.0), 165.0),
+        (True, (0.0, 6.0), None),
+        (None, (0.0, 6.0), None),
+        ([4], (0.0, 6.0), None),
+    ],
+)
+def test_to_number(value, bounds, expected):
+    """to_number converts in-range numbers to float and nulls everything else."""
+    assert clean_mod.to_number(value, *bounds) == expected
+
+
+@pytest.mark.db
+def test_typed_clean_converts_numbers_only():
+    """typed=True gives floats or None and leaves other fields alone."""
+    raw = [
+        {
+            "gpa_raw": " 3.80 ",
+            "gre_score_raw": "330",
+            "gre_v_score_raw": "999",
+            "gre_aw_raw": "4.5",
+        },
+        {"gpa_raw": "0", "gre_score_raw": "GRE 320", "gre_v_score_raw": None, "gre_aw_raw": 7},
+        {"program_raw": " CS ", "gpa_raw": "12"},
+    ]
+    typed = clean_mod.clean_data(raw, typed=True)
+    assert [(r["gpa"], r["gre_total"], r["gre_verbal"], r["gre_writing"]) for r in typed] == [
+        (3.8, 330.0, None, 4.5),
+        (None, None, None, None),
+        (None, None, None, None),
+    ]
+    assert typed[2]["program"] == "CS"
+    assert clean_mod.clean_data(raw)[0]["gpa"] == "3.80"
+
+
+@pytest.mark.db
+def test_typed_clean_writes_iso_decision_dates():
+    """typed=True turns status dates into ISO dates, inferring the year from date_added."""
+    raw = [
+        {"applicant_status_raw": "Accepted on 12 Feb", "date_added_raw": " March 01, 2026 "},
+        {"applicant_status_raw": "Rejected on 29 Dec", "date_added_raw": "January 05, 2026"},
+        {"applicant_status_raw": "Rejected on Jan 01, 2025"},
+        {"applicant_status_raw": "Accepted on 12 Feb"},
+        {"applicant_status_raw": "Accepted on soon", "date_added_raw": "March 01, 2026"},
+        {"applicant_status_raw": "Wait listed on 1 Feb", "date_added_raw": "March 01, 2026"},
+    ]
+    typed = clean_mod.clean_data(raw, typed=True)
+    assert [(r["acceptance_date"], r["rejection_date"]) for r in typed] == [
+        ("2026-02-12", None),
+        (None, "2025-12-29"),
+        (None, "2025-01-01"),
+        (None, None),
+        (None, None),
+        (None, None),
+    ]
+    assert clean_mod.clean_data(raw)[0]["acceptance_date"] == "12 Feb"
+
+
+@pytest.mark.db
+def test_run_typed_clean_writes_json_numbers(tmp_path):
+    """run_typed_clean streams rows whose scores are JSON numbers."""
+    inp = tmp_path / "in.json"
+    out = tmp_path / "out.json"
+    inp.write_text(json.dumps([{"gpa_raw": "3.5", "gre_score_raw": "abc"}]))
+    assert clean_mod.run_typed_clean(str(inp), str(out)) == 1
+    assert '"gpa": 3.5' in out.read_text()
+    assert json.loads(out.read_text())[0]["gre_total"] is None
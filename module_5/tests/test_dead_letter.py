@@ -0,0 +1,114 @@
+"""Tests the dead-letter store for failed fetches and the targeted retry_failed entry point."""
+
+import importlib
+import os
+import sys
+
+import pytest
+
+SRC_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+
+dead_mod = importlib.import_module("module_2.dead_letter")
+scrape_mod = importlib.import_module("module_2.scrape")
+rate_mod = importlib.import_module("module_2.rate_limit")
+http_client_mod = importlib.import_module("module_2.http_client")
+listing_html = importlib.import_module("data_builders").listing_html
+
+SURVEY = "https://www.thegradcafe.com/survey/"
+ROOT = "https://www.thegradcafe.com/result/"
+
+
+def _detail_html(gpa):
+    """Return a detail page carrying one GPA field."""
+    return f"<main><dl><div><dt>Undergrad GPA</dt><dd>{gpa}</dd></div></dl></main>"
+
+
+@pytest.fixture(name="store")
+def fixture_store(tmp_path):
+    """Open a dead-letter store on a temporary database."""
+    store = dead_mod.DeadLetterStore(str(tmp_path / "dead.sqlite3"))
+    yield store
+    store.close()
+
+
+def _options(store):
+    """Scrape options with no pacing, one attempt per URL, and the given store."""
+    return {
+        "dead_letters": store,
+        "rate_limiter": rate_mod.AdaptiveRateLimiter(rate=1000, burst=1000),
+        "retry_policy": rate_mod.RetryPolicy(max_attempts=1),
+        "detail_workers": 1,
+    }
+
+
+@pytest.mark.db
+def test_store_records_attempts_and_resolves(store, tmp_path):
+    """Failures accumulate attempts with the latest error; success removes the URL."""
+    store.record(f"{SURVEY}?page=3", OSError("reset"))
+    store.record(f"{ROOT}9", http_client_mod.HttpError(f"{ROOT}9", 503, {}))
+    store.record(f"{ROOT}9", TimeoutError("slow"))
+
+    listing, detail = store.entries("listing"), store.entries("detail")
+    assert (listing[0]["page"], listing[0]["error_class"], listing[0]["attempts"]) == (
+        3,
+        "OSError",
+        1,
+    )
+    assert (detail[0]["error_class"], detail[0]["attempts"]) == ("TimeoutError", 2)
+    assert len(store) == 2
+
+    store.resolve(f"{ROOT}1")
+    store.resolve(f"{ROOT}9")
+    assert [entry["url"] for entry in store.entries()] == [f"{SURVEY}?page=3"]
+    assert len(dead_mod.DeadLetterStore(str(tmp_path / "dead.sqlite3"))) == 1
+    assert dead_mod.classify_url(f"{ROOT}1?page=2") == ("detail", None)
+
+
+@pytest.mark.db
+def test_scrape_dead_letters_then_retry_failed_recovers(store, monkeypatch):
+    """A flaky run records its failures; retry_failed re-fetches only those URLs."""
+    site = {
+        f"{SURVEY}?page=1": listing_html([4, 3]),
+        f"{SURVEY}?page=2": listing_html([2, 1]),
+        f"{ROOT}4": _detail_html("3.4"),
+        f"{ROOT}3": _detail_html("3.3"),
+        f"{ROOT}2": _detail_html("3.2"),
+        f"{ROOT}1": _detail_html("3.1"),
+    }
+    broken = {f"{SURVEY}?page=2", f"{ROOT}3"}
+    fetched = []
+
+    def _get_text(url):
+        fetched.append(url)
+        if url in broken:
+            raise OSError("connection reset")
+        return site.get(url, "<p>end</p>")
+
+    monkeypatch.setattr(scrape_mod.HTTP_SESSION, "get_text", _get_text)
+    entries = scrape_mod.scrape_data(options=_options(store))
+    assert [entry.get("gpa_raw") for entry in entries] == ["3.4", None]
+    assert {entry["url"] for entry in store.entries()} == broken
+
+    broken.clear()
+    fetched.clear()
+    rows, details = scrape_mod.retry_failed(store, _options(store))
+    assert [row["gpa_raw"] for row in rows] == ["3.2", "3.1"]
+    assert details == {f"{ROOT}3": {"gpa_raw": "3.3"}}
+    assert sorted(fetched) == sorted([f"{SURVEY}?page=2", f"{ROOT}2", f"{ROOT}1", f"{ROOT}3"])
+    assert not store.entries()
+
+
+@pytest.mark.db
+def test_retry_failed_keeps_urls_that_still_fail(store, monkeypatch):
+    """A URL that fails again stays dead-lettered with a higher attempt count."""
+    store.record(f"{ROOT}8", OSError("reset"))
+
+    def _get_text(_url):
+        raise OSError("still down")
+
+    monkeypatch.setattr(scrape_mod.HTTP_SESSION, "get_text", _get_text)
+    rows, details = scrape_mod.retry_failed(store, _options(store))
+    assert (rows, details) == ([], {})
+    assert store.entries()[0]["attempts"] == 2
@@ -0,0 +1,134 @@
+"""Tests selective detail enrichment by a listing-level predicate."""
+
+import importlib
+import os
+import runpy
+import sqlite3
+import sys
+
+import flask
+import pytest
+
+SRC_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+
+scrape_mod = importlib.import_module("module_2.scrape")
+queue_mod = importlib.import_module("module_2.enrich_queue")
+dead_letter_mod = importlib.import_module("module_2.dead_letter")
+metrics_mod = importlib.import_module("module_2.metrics")
+replay_mod = importlib.import_module("module_2.replay")
+app_mod = importlib.import_module("app")
+server_options = importlib.import_module("data_builders").server_options
+
+
+@pytest.mark.db
+def test_enrichment_predicate_matches_university_and_status():
+    """Criteria are case-insensitive substrings; empty criteria match everything."""
+    row = {
+        "university_raw": "Johns Hopkins University",
+        "applicant_status_raw": "Accepted on 2 Feb",
+    }
+    assert scrape_mod.enrichment_predicate()(row)
+    assert scrape_mod.enrichment_predicate(["hopkins", "Stanford"])(row)
+    assert not scrape_mod.enrichment_predicate(["MIT"])(row)
+    assert scrape_mod.enrichment_predicate(["Hopkins"], ["accepted"])(row)
+    assert not scrape_mod.enrichment_predicate(["Hopkins"], ["Rejected"])(row)
+    assert not scrape_mod.enrichment_predicate(["Hopkins"])({"university_raw": None})
+
+
+@pytest.mark.db
+def test_scrape_fetches_details_only_for_matching_rows():
+    """Unmatched rows are emitted listing-only and no detail request is made for them."""
+    site = replay_mod.SyntheticSite(pages=2, rows_per_page=5)
+    metrics = metrics_mod.ScrapeMetrics()
+    predicate = scrape_mod.enrichment_predicate(["Stanford"])
+    with replay_mod.ReplayServer(site) as server:
+        rows = scrape_mod.scrape_data(
+            options=server_options(server, enrich_predicate=predicate, metrics=metrics)
+        )
+        requests = server.stats()["requests"]
+
+    matched = [row for row in rows if "Stanford" in row["university_raw"]]
+    assert len(rows) == 10
+    assert 0 < len(matched) < len(rows)
+    assert all(row["gpa_raw"] for row in matched)
+    assert all(row["gpa_raw"] is None for row in rows if row not in matched)
+    assert requests == 3 + len(matched)
+    summary = metrics.summary()
+    assert summary["detail_hits"] == len(matched)
+    assert summary["detail_skipped"] == len(rows) - len(matched)
+
+
+@pytest.mark.db
+def test_deferred_scrape_queues_unmatched_rows_at_low_priority(tmp_path):
+    """In deferred mode matching URLs are claimed before unmatched ones."""
+    site = replay_mod.SyntheticSite(pages=1, rows_per_page=6)
+    queue = queue_mod.EnrichmentQueue(str(tmp_path / "q.sqlite3"))
+    predicate = scrape_mod.enrichment_predicate(["Carnegie"])
+    with replay_mod.ReplayServer(site) as server:
+        rows = scrape_mod.scrape_data(
+            options=server_options(server, enrichment_queue=queue, enrich_predicate=predicate)
+        )
+    wanted = [row["url"] for row in rows if "Carnegie" in row["university_raw"]]
+    claimed = [url for url, _ in queue.claim(len(rows))]
+    assert wanted and claimed[:len(wanted)] == wanted
+    assert sorted(claimed) == sorted(row["url"] for row in rows)
+    queue.close()
+
+
+@pytest.mark.db
+def test_enqueue_promotes_low_priority_urls(tmp_path):
+    """Re-queueing a low-priority URL at normal priority moves it ahead."""
+    queue = queue_mod.EnrichmentQueue(str(tmp_path / "q.sqlite3"))
+    assert queue.enqueue(["a", "b"], priority=queue_mod.LOW_PRIORITY) == 2
+    assert queue.enqueue(["c"]) == 1
+    assert queue.enqueue(["b"]) == 0
+    assert queue.enqueue(["c"], priority=queue_mod.LOW_PRIORITY) == 0
+    assert [url for url, _ in queue.claim(3)] == ["b", "c", "a"]
+    assert queue.stats()["enqueued"] == 3
+    queue.close()
+
+
+@pytest.mark.db
+def test_queue_adds_priority_column_to_existing_database(tmp_path):
+    """A queue file created before priorities existed is migrated in place."""
+    path = str(tmp_path / "old.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE enrichment_queue (url TEXT PRIMARY KEY, enqueued_at REAL NOT NULL, "
+        "attempts INTEGER NOT NULL DEFAULT 0, claimed_at REAL)"
+    )
+    conn.execute("INSERT INTO enrichment_queue (url, enqueued_at) VALUES ('old', 0)")
+    conn.commit()
+    conn.close()
+    queue = queue_mod.EnrichmentQueue(path)
+    queue.enqueue(["new"], priority=queue_mod.LOW_PRIORITY)
+    assert [url for url, _ in queue.claim(2)] == ["old", "new"]
+    queue.close()
+
+
+@pytest.mark.db
+def test_pull_passes_predicate_and_main_reads_env(monkeypatch, tmp_path):
+    """Pull Data forwards the configured predicate; ENRICH_UNIVERSITIES builds one."""
+    predicate = scrape_mod.enrichment_predicate(["MIT"])
+    captured = {}
+    monkeypatch.setitem(app_mod.APP_STATE, "enrich_predicate", predicate)
+    monkeypatch.setitem(app_mod.APP_STATE, "scrape_metrics", None)
+    monkeypatch.setattr(app_mod, "ensure_initial_dataset_loaded", lambda: False)
+    monkeypatch.setattr(app_mod, "fetch_max_result_id", lambda: None)
+    monkeypatch.setattr(app_mod, "run_scrape", lambda **kw: captured.update(kw["options"]))
+    monkeypatch.setattr(app_mod, "run_typed_clean", lambda **_kw: None)
+    monkeypatch.setattr(app_mod, "run_llm_and_write_out_json", lambda: None)
+    monkeypatch.setattr(app_mod, "merge_out_into_module2_out", lambda: (0, 0))
+    monkeypatch.setattr(app_mod, "run_load", lambda **_kw: None)
+    assert app_mod.run_pull_data_pipeline()[0]
+    assert captured["enrich_predicate"] is predicate
+
+    monkeypatch.setenv("ENRICH_UNIVERSITIES", "Stanford, Georgetown ,")
+    monkeypatch.setattr(dead_letter_mod, "DEFAULT_DEAD_LETTER_PATH", str(tmp_path / "dl.sqlite3"))
+    monkeypatch.setattr(flask.Flask, "run", lambda *_, **__: None)
+    namespace = runpy.run_module("app", run_name="__main__")
+    configured = namespace["APP_STATE"]["enrich_predicate"]
+    assert configured({"university_raw": "Georgetown University"})
+    assert not configured({"university_raw": "MIT"})
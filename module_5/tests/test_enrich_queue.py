@@ -0,0 +1,305 @@
+"""Tests listing-only scrapes with the deferred SQLite enrichment queue and worker."""
+
+import importlib
+import os
+import runpy
+import sys
+import time
+from types import SimpleNamespace
+
+import flask
+import pytest
+
+SRC_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+
+queue_mod = importlib.import_module("module_2.enrich_queue")
+dead_letter_mod = importlib.import_module("module_2.dead_letter")
+scrape_mod = importlib.import_module("module_2.scrape")
+app_mod = importlib.import_module("app")
+listing_html = importlib.import_module("data_builders").listing_html
+
+ROOT = "https://www.thegradcafe.com/result/"
+
+
+class _Cursor:
+    """Cursor double recording parameters, with a fixed stored row and rowcount."""
+
+    def __init__(self, rowcount, stored=("Johns Hopkins University",)):
+        """Store the rowcount reported after execute and the row fetchone returns."""
+        self.rowcount = rowcount
+        self.stored = stored
+        self.params = None
+        self.queries = 0
+
+    def execute(self, _query, params):
+        """Record query parameters."""
+        self.params = params
+        self.queries += 1
+
+    def fetchone(self):
+        """Return the stored row (None when no applicants row matched)."""
+        return self.stored
+
+    def close(self):
+        """No-op close method."""
+        return None
+
+
+class _Conn:
+    """Connection double returning a fixed cursor."""
+
+    def __init__(self, cursor):
+        """Hold the cursor."""
+        self._cursor = cursor
+        self.committed = False
+
+    def cursor(self):
+        """Return the held cursor."""
+        return self._cursor
+
+    def commit(self):
+        """Record the commit."""
+        self.committed = True
+
+    def close(self):
+        """No-op close method."""
+        return None
+
+
+@pytest.fixture(name="queue")
+def fixture_queue(tmp_path):
+    """Open a queue in a temporary database."""
+    queue = queue_mod.EnrichmentQueue(str(tmp_path / "queue.sqlite3"))
+    yield queue
+    queue.close()
+
+
+@pytest.mark.db
+def test_queue_enqueue_claim_release_complete(queue, monkeypatch):
+    """URLs are queued once, leased in order, released, re-leased after expiry, and removed."""
+    assert queue.enqueue([f"{ROOT}1", f"{ROOT}2", None, f"{ROOT}1"]) == 2
+    assert queue.enqueue([f"{ROOT}2"]) == 0
+    assert queue.claim(1) == [(f"{ROOT}1", 1)]
+    assert queue.claim(5) == [(f"{ROOT}2", 1)]
+    assert not queue.claim(5)
+
+    queue.release(f"{ROOT}1")
+    assert queue.claim(5) == [(f"{ROOT}1", 2)]
+
+    later = queue_mod.time.time() + 10 * 60
+    monkeypatch.setattr(queue_mod, "time", SimpleNamespace(time=lambda: later))
+    assert {url for url, _ in queue.claim(5)} == {f"{ROOT}1", f"{ROOT}2"}
+
+    queue.complete(f"{ROOT}1")
+    assert queue.pending() == 1
+    assert queue.stats() == {"enqueued": 2, "completed": 1, "released": 1, "pending": 1}
+
+
+@pytest.mark.db
+def test_worker_patches_retries_and_gives_up(queue):
+    """Patched URLs leave the queue; failed fetches are retried up to max_attempts."""
+    queue.enqueue([f"{ROOT}1", f"{ROOT}2", f"{ROOT}3"])
+    patched = {}
+
+    def _apply(url, fields):
+        if url.endswith("/3"):
+            return False
+        patched[url] = fields
+        return True
+
+    def _fetch(url):
+        return {} if url.endswith("/2") else {"gpa_raw": url[-1]}
+
+    worker = queue_mod.EnrichmentWorker(queue, _apply, _fetch, batch_size=10)
+    assert worker.run_once() == 1
+    assert patched == {f"{ROOT}1": {"gpa_raw": "1"}}
+    assert queue.pending() == 2
+    assert worker.run_once() == 0
+    assert worker.run_once() == 0
+    assert [url for url, _ in queue.claim(5)] == [f"{ROOT}3"]
+
+
+@pytest.mark.db
+def test_worker_requeues_unloaded_rows_without_refetching(queue):
+    """A row not loaded yet uses no attempt and its page is fetched only once."""
+    queue.enqueue([f"{ROOT}1", f"{ROOT}2"])
+    loaded = set()
+    fetched = []
+
+    def _fetch(url):
+        fetched.append(url)
+        return {"gpa_raw": url[-1]}
+
+    worker = queue_mod.EnrichmentWorker(
+        queue, lambda url, _fields: url in loaded, _fetch, batch_size=1
+    )
+    for _ in range(2 * worker.max_attempts):
+        assert worker.run_once() == 0
+    assert queue.pending() == 2
+    assert sorted(fetched) == [f"{ROOT}1", f"{ROOT}2"]
+    assert {url: attempts for url, attempts in queue.claim(5)} == {f"{ROOT}1": 1, f"{ROOT}2": 1}
+
+    queue.release(f"{ROOT}1")
+    queue.release(f"{ROOT}2")
+    loaded.update((f"{ROOT}1", f"{ROOT}2"))
+    assert worker.run_once() + worker.run_once() == 2
+    assert queue.pending() == 0
+    assert len(fetched) == 2
+
+
+@pytest.mark.db
+def test_worker_thread_drains_queue(queue):
+    """start() drains the queue on a background thread; stop() joins it."""
+    queue.enqueue([f"{ROOT}{n}" for n in range(5)])
+    worker = queue_mod.EnrichmentWorker(queue, lambda *_: True, lambda _url: {"x": 1}, 2)
+    worker.start(interval=0.01)
+    worker.start(interval=0.01)
+    for _ in range(500):
+        if not queue.pending():
+            break
+        time.sleep(0.01)
+    worker.stop(timeout=5)
+    assert queue.pending() == 0
+
+
+@pytest.mark.db
+def test_worker_survives_callback_errors(queue, capsys):
+    """A failing batch is logged and its unsettled URLs released; the thread keeps going."""
+    queue.enqueue([f"{ROOT}1", f"{ROOT}2"])
+    failures = {"apply": 1, "fetch": 1}
+
+    def _apply(url, _fields):
+        if url.endswith("/2") and failures["apply"]:
+            failures["apply"] -= 1
+            raise RuntimeError("database went away")
+        return True
+
+    def _fetch(_url):
+        if failures["fetch"]:
+            failures["fetch"] -= 1
+            raise ValueError("unparseable page")
+        return {"x": 1}
+
+    worker = queue_mod.EnrichmentWorker(queue, _apply, _fetch, batch_size=2)
+    assert worker.run_once() == 0
+    assert "Enrichment batch failed: unparseable page" in capsys.readouterr().out
+    assert queue.pending() == 2
+    assert worker.run_once() == 0
+    assert "database went away" in capsys.readouterr().out
+    assert queue.pending() == 1
+
+    worker.start(interval=0.01)
+    for _ in range(500):
+        if not queue.pending():
+            break
+        time.sleep(0.01)
+    worker.stop(timeout=5)
+    assert queue.pending() == 0
+
+    queue.enqueue([f"{ROOT}3"])
+    broken = queue_mod.EnrichmentWorker(queue, _apply, lambda _url: 1 / 0 or {}, 1)
+    broken.batch_errors = (ZeroDivisionError,)
+    for _ in range(broken.max_attempts):
+        assert broken.run_once() == 0
+    assert queue.pending() == 0
+
+
+@pytest.mark.db
+def test_deferred_scrape_emits_listing_rows_and_queues_urls(queue, monkeypatch):
+    """With an enrichment queue the scrape fetches no detail pages."""
+    pages = {"1": listing_html([3, 2])}
+    monkeypatch.setattr(scrape_mod, "_fetch_html", lambda url: pages.get(url[-1], ""))
+
+    def _no_detail(url):
+        raise AssertionError(f"detail fetched: {url}")
+
+    monkeypatch.setattr(scrape_mod, "parse_detail_page", _no_detail)
+    entries = scrape_mod.scrape_data(options={"enrichment_queue": queue})
+    assert [entry["url"] for entry in entries] == [f"{ROOT}3", f"{ROOT}2"]
+    assert entries[0]["gpa_raw"] is None
+    assert {url for url, _ in queue.claim(5)} == {f"{ROOT}3", f"{ROOT}2"}
+
+
+@pytest.mark.db
+@pytest.mark.parametrize("rowcount", [1, 0])
+def test_patch_applicant_details(monkeypatch, rowcount):
+    """Detail fields are cleaned and written with COALESCE; rowcount drives the result."""
+    cur = _Cursor(rowcount)
+    conn = _Conn(cur)
+    standardized = []
+
+    def _standardize(row):
+        standardized.append(row)
+        return {"llm-generated-program": "Computer Science", "llm-generated-university": "JHU"}
+
+    monkeypatch.setattr(app_mod, "get_db_connection", lambda: conn)
+    monkeypatch.setattr(app_mod.llm_app, "standardize_row", _standardize)
+    matched = app_mod.patch_applicant_details(
+        f"{ROOT}9",
+        {"gpa_raw": " 3.80 ", "gre_score_raw": "0", "program_raw": "CS"},
+    )
+    assert matched is bool(rowcount)
+    assert conn.committed
+    assert standardized == [{"program": "CS", "university": "Johns Hopkins University"}]
+    assert cur.params == (
+        None, "CS", None, None, 3.8, None, None, None, None,
+        "Computer Science", "JHU", f"{ROOT}9",
+    )
+
+
+@pytest.mark.db
+def test_patch_applicant_details_without_program_or_row(monkeypatch):
+    """No program keeps the llm columns; a row not loaded yet is not updated."""
+    monkeypatch.setattr(app_mod.llm_app, "standardize_row", pytest.fail)
+    cur = _Cursor(1)
+    monkeypatch.setattr(app_mod, "get_db_connection", lambda: _Conn(cur))
+    assert app_mod.patch_applicant_details(f"{ROOT}9", {"gpa_raw": "3.5"}) is True
+    assert cur.params[-3:] == (None, None, f"{ROOT}9")
+
+    cur = _Cursor(1, stored=None)
+    monkeypatch.setattr(app_mod, "get_db_connection", lambda: _Conn(cur))
+    assert app_mod.patch_applicant_details(f"{ROOT}9", {"program_raw": "CS"}) is False
+    assert cur.queries == 1
+
+
+@pytest.mark.db
+def test_enable_deferred_enrichment_routes_pull_through_queue(monkeypatch, tmp_path):
+    """Once enabled, Pull Data passes the queue to run_scrape."""
+    started = []
+    monkeypatch.setattr(queue_mod.EnrichmentWorker, "start", lambda self, i: started.append(i))
+    monkeypatch.setitem(app_mod.APP_STATE, "enrichment_queue", None)
+    monkeypatch.setitem(app_mod.APP_STATE, "enrichment_worker", None)
+    worker = app_mod.enable_deferred_enrichment(str(tmp_path / "q.sqlite3"), interval=5)
+    assert app_mod.enable_deferred_enrichment(interval=7) is worker
+    assert started == [5, 7]
+    assert app_mod.psycopg.Error in worker.batch_errors
+
+    captured = {}
+    monkeypatch.setattr(app_mod, "ensure_initial_dataset_loaded", lambda: False)
+    monkeypatch.setattr(app_mod, "fetch_max_result_id", lambda: 5)
+    monkeypatch.setattr(app_mod, "run_scrape", lambda **kw: captured.update(kw["options"]))
+    monkeypatch.setattr(app_mod, "run_typed_clean", lambda **_kw: None)
+    monkeypatch.setattr(app_mod, "run_llm_and_write_out_json", lambda: None)
+    monkeypatch.setattr(app_mod, "merge_out_into_module2_out", lambda: (0, 0))
+    monkeypatch.setattr(app_mod, "run_load", lambda **_kw: None)
+    monkeypatch.setitem(app_mod.APP_STATE, "scrape_metrics", None)
+    ok, _status, _seeded = app_mod.run_pull_data_pipeline()
+    assert ok
+    assert captured.pop("metrics") is app_mod.APP_STATE["scrape_metrics"]
+    assert captured == {"watermark": 5, "enrichment_queue": worker.queue}
+    worker.queue.close()
+
+
+@pytest.mark.db
+def test_app_main_with_deferred_enrichment(monkeypatch, tmp_path):
+    """DEFERRED_ENRICHMENT=1 starts the worker before serving."""
+    started = []
+    monkeypatch.setenv("DEFERRED_ENRICHMENT", "1")
+    monkeypatch.setattr(queue_mod, "DEFAULT_QUEUE_PATH", str(tmp_path / "q.sqlite3"))
+    monkeypatch.setattr(dead_letter_mod, "DEFAULT_DEAD_LETTER_PATH", str(tmp_path / "dl.sqlite3"))
+    monkeypatch.setattr(queue_mod.EnrichmentWorker, "start", lambda self, i: started.append(i))
+    monkeypatch.setattr(flask.Flask, "run", lambda *_, **__: None)
+    runpy.run_module("app", run_name="__main__")
+    assert started == [30.0]
@@ -0,0 +1,197 @@
+"""Tests the on-disk response cache: TTLs, revalidation, offline mode, and LRU eviction."""
+
+import importlib
+import os
+import sys
+import types
+
+import pytest
+
+SRC_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+
+cache_mod = importlib.import_module("module_2.http_cache")
+http_mod = importlib.import_module("module_2.http_client")
+scrape_mod = importlib.import_module("module_2.scrape")
+rate_mod = importlib.import_module("module_2.rate_limit")
+
+
+class _FakeSession:
+    """Session double returning queued responses and recording request headers."""
+
+    def __init__(self, *responses):
+        """Queue (status, headers, body) tuples to return in order."""
+        self.responses = list(responses)
+        self.calls = []
+
+    def request(self, url, headers=None):
+        """Pop the next queued response for url."""
+        self.calls.append((url, dict(headers or {})))
+        status, resp_headers, body = self.responses.pop(0)
+        return http_mod.HttpResponse(url, status, resp_headers, body)
+
+
+def _age_entries(cache, seconds):
+    """Shift stored_at back so entries look older than their TTL."""
+    db = getattr(cache, "_db")
+    db.execute("UPDATE entries SET stored_at = stored_at - ?", (seconds,))
+    db.commit()
+
+
+@pytest.mark.db
+def test_cache_hit_skips_network(tmp_path):
+    """A fresh entry is served from disk without calling the session."""
+    session = _FakeSession((200, {"etag": '"v1"'}, b"<p>one</p>"))
+    cache = cache_mod.ResponseCache(session, root=str(tmp_path))
+    url = "https://www.thegradcafe.com/result/1"
+
+    assert cache.get_text(url) == "<p>one</p>"
+    assert cache.get_text(url) == "<p>one</p>"
+    assert len(session.calls) == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    cache.close()
+
+
+@pytest.mark.db
+def test_cache_revalidates_with_conditional_get(tmp_path):
+    """Stale entries send validators; 304 reuses the body, 200 replaces it."""
+    session = _FakeSession(
+        (200, {"etag": '"v1"', "last-modified": "Mon, 01 Jan 2025 00:00:00 GMT"}, b"old"),
+        (304, {}, b""),
+        (200, {"etag": '"v2"'}, b"new"),
+    )
+    cache = cache_mod.ResponseCache(session, root=str(tmp_path))
+    url = "https://www.thegradcafe.com/survey/?page=1"
+    cache.get_text(url)
+
+    _age_entries(cache, cache.ttl_for(url) + 1)
+    assert cache.get_text(url) == "old"
+    assert session.calls[1][1] == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Mon, 01 Jan 2025 00:00:00 GMT",
+    }
+    assert cache.stats()["revalidated"] == 1
+
+    _age_entries(cache, cache.ttl_for(url) + 1)
+    assert cache.get_text(url) == "new"
+    blobs = [name for _, _, names in os.walk(tmp_path / "blobs") for name in names]
+    assert len(blobs) == 1
+    cache.close()
+
+
+@pytest.mark.db
+def test_cache_offline_mode(tmp_path):
+    """Offline caches serve stale bodies and raise CacheMiss for unknown URLs."""
+    online = cache_mod.ResponseCache(_FakeSession((200, {}, b"body")), root=str(tmp_path))
+    online.get_text("https://example.com/a")
+    _age_entries(online, 10 ** 9)
+    online.close()
+
+    offline = cache_mod.ResponseCache(_FakeSession(), root=str(tmp_path), offline=True)
+    assert offline.get_text("https://example.com/a") == "body"
+    with pytest.raises(cache_mod.CacheMiss):
+        offline.get_text("https://example.com/b")
+    offline.close()
+
+
+@pytest.mark.db
+def test_cache_errors_and_uncached_statuses(tmp_path):
+    """Error statuses raise HttpError and non-200 successes are not stored."""
+    session = _FakeSession((503, {}, b""), (203, {}, b"partial"))
+    cache = cache_mod.ResponseCache(session, root=str(tmp_path))
+    with pytest.raises(http_mod.HttpError):
+        cache.get_text("https://example.com/down")
+    assert cache.get_text("https://example.com/partial") == "partial"
+    assert cache.total_bytes() == 0
+    cache.close()
+
+
+@pytest.mark.db
+def test_cache_lru_eviction_and_shared_blobs(tmp_path, monkeypatch):
+    """Least recently used entries are evicted; shared blobs survive."""
+    clock = {"now": 1000.0}
+
+    def _tick():
+        clock["now"] += 1
+        return clock["now"]
+
+    monkeypatch.setattr(cache_mod, "time", types.SimpleNamespace(time=_tick))
+    session = _FakeSession(
+        (200, {}, b"aaaa"),
+        (200, {}, b"aaaa"),
+        (200, {}, b"bbbb"),
+        (200, {}, b"cccc"),
+    )
+    cache = cache_mod.ResponseCache(session, root=str(tmp_path), max_bytes=10)
+    cache.get_text("https://example.com/1")
+    cache.get_text("https://example.com/2")
+    assert cache.total_bytes() == 8
+    cache.get_text("https://example.com/1")
+
+    cache.get_text("https://example.com/3")
+    assert cache.stats()["evicted"] == 1
+    assert cache.get_text("https://example.com/1") == "aaaa"
+
+    cache.get_text("https://example.com/4")
+    assert cache.total_bytes() <= 10
+    assert cache.stats()["evicted"] == 2
+    cache.close()
+
+
+@pytest.mark.db
+def test_cache_ttl_rules(tmp_path):
+    """Listing, result, custom, and fallback URLs get their own TTLs."""
+    cache = cache_mod.ResponseCache(_FakeSession(), root=str(tmp_path))
+    assert cache.ttl_for("https://www.thegradcafe.com/survey/?page=3") == 15 * 60
+    assert cache.ttl_for("https://www.thegradcafe.com/result/99") == 30 * 24 * 60 * 60
+    assert cache.ttl_for("https://example.com/") == cache_mod.DEFAULT_TTL_SECONDS
+    cache.set_ttl(r"/result/", 5)
+    assert cache.ttl_for("https://www.thegradcafe.com/result/99") == 5
+    cache.close()
+
+
+@pytest.mark.db
+def test_scrape_data_uses_cache_option(tmp_path):
+    """scrape_data routes fetches through http_cache and restores the client after."""
+    listing = """
+    <table><tr><th>h</th></tr>
+    <tr><td>CS</td><td>JHU</td><td>Jan 1</td><td>Accepted</td>
+    <td><a href="/result/5">x</a></td></tr></table>
+    """
+    session = _FakeSession(
+        (200, {}, listing.encode("utf-8")),
+        (200, {}, b"<main><dl><div><dt>Undergrad GPA</dt><dd>3.3</dd></div></dl></main>"),
+        (200, {}, b"<p>no table</p>"),
+    )
+    cache = cache_mod.ResponseCache(session, root=str(tmp_path))
+    entries = scrape_mod.scrape_data(options={"http_cache": cache})
+    assert entries[0]["gpa_raw"] == "3.3"
+    assert cache.stats()["stored"] == 3
+    assert scrape_mod.current_run_state()["client"] is scrape_mod.HTTP_SESSION
+
+    limiter = rate_mod.AdaptiveRateLimiter(rate=1.0, burst=1)
+    again = scrape_mod.scrape_data(options={"http_cache": cache, "rate_limiter": limiter})
+    assert again == entries
+    assert cache.stats()["hits"] == 3
+    assert limiter.stats() == {"acquired": 0, "waited_seconds": 0.0, "throttled": 0, "rate": 1.0}
+    cache.close()
+
+
+@pytest.mark.db
+def test_paced_session_retries_network_misses_only(tmp_path):
+    """Through a PacedSession a 503 miss is throttled and retried; the hit is not paced."""
+    session = _FakeSession((503, {"retry-after": "0"}, b"busy"), (200, {}, b"<p>ok</p>"))
+    cache = cache_mod.ResponseCache(session, root=str(tmp_path))
+    limiter = rate_mod.AdaptiveRateLimiter()
+    paced = rate_mod.PacedSession(session, limiter, rate_mod.RetryPolicy(base_delay=0))
+    url = "https://www.thegradcafe.com/result/7"
+
+    assert cache.get_text(url, session=paced) == "<p>ok</p>"
+    assert cache.get_text(url, session=paced) == "<p>ok</p>"
+    assert len(session.calls) == 2
+    assert limiter.stats()["acquired"] == 2
+    assert limiter.stats()["throttled"] == 1
+    assert cache.stats()["hits"] == 1
+    cache.close()
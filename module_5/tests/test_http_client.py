@@ -0,0 +1,194 @@
+"""Tests the pooled keep-alive HTTP client against a local HTTP/1.1 server."""
+
+import gzip
+import http.client
+import importlib
+import os
+import sys
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+SRC_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+
+http_mod = importlib.import_module("module_2.http_client")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serve a few fixed routes used to exercise client behavior."""
+
+    protocol_version = "HTTP/1.1"
+
+    def _send(self, status, body=b"", headers=None):
+        """Write a response with Content-Length so the socket stays open."""
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        """Dispatch GET requests by path."""
+        routes = {
+            "/plain": (200, b"<p>plain</p>", {}),
+            "/gzip": (200, gzip.compress(b"<p>gz</p>"), {"Content-Encoding": "gzip"}),
+            "/deflate": (200, zlib.compress(b"<p>zl</p>"), {"Content-Encoding": "deflate"}),
+            "/latin": (200, "café".encode("latin-1"),
+                       {"Content-Type": "text/html; charset=latin-1"}),
+            "/redirect": (302, b"", {"Location": "/plain"}),
+            "/loop": (302, b"", {"Location": "/loop"}),
+            "/close": (200, b"bye", {"Connection": "close"}),
+        }
+        path = self.path.split("?", 1)[0]
+        status, body, headers = routes.get(path, (404, b"missing", {}))
+        self._send(status, body, headers)
+
+    def log_message(self, *_args):
+        """Silence request logging during tests."""
+
+
+@pytest.fixture(name="server_url")
+def fixture_server_url():
+    """Run a threaded HTTP/1.1 server for the duration of one test."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.db
+def test_session_reuses_keep_alive_connections(server_url):
+    """Sequential requests to one host open one connection and reuse it."""
+    session = http_mod.HttpSession()
+    for _ in range(3):
+        assert session.get_text(f"{server_url}/plain?page=1") == "<p>plain</p>"
+    stats = session.stats()
+    assert stats == {"requests": 3, "connections_opened": 1, "connections_reused": 2}
+
+    session.reset_stats()
+    assert session.stats()["requests"] == 0
+    session.close()
+    session.get_text(f"{server_url}/plain")
+    assert session.stats()["connections_opened"] == 1
+
+
+@pytest.mark.db
+def test_session_decodes_content_and_charset(server_url):
+    """gzip/deflate bodies are decoded and Content-Type charset is honored."""
+    session = http_mod.HttpSession()
+    assert session.get_text(f"{server_url}/gzip") == "<p>gz</p>"
+    assert session.get_text(f"{server_url}/deflate") == "<p>zl</p>"
+    assert session.get_text(f"{server_url}/latin") == "café"
+
+    raw = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+    raw_body = raw.compress(b"raw") + raw.flush()
+    assert http_mod.decode_body(raw_body, "deflate") == b"raw"
+    assert http_mod.decode_body(b"same", "br") == b"same"
+
+
+@pytest.mark.db
+def test_session_redirects_and_errors(server_url):
+    """Redirects are followed; loops and 4xx statuses raise HttpError."""
+    session = http_mod.HttpSession()
+    response = session.request(f"{server_url}/redirect")
+    assert response.status == 200
+    assert response.url.endswith("/plain")
+
+    with pytest.raises(http_mod.HttpError) as loop_err:
+        session.request(f"{server_url}/loop")
+    assert loop_err.value.status == 302
+
+    with pytest.raises(http_mod.HttpError) as missing:
+        session.get_text(f"{server_url}/missing")
+    assert missing.value.status == 404
+
+
+@pytest.mark.db
+def test_session_drops_closed_and_overflow_connections(server_url):
+    """Connection: close responses and a full idle pool are not kept."""
+    session = http_mod.HttpSession()
+    session.get_text(f"{server_url}/close")
+    session.get_text(f"{server_url}/close")
+    assert session.stats()["connections_reused"] == 0
+
+    no_pool = http_mod.HttpSession(max_idle_per_host=0)
+    no_pool.get_text(f"{server_url}/plain")
+    no_pool.get_text(f"{server_url}/plain")
+    assert no_pool.stats()["connections_opened"] == 2
+
+
+class _StaleConn:
+    """Pooled connection double that fails as if the server hung up."""
+
+    def __init__(self, error):
+        """Store the error raised on request()."""
+        self.error = error
+        self.closed = False
+
+    def request(self, *_args, **_kwargs):
+        """Raise the configured error."""
+        raise self.error
+
+    def close(self):
+        """Record that the connection was closed."""
+        self.closed = True
+
+
+@pytest.mark.db
+def test_session_retries_stale_pooled_connection(server_url):
+    """A stale reused socket is closed and the request retried on a fresh one."""
+    session = http_mod.HttpSession()
+    session.get_text(f"{server_url}/plain")
+    key = next(iter(getattr(session, "_pool")))
+    stale = _StaleConn(http.client.RemoteDisconnected("gone"))
+    getattr(session, "_pool")[key] = [stale]
+
+    assert session.get_text(f"{server_url}/plain") == "<p>plain</p>"
+    assert stale.closed
+    assert session.stats()["connections_opened"] == 2
+
+
+@pytest.mark.db
+def test_session_raises_fresh_connection_errors():
+    """Errors on a newly opened connection propagate after closing it."""
+    session = http_mod.HttpSession(timeout=1)
+    with pytest.raises(OSError):
+        session.get_text("http://127.0.0.1:9/unreachable")
+
+    conn, reused = getattr(session, "_acquire")(("https", "example.com", None))
+    assert isinstance(conn, http.client.HTTPSConnection)
+    assert reused is False
+
+
+@pytest.mark.db
+def test_session_closes_connection_on_unexpected_error(monkeypatch):
+    """Non-network failures close the socket and re-raise."""
+    session = http_mod.HttpSession()
+    conns = []
+
+    def _fake_acquire(_key):
+        conns.append(_StaleConn(ValueError("bad")))
+        return conns[-1], False
+
+    monkeypatch.setattr(session, "_acquire", _fake_acquire)
+    with pytest.raises(ValueError):
+        session.get_text("http://example.com/x")
+    assert conns[0].closed
+
+    conns.clear()
+
+    def _fake_acquire_stale(_key):
+        conns.append(_StaleConn(ConnectionResetError("reset")))
+        return conns[-1], False
+
+    monkeypatch.setattr(session, "_acquire", _fake_acquire_stale)
+    with pytest.raises(ConnectionResetError):
+        session.get_text("http://example.com/x")
+    assert len(conns) == 1
@@ -0,0 +1,190 @@
+"""Tests incremental clean: only new or changed records are cleaned, per a hash manifest."""
+
+import importlib
+import json
+import os
+import sys
+
+import pytest
+
+SRC_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+
+clean_mod = importlib.import_module("module_2.clean")
+manifest_mod = importlib.import_module("module_2.clean_manifest")
+
+
+def _raw(index, gpa="3.5"):
+    """Return one raw scraped record."""
+    return {
+        "program_raw": f" Program {index} ",
+        "gpa_raw": gpa,
+        "url": f"https://www.thegradcafe.com/result/{index}",
+        "applicant_status_raw": "Accepted on 1 Feb",
+    }
+
+
+@pytest.fixture(name="count_cleaned")
+def fixture_count_cleaned(monkeypatch):
+    """Count clean_entry calls made by the incremental path."""
+    calls = []
+    original = clean_mod.clean_entry
+
+    def _counting(entry, *args):
+        calls.append(entry.get("url"))
+        return original(entry, *args)
+
+    monkeypatch.setattr(clean_mod, "clean_entry", _counting)
+    return calls
+
+
+def _expected(tmp_path, rows, name, typed=False):
+    """Return the bytes a full run_clean of rows writes to a file called name."""
+    inp = tmp_path / "expected_in.json"
+    inp.write_text(json.dumps(rows))
+    out = tmp_path / name
+    clean_mod.run_clean(str(inp), str(out), stream=True, typed=typed)
+    return out.read_bytes()
+
+
+@pytest.mark.db
+@pytest.mark.parametrize("output_name", ["out.json", "out.jsonl"])
+def test_incremental_clean_appends_only_new_rows(tmp_path, count_cleaned, output_name):
+    """A rerun cleans nothing; added rows are cleaned alone and appended."""
+    inp = tmp_path / "in.json"
+    out = tmp_path / output_name
+    first = [_raw(i) for i in range(5)]
+    inp.write_text(json.dumps(first))
+    assert clean_mod.run_clean(str(inp), str(out), incremental=True) == 5
+    assert out.read_bytes() == _expected(tmp_path, first, "a_" + output_name)
+    assert os.path.exists(manifest_mod.manifest_path(str(out)))
+
+    count_cleaned.clear()
+    assert clean_mod.run_clean(str(inp), str(out), incremental=True) == 0
+    assert not count_cleaned
+
+    both = first + [_raw(i) for i in range(5, 8)]
+    inp.write_text(json.dumps(both))
+    assert clean_mod.run_clean(str(inp), str(out), incremental=True) == 3
+    assert count_cleaned == [row["url"] for row in both[5:]]
+    assert out.read_bytes() == _expected(tmp_path, both, "b_" + output_name)
+
+
+@pytest.mark.db
+@pytest.mark.parametrize("output_name", ["out.json", "out.jsonl"])
+def test_incremental_clean_replaces_changed_rows_in_place(tmp_path, output_name):
+    """A record whose raw hash changed replaces its earlier cleaned row."""
+    inp = tmp_path / "in.jsonl"
+    out = tmp_path / output_name
+    rows = [_raw(i) for i in range(4)]
+    inp.write_text("".join(json.dumps(row) + "\n" for row in rows))
+    clean_mod.run_clean(str(inp), str(out), incremental=True)
+
+    changed = [_raw(1, gpa="3.9"), _raw(9)]
+    inp.write_text("".join(json.dumps(row) + "\n" for row in changed))
+    assert clean_mod.run_clean(str(inp), str(out), incremental=True) == 2
+    expected_rows = [rows[0], changed[0], rows[2], rows[3], changed[1]]
+    assert out.read_bytes() == _expected(tmp_path, expected_rows, "e_" + output_name)
+    assert not [name for name in os.listdir(tmp_path) if name.startswith(".clean-")]
+
+
+@pytest.mark.db
+def test_incremental_clean_restarts_when_output_is_missing(tmp_path, count_cleaned):
+    """Deleting the output resets the manifest so everything is cleaned again."""
+    inp = tmp_path / "in.json"
+    out = tmp_path / "out.json"
+    inp.write_text(json.dumps([_raw(1), _raw(2)]))
+    clean_mod.run_clean(str(inp), str(out), incremental=True)
+    os.remove(out)
+    count_cleaned.clear()
+    assert clean_mod.run_clean(str(inp), str(out), incremental=True) == 2
+    assert len(count_cleaned) == 2
+    assert len(json.loads(out.read_text())) == 2
+
+
+@pytest.mark.db
+def test_incremental_clean_typed_and_mode_switches(tmp_path, count_cleaned):
+    """typed=True works incrementally; switching mode rewrites the whole output."""
+    inp = tmp_path / "in.json"
+    out = tmp_path / "out.json"
+    rows = [_raw(1), _raw(2, gpa="9")]
+    inp.write_text(json.dumps(rows))
+    assert clean_mod.run_clean(str(inp), str(out), incremental=True, typed=True) == 2
+    assert out.read_bytes() == _expected(tmp_path, rows, "typed.json", typed=True)
+    assert json.loads(out.read_text())[1]["gpa"] is None
+
+    count_cleaned.clear()
+    assert clean_mod.run_clean(str(inp), str(out), incremental=True, typed=True) == 0
+    assert clean_mod.run_clean(str(inp), str(out), incremental=True) == 2
+    assert len(count_cleaned) == 2
+    assert out.read_bytes() == _expected(tmp_path, rows, "plain.json")
+
+
+@pytest.mark.db
+def test_run_clean_typed_in_list_mode(tmp_path):
+    """The list path honours typed=True and writes what the stream path writes."""
+    inp = tmp_path / "in.json"
+    rows = [_raw(1), _raw(2, gpa="0")]
+    inp.write_text(json.dumps(rows))
+    cleaned = clean_mod.run_clean(str(inp), str(tmp_path / "out.json"), typed=True)
+    assert [row["gpa"] for row in cleaned] == [3.5, None]
+    assert cleaned[0]["acceptance_date"] is None
+    assert (tmp_path / "out.json").read_bytes() == _expected(
+        tmp_path, rows, "stream.json", typed=True
+    )
+
+
+@pytest.mark.db
+def test_incremental_clean_keys_and_duplicates(tmp_path):
+    """URL-less rows are keyed by hash; a URL repeated in one input keeps its last version."""
+    inp = tmp_path / "in.json"
+    out = tmp_path / "out.json"
+    no_url = {"program_raw": "Math"}
+    inp.write_text(json.dumps([no_url, no_url, _raw(1), _raw(1, gpa="4.0")]))
+    assert clean_mod.run_clean(str(inp), str(out), incremental=True) == 2
+    cleaned = json.loads(out.read_text())
+    assert [row["program"] for row in cleaned] == ["Math", "Program 1"]
+    assert cleaned[1]["gpa"] == "4.0"
+
+
+@pytest.mark.db
+def test_incremental_clean_appends_to_empty_array(tmp_path):
+    """An empty first run writes [] and later rows are appended to it."""
+    inp = tmp_path / "in.json"
+    out = tmp_path / "out.json"
+    inp.write_text("[]")
+    clean_mod.run_clean(str(inp), str(out), incremental=True)
+    manifest = manifest_mod.CleanManifest(manifest_mod.manifest_path(str(out)))
+    manifest.update({"placeholder": "0"})
+    manifest.close()
+    assert out.read_text() == "[]"
+    inp.write_text(json.dumps([_raw(1)]))
+    clean_mod.run_clean(str(inp), str(out), incremental=True)
+    assert out.read_bytes() == _expected(tmp_path, [_raw(1)], "expected.json")
+
+
+@pytest.mark.db
+def test_incremental_clean_rejects_foreign_output(tmp_path):
+    """Appending to an output that is not a save_data-style array raises ValueError."""
+    inp = tmp_path / "in.json"
+    out = tmp_path / "out.json"
+    inp.write_text(json.dumps([_raw(1)]))
+    clean_mod.run_clean(str(inp), str(out), incremental=True)
+    out.write_text('[{"url": "x"}]')
+    inp.write_text(json.dumps([_raw(2)]))
+    with pytest.raises(ValueError):
+        clean_mod.run_clean(str(inp), str(out), incremental=True)
+
+
+@pytest.mark.db
+def test_manifest_lookup_spans_batches(monkeypatch, tmp_path):
+    """Lookups larger than one SQL batch return every stored key."""
+    monkeypatch.setattr(manifest_mod, "LOOKUP_BATCH", 3)
+    manifest = manifest_mod.CleanManifest(str(tmp_path / "m.sqlite3"))
+    manifest.update({f"k{i}": f"d{i}" for i in range(10)})
+    manifest.update({"k0": "new"})
+    found = manifest.lookup([f"k{i}" for i in range(12)])
+    assert len(found) == 10 and found["k0"] == "new"
+    assert len(manifest) == 10
+    manifest.close()
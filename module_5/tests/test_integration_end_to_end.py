@@ -47,7 +47,7 @@ def test_end_to_end_flow(app_fixture, fake_rows_file, monkeypatch):
             json.dump(rows, file_out)
 
     monkeypatch.setattr(app_fixture, "run_scrape", _fake_run_scrape)
-    monkeypatch.setattr(app_fixture, "run_clean", _fake_run_clean)
+    monkeypatch.setattr(app_fixture, "run_typed_clean", _fake_run_clean)
     monkeypatch.setattr(app_fixture, "run_llm_and_write_out_json", _fake_run_llm_and_write)
 
     module2_out = os.path.join(SRC_PATH, "module_2_out.json")
@@ -84,7 +84,7 @@ def test_multiple_pulls_are_idempotent(app_fixture, fake_rows_file, monkeypatch)
             json.dump(rows, file_out)
 
     monkeypatch.setattr(app_fixture, "run_scrape", _fake_run_scrape)
-    monkeypatch.setattr(app_fixture, "run_clean", _fake_run_clean)
+    monkeypatch.setattr(app_fixture, "run_typed_clean", _fake_run_clean)
     monkeypatch.setattr(app_fixture, "run_llm_and_write_out_json", _fake_run_llm_and_write)
 
     module2_out = os.path.join(SRC_PATH, "module_2_out.json")
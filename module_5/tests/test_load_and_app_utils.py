@@ -15,6 +15,7 @@ if SRC_PATH not in sys.path:
 load_data = importlib.import_module("load_data")
 app_mod = importlib.import_module("app")
 db_config = importlib.import_module("db_config")
+record_mod = importlib.import_module("module_2.record")
 
 
 def _app_attr(name):
@@ -75,6 +76,7 @@ def test_parse_date_and_float():
     assert load_data.parse_float("") is None
     assert load_data.parse_float(None) is None
     assert load_data.parse_float("3.5") == 3.5
+    assert load_data.parse_float(3.5) == 3.5
 
 
 @pytest.mark.db
@@ -98,6 +100,26 @@ def test_fetch_existing_urls(monkeypatch):
     assert urls == {"u1", "u2"}
 
 
+@pytest.mark.db
+def test_fetch_existing_urls_compact(monkeypatch):
+    """fetch_existing_urls(compact=True) returns a result-id index."""
+    cur = _Cursor(fetchall_value=[("https://www.thegradcafe.com/result/7",), (None,)])
+    monkeypatch.setattr(app_mod, "get_db_connection", lambda: _Conn(cur))
+    urls = _app_attr("fetch_existing_urls")(compact=True)
+    assert "https://www.thegradcafe.com/result/7" in urls
+    assert len(urls) == 1
+
+
+@pytest.mark.db
+@pytest.mark.parametrize("stored, expected", [((987654,), 987654), ((None,), None)])
+def test_fetch_max_result_id(monkeypatch, stored, expected):
+    """fetch_max_result_id returns the highest stored result id, or None when empty."""
+    cur = _Cursor(fetchone_value=stored)
+    monkeypatch.setattr(app_mod, "get_db_connection", lambda: _Conn(cur))
+    assert _app_attr("fetch_max_result_id")() == expected
+    assert "MAX(" in cur.queries[0]
+
+
 @pytest.mark.db
 def test_get_db_connection_uses_database_url(monkeypatch):
     """get_db_connection uses DATABASE_URL env var when available."""
@@ -598,7 +620,7 @@ def test_run_load_admin_branch_and_connection_none(monkeypatch, tmp_path):
     monkeypatch.setattr(load_data, "create_database", _fake_create_database)
     monkeypatch.setattr(load_data, "create_connection_from_env", lambda: _AppConn())
     monkeypatch.setattr(load_data, "execute_query", lambda *_args, **_kwargs: None)
-    monkeypatch.setattr(load_data.json, "load", lambda _f: [])
+    monkeypatch.setattr(load_data, "load_records", lambda _f: [])
     load_data.run_load(input_file=str(input_path))
     assert called["create_db"] is True
     assert admin_conn.closed is True
@@ -649,7 +671,7 @@ def test_run_load_main(monkeypatch, tmp_path):
         return [{"url": "u1"}]
 
     monkeypatch.setattr(load_data.psycopg, "connect", _fake_connect)
-    monkeypatch.setattr(load_data.json, "load", _fake_json_load)
+    monkeypatch.setattr(record_mod, "load_records", _fake_json_load)
     monkeypatch.chdir(tmp_path)
     (tmp_path / "module_2_out.json").write_text("[]")
 
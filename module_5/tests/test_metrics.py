@@ -0,0 +1,140 @@
+"""Tests scraper metrics: histograms, per-run counters, run_scrape output, and the API route."""
+
+import importlib
+import json
+import os
+import shutil
+import sys
+
+import pytest
+
+SRC_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "gradcafe")
+
+metrics_mod = importlib.import_module("module_2.metrics")
+replay_mod = importlib.import_module("module_2.replay")
+scrape_mod = importlib.import_module("module_2.scrape")
+rate_mod = importlib.import_module("module_2.rate_limit")
+cache_mod = importlib.import_module("module_2.http_cache")
+queue_mod = importlib.import_module("module_2.enrich_queue")
+app_mod = importlib.import_module("app")
+server_options = importlib.import_module("data_builders").server_options
+
+
+@pytest.mark.db
+def test_histogram_buckets_and_quantiles():
+    """Durations land in bucket counts; quantiles report bucket bounds or the max."""
+    hist = metrics_mod.Histogram(bounds=(10, 100))
+    assert hist.quantile(0.5) is None
+    assert hist.summary()["mean_ms"] == 0.0
+    for millis in (1, 5, 50, 400):
+        hist.observe(millis)
+    summary = hist.summary()
+    assert summary["buckets"] == {"le_10": 2, "le_100": 1, "inf": 1}
+    assert summary["p50_ms"] == 10.0
+    assert summary["p95_ms"] == 400
+    assert summary["max_ms"] == 400
+    assert summary["mean_ms"] == 114.0
+
+
+@pytest.mark.db
+def test_scrape_metrics_count_fetches_parses_and_cache_hits(tmp_path):
+    """A replayed scrape records latency, bytes, detail hits, and cache hits on a rerun."""
+    site = replay_mod.SyntheticSite(pages=2, rows_per_page=3)
+    with replay_mod.ReplayServer(site) as server:
+        cache = cache_mod.ResponseCache(scrape_mod.HTTP_SESSION, root=str(tmp_path / "cache"))
+        first = metrics_mod.ScrapeMetrics()
+        scrape_mod.scrape_data(options=server_options(server, http_cache=cache, metrics=first))
+        second = metrics_mod.ScrapeMetrics()
+        scrape_mod.scrape_data(options=server_options(server, http_cache=cache, metrics=second))
+        cache.close()
+
+    summary = first.summary()
+    assert summary["rows"] == 6
+    assert summary["pages"] == 2
+    assert summary["detail_hits"] == 6
+    assert summary["detail_misses"] == summary["fetch_failures"] == 0
+    assert summary["bytes_downloaded"] > 0
+    assert summary["fetch_latency"]["listing"]["count"] == 3
+    assert summary["fetch_latency"]["detail"]["count"] == 6
+    assert summary["parse_time"]["listing"]["count"] == 2
+    assert summary["parse_time"]["detail"]["count"] == 6
+    assert summary["rows_per_second"] > 0
+    assert summary["running"] is False
+    assert summary["bound"] in ("network", "parse")
+    assert summary["retry"]["retries"] == 0
+    assert summary["http"]["misses"] == 9
+    assert second.summary()["http"]["hits"] == 9
+    json.dumps(summary)
+
+
+@pytest.mark.db
+def test_failed_details_and_deferred_rows_are_counted(tmp_path):
+    """Missing detail pages count as failures and misses; deferred rows are counted."""
+    corpus_dir = tmp_path / "corpus"
+    shutil.copytree(FIXTURE_DIR, corpus_dir)
+    os.remove(corpus_dir / "detail_987654.html")
+    with replay_mod.ReplayServer(replay_mod.RecordedCorpus(str(corpus_dir))) as server:
+        metrics = metrics_mod.ScrapeMetrics()
+        rows = scrape_mod.scrape_data(options=server_options(server, metrics=metrics))
+        queue = queue_mod.EnrichmentQueue(str(tmp_path / "q.sqlite3"))
+        deferred = metrics_mod.ScrapeMetrics()
+        scrape_mod.scrape_data(
+            options=server_options(server, enrichment_queue=queue, metrics=deferred)
+        )
+        queue.close()
+
+    summary = metrics.summary()
+    assert summary["detail_hits"] == 1
+    linked = sum(1 for row in rows if row.get("url"))
+    assert summary["fetch_failures"] == summary["detail_misses"] == linked - 1
+    assert deferred.summary()["detail_deferred"] == linked
+    assert deferred.summary()["fetch_latency"]["detail"]["count"] == 0
+
+
+@pytest.mark.db
+def test_metrics_clock_spans_passes_and_reports_while_running():
+    """start() after finish() keeps the first start time; summaries work mid-run."""
+    metrics = metrics_mod.ScrapeMetrics()
+    assert metrics.elapsed() == 0.0
+    assert metrics.summary()["rows_per_second"] == 0.0
+    metrics.start()
+    metrics.observe_parse("detail", 0.5)
+    assert metrics.summary()["running"] is True
+    assert metrics.summary()["bound"] == "parse"
+    metrics.finish()
+    first_elapsed = metrics.elapsed()
+    metrics.start({"retry": rate_mod.RetryPolicy(), "pipeline": None})
+    assert metrics.elapsed() >= first_elapsed
+    assert "retry" in metrics.summary() and "pipeline" not in metrics.summary()
+
+
+@pytest.mark.db
+def test_run_scrape_prints_metrics_summary(tmp_path, capsys):
+    """run_scrape prints the run's metrics as a JSON document after the entry count."""
+    site = replay_mod.SyntheticSite(pages=1, rows_per_page=2)
+    with replay_mod.ReplayServer(site) as server:
+        count = scrape_mod.run_scrape(
+            filename=str(tmp_path / "rows.jsonl"), options=server_options(server), stream=True
+        )
+    printed = capsys.readouterr().out
+    summary = json.loads(printed.split("Scrape metrics:", 1)[1])
+    assert count == summary["rows"] == 2
+    assert summary["detail_hits"] == 2
+
+
+@pytest.mark.db
+def test_scrape_metrics_route(monkeypatch):
+    """The API returns null before any pull and the latest summary afterwards."""
+    client = app_mod.app.test_client()
+    monkeypatch.setitem(app_mod.APP_STATE, "scrape_metrics", None)
+    assert client.get("/api/scrape-metrics").get_json() == {"ok": True, "metrics": None}
+
+    metrics = metrics_mod.ScrapeMetrics()
+    metrics.count("rows", 4)
+    monkeypatch.setitem(app_mod.APP_STATE, "scrape_metrics", metrics)
+    body = client.get("/api/scrape-metrics").get_json()
+    assert body["ok"] is True
+    assert body["metrics"]["rows"] == 4
@@ -0,0 +1,118 @@
+"""Tests the process-pool clean that splits JSONL input into byte-range chunks."""
+
+import importlib
+import json
+import os
+import sys
+
+import pytest
+
+SRC_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+
+clean_mod = importlib.import_module("module_2.clean")
+parallel_mod = importlib.import_module("module_2.parallel_clean")
+
+
+def _write_jsonl(path, count):
+    """Write count raw rows (with multi-byte text and blank lines) as JSONL."""
+    lines = []
+    for index in range(count):
+        row = {
+            "program_raw": f" Informática {index} ",
+            "university_raw": "Université de Montréal" if index % 2 else "東京大学",
+            "gpa_raw": "0" if index % 4 == 0 else "3.5",
+            "url": f"https://www.thegradcafe.com/result/{index}",
+            "applicant_status_raw": "Accepted on 1 Feb" if index % 3 else "Rejected on 2 Feb",
+        }
+        lines.append(json.dumps(row, ensure_ascii=False))
+        if index % 5 == 0:
+            lines.append("")
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+@pytest.mark.db
+def test_split_byte_ranges_cover_the_file():
+    """Ranges are contiguous, bounded by chunk size, and cover every byte."""
+    assert parallel_mod.split_byte_ranges(10, 4) == [(0, 4), (4, 8), (8, 10)]
+    assert not parallel_mod.split_byte_ranges(0, 4)
+    with pytest.raises(ValueError):
+        parallel_mod.split_byte_ranges(10, 0)
+
+
+@pytest.mark.db
+@pytest.mark.parametrize("jsonl", [True, False])
+@pytest.mark.parametrize("chunk_bytes", [1, 37, 200, 1 << 20])
+def test_chunks_see_each_line_exactly_once(tmp_path, chunk_bytes, jsonl):
+    """Lines are owned by the range they start in, whatever the chunk boundaries."""
+    inp = tmp_path / "in.jsonl"
+    _write_jsonl(inp, 23)
+    total = 0
+    for index, (start, end) in enumerate(
+        parallel_mod.split_byte_ranges(os.path.getsize(inp), chunk_bytes)
+    ):
+        total += parallel_mod.clean_chunk(str(inp), start, end, str(tmp_path / f"p{index}"), jsonl)
+    assert total == 23
+
+
+@pytest.mark.db
+def test_chunk_past_end_of_file_stops_at_eof(tmp_path):
+    """A range reaching past the end of a (shrunk) file stops at end of file."""
+    inp = tmp_path / "in.jsonl"
+    _write_jsonl(inp, 3)
+    part = tmp_path / "part"
+    assert parallel_mod.clean_chunk(str(inp), 0, 10**9, str(part), True) == 3
+
+
+@pytest.mark.db
+@pytest.mark.parametrize("output_name", ["out.json", "out.jsonl"])
+def test_parallel_clean_matches_streaming_clean(tmp_path, output_name):
+    """Parallel output is byte-identical to run_clean(stream=True), in input order."""
+    inp = tmp_path / "in.jsonl"
+    _write_jsonl(inp, 200)
+    expected = tmp_path / f"expected_{output_name}"
+    actual = tmp_path / output_name
+    count = clean_mod.run_clean(str(inp), str(expected), stream=True)
+    assert parallel_mod.run_parallel_clean(
+        str(inp), str(actual), workers=2, chunk_bytes=1000
+    ) == count == 200
+    assert actual.read_bytes() == expected.read_bytes()
+    assert sorted(os.listdir(tmp_path)) == sorted(["in.jsonl", output_name, expected.name])
+
+
+@pytest.mark.db
+def test_parallel_clean_skips_chunks_without_rows(tmp_path):
+    """Chunks smaller than a line produce empty parts that are skipped in the output."""
+    inp = tmp_path / "in.jsonl"
+    _write_jsonl(inp, 6)
+    expected = tmp_path / "expected.json"
+    clean_mod.run_clean(str(inp), str(expected), stream=True)
+    out = tmp_path / "out.json"
+    assert parallel_mod.run_parallel_clean(str(inp), str(out), workers=2, chunk_bytes=50) == 6
+    assert out.read_bytes() == expected.read_bytes()
+
+
+@pytest.mark.db
+def test_parallel_clean_empty_input_writes_empty_array(tmp_path):
+    """An empty input yields an empty JSON array, like the streaming path."""
+    inp = tmp_path / "in.jsonl"
+    inp.write_text("")
+    out = tmp_path / "out.json"
+    assert parallel_mod.run_parallel_clean(str(inp), str(out), workers=1) == 0
+    assert out.read_text() == "[]"
+
+
+@pytest.mark.db
+def test_parallel_clean_cleans_json_arrays_in_process(monkeypatch, tmp_path):
+    """JSON-array input (even after long leading whitespace) uses the streaming path."""
+    inp = tmp_path / "in.json"
+    inp.write_text(" " * 5000 + json.dumps([{"gpa_raw": " 3.9 ", "url": "u"}]))
+
+    def _no_pool(*_args, **_kwargs):
+        raise AssertionError("JSON arrays must not be split across processes")
+
+    monkeypatch.setattr(parallel_mod, "ProcessPoolExecutor", _no_pool)
+    out = tmp_path / "out.json"
+    assert parallel_mod.run_parallel_clean(str(inp), str(out)) == 1
+    assert json.loads(out.read_text())[0]["gpa"] == "3.9"
@@ -0,0 +1,189 @@
+"""Tests that the lxml and html.parser backends produce identical records."""
+
+import importlib
+import os
+import sys
+
+import pytest
+
+SRC_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "gradcafe")
+
+parsers_mod = importlib.import_module("module_2.parsers")
+scrape_mod = importlib.import_module("module_2.scrape")
+
+
+def _fixture(name):
+    """Return fixture HTML text by file name."""
+    with open(os.path.join(FIXTURE_DIR, name), "r", encoding="utf-8") as file_in:
+        return file_in.read()
+
+
+def _fixture_site(url):
+    """Serve listing pages 1-2 and result pages from the fixture corpus."""
+    if "page=" in url:
+        page = url.rsplit("=", 1)[-1]
+        name = f"listing_page_{page}.html"
+    else:
+        name = f"detail_{url.rsplit('/', 1)[-1]}.html"
+    if not os.path.exists(os.path.join(FIXTURE_DIR, name)):
+        return "<html><body><p>no results</p></body></html>"
+    return _fixture(name)
+
+
+@pytest.mark.db
+@pytest.mark.parametrize("partial", [False, True])
+def test_backends_scrape_identical_records(monkeypatch, partial):
+    """A full scrape over the fixture corpus is identical for both backends."""
+    monkeypatch.setattr(scrape_mod, "_fetch_html", _fixture_site)
+    soup_entries = scrape_mod.scrape_data(
+        options={"parser": "html.parser", "partial_parse": partial}
+    )
+    lxml_entries = scrape_mod.scrape_data(options={"parser": "lxml", "partial_parse": partial})
+
+    assert soup_entries == lxml_entries
+    assert [entry["university_raw"] for entry in soup_entries] == [
+        "Johns Hopkins University",
+        "Texas A&M University",
+        "Stanford University",
+        "Carnegie Mellon University",
+        "Georgetown University",
+        "Harvard University",
+    ]
+    first = soup_entries[0]
+    assert first["semester_year_start_raw"] == "Fall 2026"
+    assert first["program_raw"] == "Computer   Science"
+    assert first["gre_score_raw"] == "328"
+    assert first["comments_raw"] == "Funding offered & very happy!"
+    assert soup_entries[3]["url"] is None
+    assert soup_entries[4]["semester_year_start_raw"] == "Winter 2026"
+
+
+@pytest.mark.db
+@pytest.mark.parametrize(
+    "name",
+    ["detail_987654.html", "detail_987653.html", "detail_no_dl.html"],
+)
+def test_backends_parse_detail_identically(name):
+    """Each detail fixture yields the same fields from both backends."""
+    html = _fixture(name)
+    soup_backend = parsers_mod.get_parser_backend("html.parser")
+    lxml_backend = parsers_mod.get_parser_backend("lxml")
+    expected = soup_backend.parse_detail(html)
+    assert expected == lxml_backend.parse_detail(html)
+    for backend in ("html.parser", "lxml"):
+        assert parsers_mod.get_parser_backend(backend, partial=True).parse_detail(html) == expected
+
+
+@pytest.mark.db
+@pytest.mark.parametrize(
+    "html",
+    ["", "   ", "<p>no main</p>", "<main><p>x</p></main>", "<!-- down for maintenance -->"],
+)
+def test_backends_handle_missing_sections(html):
+    """Empty documents and missing table/main/dl sections return empty results."""
+    for name in ("html.parser", "lxml"):
+        for partial in (False, True):
+            backend = parsers_mod.get_parser_backend(name, partial)
+            assert backend.listing_rows(html) == []
+            assert backend.parse_detail(html) == {}
+
+
+ODD_PAGES = [
+    # lxml refuses str input that carries an encoding declaration.
+    "<?xml version='1.0' encoding='utf-8'?>\n<html><body><main><dl>"
+    "<div><dt>Program</dt><dd>Prolog</dd></div></dl></main>"
+    "<table><tr><th>h</th></tr><tr><td>MIT</td><td>CS</td><td>1 Feb</td>"
+    "<td>Accepted</td></tr></table></body></html>",
+    # Script and style text inside cells is left out of the cell text.
+    "<main><dl><div><dt>Program</dt><dd>Physics<script>track('dd');</script> PhD"
+    "<style>dd{}</style></dd></div></dl></main>"
+    "<table><tr><th>h</th></tr><tr><td>Yale<script>x = 1;</script></td><td>CS</td>"
+    "<td>1 Feb</td><td>Rejected</td></tr></table>",
+]
+
+
+@pytest.mark.db
+@pytest.mark.parametrize("html", ODD_PAGES)
+def test_backends_agree_on_odd_pages(html):
+    """Prolog-declared pages and script text in cells parse the same on both backends."""
+    soup_backend = parsers_mod.get_parser_backend("html.parser")
+    expected_detail = soup_backend.parse_detail(html)
+    expected_rows = [soup_backend.row_text(row) for row in soup_backend.listing_rows(html)]
+    assert expected_detail["program_raw"] in ("Prolog", "Physics PhD")
+    assert len(expected_rows) == 1 and "x = 1" not in expected_rows[0]
+    for partial in (False, True):
+        backend = parsers_mod.get_parser_backend("lxml", partial)
+        assert backend.parse_detail(html) == expected_detail
+        assert [backend.row_text(row) for row in backend.listing_rows(html)] == expected_rows
+
+
+TRICKY_DETAIL_PAGES = [
+    # dl mentioned inside a comment and a script before the real one.
+    "<main><!-- <dl><div><dt>Program</dt><dd>Fake</dd></div></dl> -->"
+    "<script>var s = '<dl>';</script>"
+    "<dl><div><dt>Program</dt><dd>Real</dd></div></dl></main>",
+    # dl outside <main> must be ignored.
+    "<main><p>x</p></main><dl><div><dt>Program</dt><dd>Outside</dd></div></dl>",
+    # Nested dl and a missing close tag defeat the slice.
+    "<main><dl><div><dt>Program</dt><dd><dl></dl>Nested</dd></div></dl></main>",
+    "<main><dl><div><dt>Program</dt><dd>Unclosed</dd></div></main>",
+    "<!-- <main> --><main><dl><div><dt>Program</dt><dd>Late</dd></div></dl></main>",
+]
+
+
+@pytest.mark.db
+@pytest.mark.parametrize("html", TRICKY_DETAIL_PAGES)
+def test_partial_parse_matches_full_parse(html):
+    """Fragment parsing returns what a full parse returns, falling back when unsure."""
+    for name in ("html.parser", "lxml"):
+        full = parsers_mod.get_parser_backend(name).parse_detail(html)
+        assert parsers_mod.get_parser_backend(name, partial=True).parse_detail(html) == full
+
+
+@pytest.mark.db
+def test_slice_element_and_fallback():
+    """slice_element cuts exactly the element or returns None; empty fragments fall back."""
+    html = "<p>a</p><TABLE class=x><tr><td>1</td></tr></TABLE><table></table>"
+    assert parsers_mod.slice_element(html, "table") == (
+        "<TABLE class=x><tr><td>1</td></tr></TABLE>"
+    )
+    assert parsers_mod.slice_element("<p>no table</p>", "table") is None
+    assert parsers_mod.slice_element("<main><dl></dl>", "dl", "main") == "<dl></dl>"
+
+    calls = []
+
+    def _first(text, tag, parent=None):
+        calls.append((text, tag, parent))
+        return "full" if parent else None
+
+    assert parsers_mod.find_element(_first, "<main><dl></dl></main>", "dl", "main", True) == "full"
+    assert calls == [("<dl></dl>", "dl", None), ("<main><dl></dl></main>", "dl", "main")]
+
+
+@pytest.mark.db
+def test_get_parser_backend_selection(monkeypatch):
+    """auto prefers lxml, falls back without it, and rejects unknown names."""
+    assert parsers_mod.get_parser_backend().name == "lxml"
+    assert parsers_mod.get_parser_backend("html.parser").name == "html.parser"
+    with pytest.raises(ValueError):
+        parsers_mod.get_parser_backend("html5lib")
+
+    def _missing(_name):
+        raise ImportError("no lxml")
+
+    monkeypatch.setattr(parsers_mod.importlib, "import_module", _missing)
+    assert parsers_mod.get_parser_backend("auto").name == "html.parser"
+    with pytest.raises(ValueError):
+        parsers_mod.get_parser_backend("lxml")
+
+
+@pytest.mark.db
+def test_extract_detail_from_dl_wrapper():
+    """scrape._extract_detail_from_dl parses a BeautifulSoup <dl>."""
+    soup = parsers_mod.BeautifulSoup(_fixture("detail_987653.html"), "html.parser")
+    detail = getattr(scrape_mod, "_extract_detail_from_dl")(soup.find("dl"))
+    assert detail["degree_type_raw"] == "PhD"
+    assert detail["gre_score_raw"] == "0"
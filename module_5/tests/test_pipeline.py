@@ -0,0 +1,106 @@
+"""Tests the two-stage fetch/parse pipeline: ordering, backpressure, and metrics."""
+
+import importlib
+import os
+import sys
+import threading
+from concurrent import futures
+
+import pytest
+
+SRC_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "gradcafe")
+
+pipeline_mod = importlib.import_module("module_2.pipeline")
+scrape_mod = importlib.import_module("module_2.scrape")
+
+
+def _detail_html(value):
+    """Return a minimal detail page whose GPA field is value."""
+    return f"<main><dl><div><dt>Undergrad GPA</dt><dd>{value}</dd></div></dl></main>"
+
+
+def _fixture_site(url):
+    """Serve listing pages 1-2 and result pages from the fixture corpus."""
+    if "page=" in url:
+        name = f"listing_page_{url.rsplit('=', 1)[-1]}.html"
+    else:
+        name = f"detail_{url.rsplit('/', 1)[-1]}.html"
+    path = os.path.join(FIXTURE_DIR, name)
+    if not os.path.exists(path):
+        return "<p>none</p>"
+    with open(path, "r", encoding="utf-8") as file_in:
+        return file_in.read()
+
+
+@pytest.fixture(name="threaded_pipeline")
+def fixture_threaded_pipeline(monkeypatch):
+    """Run parser workers as threads so coverage sees them."""
+    monkeypatch.setattr(pipeline_mod, "ProcessPoolExecutor", futures.ThreadPoolExecutor)
+
+
+@pytest.mark.db
+@pytest.mark.usefixtures("threaded_pipeline")
+def test_map_keeps_order_and_reports_metrics():
+    """Results come back in input order; failed fetches yield {} and are counted."""
+    def _fetch(url):
+        if url == "bad":
+            raise OSError("down")
+        return _detail_html(url)
+
+    with pipeline_mod.ParsePipeline(io_workers=4, parse_workers=2, queue_size=2) as pipeline:
+        results = list(pipeline.map(_fetch, ["1", "bad", "3", "4"], ("html.parser", True)))
+        stats = pipeline.stats()
+
+    assert results == [{"gpa_raw": "1"}, {}, {"gpa_raw": "3"}, {"gpa_raw": "4"}]
+    assert stats["fetched"] == 3
+    assert stats["fetch_failed"] == 1
+    assert stats["parsed"] == 3
+    assert 0 <= stats["max_queue_depth"] <= 2
+    assert stats["mean_queue_depth"] <= stats["max_queue_depth"]
+    assert (stats["io_workers"], stats["parse_workers"], stats["queue_size"]) == (4, 2, 2)
+
+
+@pytest.mark.db
+@pytest.mark.usefixtures("threaded_pipeline")
+def test_map_abandoned_early_does_not_block():
+    """Closing the generator early drains blocked downloads so close() returns."""
+    started = threading.Event()
+
+    def _fetch(url):
+        started.set()
+        return _detail_html(url)
+
+    pipeline = pipeline_mod.ParsePipeline(io_workers=3, parse_workers=1, queue_size=1)
+    results = pipeline.map(_fetch, [str(n) for n in range(6)], ("lxml", False))
+    assert next(results) == {"gpa_raw": "0"}
+    results.close()
+    pipeline.close()
+    assert started.is_set()
+    assert pipeline.stats()["mean_queue_depth"] >= 0
+
+
+@pytest.mark.db
+def test_pipeline_validates_sizes(monkeypatch):
+    """Sizes below 1 are rejected and parse_workers defaults to the CPU count."""
+    with pytest.raises(ValueError):
+        pipeline_mod.ParsePipeline(io_workers=0)
+    monkeypatch.setattr(pipeline_mod.os, "cpu_count", lambda: 3)
+    with pipeline_mod.ParsePipeline() as pipeline:
+        assert pipeline.stats()["parse_workers"] == 3
+        assert pipeline.stats()["mean_queue_depth"] == 0.0
+
+
+@pytest.mark.db
+def test_scrape_with_process_pipeline_matches_threaded(monkeypatch):
+    """A scrape parsed in worker processes returns the same rows as the default path."""
+    monkeypatch.setattr(scrape_mod, "_fetch_html", _fixture_site)
+    expected = scrape_mod.scrape_data(options={"parser": "html.parser"})
+    with pipeline_mod.ParsePipeline(io_workers=2, parse_workers=2) as pipeline:
+        rows = scrape_mod.scrape_data(
+            options={"parser": "html.parser", "parse_pipeline": pipeline}
+        )
+        assert pipeline.stats()["parsed"] == 5
+    assert rows == expected
@@ -0,0 +1,156 @@
+"""Tests the adaptive token-bucket limiter, retry policy, and fetch_with_retry."""
+
+import importlib
+import os
+import sys
+import threading
+import types
+
+import pytest
+
+SRC_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+
+rate_mod = importlib.import_module("module_2.rate_limit")
+http_mod = importlib.import_module("module_2.http_client")
+
+
+@pytest.fixture(name="fake_clock")
+def fixture_fake_clock(monkeypatch):
+    """Replace rate_limit.time with a manual clock whose sleep advances it."""
+    clock = {"now": 100.0, "slept": []}
+
+    def _sleep(seconds):
+        clock["slept"].append(seconds)
+        clock["now"] += seconds
+
+    monkeypatch.setattr(
+        rate_mod,
+        "time",
+        types.SimpleNamespace(monotonic=lambda: clock["now"], sleep=_sleep),
+    )
+    return clock
+
+
+@pytest.mark.db
+def test_token_bucket_paces_after_burst(fake_clock):
+    """A burst passes immediately; further tokens wait for the refill rate."""
+    limiter = rate_mod.AdaptiveRateLimiter(rate=2.0, burst=2)
+    for _ in range(3):
+        limiter.acquire()
+    assert fake_clock["slept"] == [pytest.approx(0.5)]
+    stats = limiter.stats()
+    assert stats["acquired"] == 3
+    assert stats["waited_seconds"] == pytest.approx(0.5)
+
+
+@pytest.mark.db
+def test_aimd_rate_adaptation(fake_clock):
+    """Throttles halve the rate down to the floor; successes add back slowly."""
+    limiter = rate_mod.AdaptiveRateLimiter(rate=4.0, burst=1, bounds=(1.0, 4.5))
+    limiter.on_throttle()
+    assert limiter.rate == 2.0
+    limiter.on_throttle()
+    limiter.on_throttle()
+    assert limiter.rate == 1.0
+    for _ in range(20):
+        limiter.on_success()
+    assert limiter.rate == 4.5
+    assert limiter.stats()["throttled"] == 3
+    assert not fake_clock["slept"]
+
+
+@pytest.mark.db
+def test_retry_policy_budget_and_delay(monkeypatch):
+    """Budget is shared and finite; delays are jittered and honor Retry-After."""
+    policy = rate_mod.RetryPolicy(base_delay=1.0, max_delay=8.0, budget=2)
+    monkeypatch.setattr(rate_mod.random, "uniform", lambda _low, high: high)
+    assert policy.delay(0) == 1.0
+    assert policy.delay(5) == 8.0
+    assert policy.delay(0, retry_after=3.0) == 3.0
+    assert policy.delay(0, retry_after=60.0) == 8.0
+
+    assert policy.consume() and policy.consume()
+    assert not policy.consume()
+    assert policy.stats() == {"retries": 2, "budget_exhausted": 1, "budget_remaining": 0}
+
+
+@pytest.mark.db
+def test_refilling_retry_policy_earns_budget_back(fake_clock):
+    """Spent retries come back evenly over the window, never above the budget."""
+    policy = rate_mod.RefillingRetryPolicy(budget=2, window=10.0)
+    assert policy.consume() and policy.consume()
+    assert not policy.consume()
+    fake_clock["now"] += 7.0
+    assert policy.consume()
+    assert not policy.consume()
+    fake_clock["now"] += 3.0
+    assert policy.consume()
+    fake_clock["now"] += 1000.0
+    assert policy.consume() and policy.consume()
+    assert not policy.consume()
+    assert policy.stats() == {"retries": 6, "budget_exhausted": 3, "budget_remaining": 0}
+
+
+def _scripted_fetch(outcomes):
+    """Return a fetch callable raising or returning each scripted outcome in turn."""
+    calls = []
+
+    def _fetch(url):
+        calls.append(url)
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    return _fetch, calls
+
+
+@pytest.mark.db
+def test_fetch_with_retry_recovers_from_throttling(fake_clock):
+    """429 with Retry-After slows the limiter, waits, then succeeds."""
+    limiter = rate_mod.AdaptiveRateLimiter(rate=8.0, burst=8)
+    policy = rate_mod.RetryPolicy(max_attempts=4)
+    throttled = http_mod.HttpError("u", 429, {"retry-after": "2"})
+    fetch, calls = _scripted_fetch([throttled, ConnectionResetError("reset"), "<html>"])
+
+    assert rate_mod.fetch_with_retry(fetch, "u", limiter, policy) == "<html>"
+    assert len(calls) == 3
+    assert fake_clock["slept"][0] >= 2.0
+    assert limiter.rate == 4.0 + rate_mod.AdaptiveRateLimiter.increase
+    assert policy.stats()["retries"] == 2
+
+
+@pytest.mark.db
+def test_fetch_with_retry_gives_up(fake_clock):
+    """Non-retryable errors, attempt limits, and an empty budget all re-raise."""
+    limiter = rate_mod.AdaptiveRateLimiter()
+
+    fetch, calls = _scripted_fetch([http_mod.HttpError("u", 404)])
+    with pytest.raises(http_mod.HttpError):
+        rate_mod.fetch_with_retry(fetch, "u", limiter, rate_mod.RetryPolicy())
+    assert len(calls) == 1
+
+    fetch, calls = _scripted_fetch([http_mod.HttpError("u", 502)] * 3)
+    with pytest.raises(http_mod.HttpError):
+        rate_mod.fetch_with_retry(fetch, "u", limiter, rate_mod.RetryPolicy(max_attempts=3))
+    assert len(calls) == 3
+
+    fetch, calls = _scripted_fetch([TimeoutError("slow")] * 2)
+    with pytest.raises(TimeoutError):
+        rate_mod.fetch_with_retry(fetch, "u", limiter, rate_mod.RetryPolicy(budget=1))
+    assert len(calls) == 2
+    assert len(fake_clock["slept"]) == 3
+
+
+@pytest.mark.db
+def test_limiter_shared_across_threads():
+    """Concurrent workers never take more tokens than the bucket allows."""
+    limiter = rate_mod.AdaptiveRateLimiter(rate=1000.0, burst=5)
+    threads = [threading.Thread(target=limiter.acquire) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert limiter.stats()["acquired"] == 20
@@ -0,0 +1,105 @@
+"""Tests for the compact slot-based row record and its JSON helpers."""
+
+import importlib
+import io
+import json
+import os
+import sys
+import tracemalloc
+
+import pytest
+
+SRC_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+
+record_mod = importlib.import_module("module_2.record")
+clean_mod = importlib.import_module("module_2.clean")
+
+
+def _row(index):
+    """Return one merged row with the cleaned and LLM fields."""
+    return {
+        **dict.fromkeys(clean_mod.OUTPUT_KEYS),
+        "program": "Computer Science",
+        "university": "Johns Hopkins University",
+        "semester_year_start": "Fall 2026",
+        "gpa": 3.8,
+        "url": f"https://www.thegradcafe.com/result/{index}",
+        "llm-generated-program": "Computer Science",
+        "llm-generated-university": "Johns Hopkins University",
+    }
+
+
+@pytest.mark.db
+def test_record_round_trips_rows_byte_for_byte():
+    """Known, missing, extra, and nested keys come back in their original order."""
+    rows = [
+        _row(1),
+        {"url": "u2", "note": {"a": [1, None]}, "program": None},
+        {"extra_only": True},
+        {},
+    ]
+    text = json.dumps(rows, indent=2, ensure_ascii=False)
+    records = record_mod.load_records(io.StringIO(text))
+    assert all(isinstance(record, record_mod.CompactRecord) for record in records)
+    dumped = json.dumps(records, indent=2, ensure_ascii=False, default=record_mod.record_to_dict)
+    assert dumped == text
+    assert records[1].get("university", "missing") == "missing"
+    assert records[1].get("program", "missing") is None
+    assert records[2].get("extra_only") is True
+    assert records[2].get("other") is None
+    assert records[0].get("llm-generated-university") == "Johns Hopkins University"
+
+
+@pytest.mark.db
+def test_record_interns_categorical_values():
+    """Equal categorical strings decoded separately share one object."""
+    first, second = record_mod.load_records(io.StringIO(json.dumps([_row(1), _row(2)])))
+    assert first.get("university") is second.get("university")
+    assert first.get("semester_year_start") is second.get("semester_year_start")
+    assert set(clean_mod.OUTPUT_KEYS) <= set(record_mod.RECORD_KEYS)
+
+
+@pytest.mark.db
+def test_record_key_orders_are_shared_up_to_a_cap(monkeypatch):
+    """Rows with the same key order share a tuple until the cap is reached."""
+    monkeypatch.setattr(record_mod, "_KEY_ORDERS", {})
+    monkeypatch.setattr(record_mod, "MAX_KEY_ORDERS", 1)
+    first, second = record_mod.CompactRecord({"url": "a"}), record_mod.CompactRecord({"url": "b"})
+    assert first.to_dict() == {"url": "a"} and second.to_dict() == {"url": "b"}
+    assert record_mod.CompactRecord({"gpa": 1.0}).to_dict() == {"gpa": 1.0}
+    assert len(record_mod._KEY_ORDERS) == 1
+
+
+@pytest.mark.db
+def test_record_to_dict_rejects_other_objects():
+    """The json default hook only serializes CompactRecords."""
+    with pytest.raises(TypeError):
+        json.dumps([object()], default=record_mod.record_to_dict)
+
+
+@pytest.mark.db
+def test_clean_data_compact_saves_identical_json(tmp_path):
+    """clean_data(compact=True) rows save to the same bytes as dict rows."""
+    raw = [
+        {"program_raw": " CS ", "university_raw": "JHU", "url": f"u{i}", "gpa_raw": "3.5"}
+        for i in range(20)
+    ]
+    clean_mod.save_data(clean_mod.clean_data(raw), str(tmp_path / "dicts.json"))
+    clean_mod.save_data(clean_mod.clean_data(raw, compact=True), str(tmp_path / "records.json"))
+    assert (tmp_path / "records.json").read_bytes() == (tmp_path / "dicts.json").read_bytes()
+
+
+@pytest.mark.db
+def test_load_records_uses_less_memory_than_dicts():
+    """Compact records keep fewer bytes alive than the equivalent list of dicts."""
+    text = json.dumps([_row(i) for i in range(2000)])
+    sizes = []
+    for load in (json.load, record_mod.load_records):
+        tracemalloc.start()
+        rows = load(io.StringIO(text))
+        sizes.append(tracemalloc.get_traced_memory()[0])
+        tracemalloc.stop()
+        del rows
+    assert sizes[1] < sizes[0] * 0.6
@@ -0,0 +1,88 @@
+"""Tests the local replay server, synthetic site, and scraping through base_url."""
+
+import importlib
+import os
+import sys
+import urllib.error
+import urllib.request
+
+import pytest
+
+SRC_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "gradcafe")
+
+replay_mod = importlib.import_module("module_2.replay")
+scrape_mod = importlib.import_module("module_2.scrape")
+rate_mod = importlib.import_module("module_2.rate_limit")
+server_options = importlib.import_module("data_builders").server_options
+
+
+def _status(url):
+    """Return the HTTP status code for a GET of url."""
+    try:
+        with urllib.request.urlopen(url) as resp:
+            return resp.status
+    except urllib.error.HTTPError as err:
+        return err.code
+
+
+@pytest.mark.db
+def test_scrape_synthetic_site_through_base_url():
+    """All synthetic rows are scraped with canonical URLs and detail fields."""
+    site = replay_mod.SyntheticSite(pages=3, rows_per_page=5, newest_id=1000)
+    with replay_mod.ReplayServer(site) as server:
+        entries = scrape_mod.scrape_data(options=server_options(server))
+        stats = server.stats()
+
+    assert len(entries) == 15
+    assert entries[0]["url"] == "https://www.thegradcafe.com/result/1000"
+    assert entries[-1]["url"].endswith("/986")
+    assert entries[0]["semester_year_start_raw"] in replay_mod.TERMS
+    assert entries[0]["gpa_raw"] == "3.00"
+    assert entries[0]["gre_score_raw"] == "300"
+    assert stats == {"requests": 19, "errors": 0, "not_found": 0}
+
+
+@pytest.mark.db
+def test_recorded_corpus_matches_fixture_scrape(monkeypatch):
+    """Replaying the fixture corpus over HTTP yields the same rows as in-process fixtures."""
+    corpus = replay_mod.RecordedCorpus(FIXTURE_DIR)
+    with replay_mod.ReplayServer(corpus) as server:
+        over_http = scrape_mod.scrape_data(options=server_options(server))
+
+    def _fixture_site(url):
+        if "page=" in url:
+            return corpus.listing(int(url.rsplit("=", 1)[-1]))
+        return corpus.detail(url.rsplit("/", 1)[-1]) or replay_mod.NO_RESULTS_HTML
+
+    monkeypatch.setattr(scrape_mod, "_fetch_html", _fixture_site)
+    assert over_http == scrape_mod.scrape_data()
+    assert len(over_http) == 6
+
+
+@pytest.mark.db
+def test_injected_errors_and_latency_are_retried():
+    """Injected 503s are retried by the scraper and counted by the server."""
+    site = replay_mod.SyntheticSite(pages=2, rows_per_page=4)
+    retry = rate_mod.RetryPolicy(max_attempts=8, base_delay=0.0, budget=500)
+    with replay_mod.ReplayServer(site, latency=0.001, error_rate=0.3, seed=3) as server:
+        entries = scrape_mod.scrape_data(options=server_options(server, retry_policy=retry))
+        stats = server.stats()
+    assert len(entries) == 8
+    assert all(entry["gpa_raw"] for entry in entries)
+    assert stats["errors"] > 0
+    assert retry.stats()["retries"] == stats["errors"]
+
+
+@pytest.mark.db
+def test_unknown_paths_return_404():
+    """Unknown paths, bad page numbers, and unlisted ids are 404s."""
+    site = replay_mod.SyntheticSite(pages=1, rows_per_page=2, newest_id=50)
+    with replay_mod.ReplayServer(site) as server:
+        assert _status(f"{server.base_url}/survey/?page=x") == 404
+        assert _status(f"{server.base_url}/about") == 404
+        assert _status(f"{server.base_url}/result/47") == 404
+        assert _status(f"{server.base_url}/survey/?page=9") == 200
+        assert server.stats()["not_found"] == 3
@@ -0,0 +1,201 @@
+"""Tests the decaying revisit scheduler and the upsert of changed result pages."""
+
+import importlib
+import os
+import sys
+
+import pytest
+
+SRC_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "gradcafe")
+
+revisit_mod = importlib.import_module("module_2.revisit")
+parsers_mod = importlib.import_module("module_2.parsers")
+app_mod = importlib.import_module("app")
+
+DAY = revisit_mod.DAY_SECONDS
+ROOT = "https://www.thegradcafe.com/result/"
+
+
+class _Cursor:
+    """Cursor double returning fixed rows and recording executed parameters."""
+
+    def __init__(self, rows, rowcount=1):
+        """Store rows for fetchall and the UPDATE rowcount."""
+        self.rows = rows
+        self.rowcount = rowcount
+        self.executed = []
+
+    def execute(self, query, params=None):
+        """Record query text and parameters."""
+        self.executed.append((query, params))
+
+    def fetchall(self):
+        """Return configured rows."""
+        return list(self.rows)
+
+    def fetchone(self):
+        """Return the first configured row."""
+        return self.rows[0]
+
+    def close(self):
+        """No-op close method."""
+        return None
+
+
+class _Conn:
+    """Connection double returning a shared cursor."""
+
+    def __init__(self, cursor):
+        """Hold the cursor."""
+        self._cursor = cursor
+
+    def cursor(self):
+        """Return the held cursor."""
+        return self._cursor
+
+    def commit(self):
+        """No-op commit method."""
+        return None
+
+    def close(self):
+        """No-op close method."""
+        return None
+
+
+@pytest.fixture(name="scheduler")
+def fixture_scheduler(tmp_path):
+    """Open a scheduler on a temporary database."""
+    scheduler = revisit_mod.RevisitScheduler(str(tmp_path / "revisit.sqlite3"))
+    yield scheduler
+    scheduler.close()
+
+
+@pytest.mark.db
+def test_detail_page_exposes_decision_and_status():
+    """Only revisit parses read decision fields; the status uses the listing format."""
+    with open(os.path.join(FIXTURE_DIR, "detail_987654.html"), encoding="utf-8") as file_in:
+        html = file_in.read()
+    for name in ("html.parser", "lxml"):
+        backend = parsers_mod.get_parser_backend(name)
+        assert "decision_raw" not in backend.parse_detail(html)
+        fields = backend.parse_detail(html, decision=True)
+        assert fields["decision_raw"] == "Accepted"
+        assert parsers_mod.detail_status(fields) == "Accepted on 12 Feb"
+    assert parsers_mod.detail_status({"decision_raw": "Wait listed"}) == "Wait listed"
+    assert parsers_mod.detail_status({"notification_raw": "on 1/1"}) is None
+    assert parsers_mod.detail_status(
+        {"decision_raw": "Rejected", "notification_raw": "on 3/1/2026 via Other"}
+    ) == "Rejected on 3 Jan"
+    assert parsers_mod.detail_status(
+        {"decision_raw": "Rejected", "notification_raw": "on 29/13/2026 via Other"}
+    ) == "Rejected"
+
+
+@pytest.mark.db
+def test_pending_rows_are_due_first_and_sooner(scheduler):
+    """Pending rows start at one day, final rows at two weeks; pending sorts first."""
+    added = scheduler.track(
+        [(f"{ROOT}1", "Accepted on Jan 01"), (f"{ROOT}2", "Wait listed on Jan 02"), (None, "x")]
+    )
+    assert added == 2
+    assert scheduler.track([(f"{ROOT}1", "Rejected")]) == 0
+    now = revisit_mod.time.time()
+    assert scheduler.due(10, now) == []
+    assert scheduler.due(10, now + 2 * DAY) == [f"{ROOT}2"]
+    assert scheduler.due(10, now + 30 * DAY) == [f"{ROOT}2", f"{ROOT}1"]
+    assert scheduler.due(1, now + 30 * DAY) == [f"{ROOT}2"]
+    assert scheduler.entry(f"{ROOT}9") is None
+
+
+@pytest.mark.db
+def test_record_decays_unchanged_and_resets_on_change(scheduler):
+    """Unchanged visits double the interval up to the cap; changes reset it."""
+    url = f"{ROOT}5"
+    scheduler.track([(url, "Wait listed on Jan 02")])
+    waitlisted = {"decision_raw": "Wait listed", "gpa_raw": "3.5"}
+
+    assert scheduler.record(url, waitlisted, now=0) is False
+    assert scheduler.entry(url)["interval"] == 2 * DAY
+    for _ in range(5):
+        scheduler.record(url, waitlisted, now=0)
+    assert scheduler.entry(url)["interval"] == 14 * DAY
+
+    assert scheduler.record(url, {**waitlisted, "gpa_raw": "3.6"}, now=0) is True
+    assert scheduler.entry(url)["interval"] == DAY
+
+    accepted = {"decision_raw": "Accepted", "notification_raw": "on 03/01/2026 via E-mail"}
+    assert scheduler.record(url, accepted, now=100) is True
+    entry = scheduler.entry(url)
+    assert entry["status"] == "Accepted on 3 Jan"
+    assert (entry["status_class"], entry["interval"], entry["next_due"]) == (
+        "final",
+        14 * DAY,
+        100 + 14 * DAY,
+    )
+    assert (entry["visits"], entry["changes"]) == (8, 2)
+
+
+@pytest.mark.db
+def test_run_due_upserts_only_changes_and_postpones_failures(scheduler):
+    """run_due fetches due pages, upserts changed ones, and postpones failed fetches."""
+    scheduler.track([(f"{ROOT}1", "Wait listed"), (f"{ROOT}2", "Interview"), (f"{ROOT}3", "")])
+    scheduler_db = getattr(scheduler, "_db")
+    scheduler_db.execute("UPDATE revisits SET next_due = 0")
+    pages = {
+        f"{ROOT}1": {"decision_raw": "Accepted"},
+        f"{ROOT}2": {"decision_raw": "Interview"},
+        f"{ROOT}3": {},
+    }
+    upserts = []
+    stats = scheduler.run_due(pages.get, lambda url, fields: upserts.append(url), limit=10)
+    assert stats == {"checked": 2, "changed": 1, "failed": 1}
+    assert upserts == [f"{ROOT}1"]
+    assert scheduler.due(10) == []
+
+
+@pytest.mark.db
+def test_run_revisit_pass_tracks_db_rows_and_upserts_status(monkeypatch, tmp_path):
+    """The app pass seeds from applicants and writes the new decision as status."""
+    cur = _Cursor([(f"{ROOT}7", "Wait listed on Feb 01")])
+    monkeypatch.setattr(app_mod, "get_db_connection", lambda: _Conn(cur))
+    fetched = []
+
+    def _revisit_page(url, decision=False):
+        """Record the decision flag and return a rejected decision."""
+        fetched.append((url, decision))
+        return {"decision_raw": "Rejected"}
+
+    monkeypatch.setattr(app_mod, "parse_detail_page", _revisit_page)
+    monkeypatch.setattr(revisit_mod, "DEFAULT_REVISIT_PATH", str(tmp_path / "r.sqlite3"))
+    monkeypatch.setattr(revisit_mod, "STATUS_CLASSES", {
+        "pending": (0, -1, 14 * DAY),
+        "final": (1, 14 * DAY, 180 * DAY),
+    })
+
+    stats = app_mod.run_revisit_pass(limit=5)
+    assert stats == {"checked": 1, "changed": 1, "failed": 0}
+    update_params = cur.executed[-1][1]
+    assert update_params[0] == "Rejected"
+    assert fetched == [(f"{ROOT}7", True)]
+    assert update_params[-1] == f"{ROOT}7"
+
+
+@pytest.mark.db
+def test_pull_pipeline_runs_revisit_budget(monkeypatch):
+    """A non-zero revisit budget runs one revisit pass after loading."""
+    calls = []
+    monkeypatch.setitem(app_mod.APP_STATE, "revisit_budget", 3)
+    monkeypatch.setattr(app_mod, "ensure_initial_dataset_loaded", lambda: False)
+    monkeypatch.setattr(app_mod, "fetch_max_result_id", lambda: None)
+    monkeypatch.setattr(app_mod, "run_scrape", lambda **_kw: None)
+    monkeypatch.setattr(app_mod, "run_typed_clean", lambda **_kw: None)
+    monkeypatch.setattr(app_mod, "run_llm_and_write_out_json", lambda: None)
+    monkeypatch.setattr(app_mod, "merge_out_into_module2_out", lambda: (0, 0))
+    monkeypatch.setattr(app_mod, "run_load", lambda **_kw: None)
+    monkeypatch.setattr(app_mod, "run_revisit_pass", calls.append)
+    ok, _status, _seeded = app_mod.run_pull_data_pipeline()
+    assert ok
+    assert calls == [3]
@@ -1,9 +1,12 @@
 """Tests scrape parsing and edge-case behavior with mocked HTML/network calls."""
 
 import importlib
+import json
 import os
 import runpy
 import sys
+import threading
+import time
 
 from bs4 import BeautifulSoup
 import pytest
@@ -13,6 +16,11 @@ if SRC_PATH not in sys.path:
     sys.path.insert(0, SRC_PATH)
 
 scrape_mod = importlib.import_module("module_2.scrape")
+parsers_mod = importlib.import_module("module_2.parsers")
+rate_mod = importlib.import_module("module_2.rate_limit")
+http_client_mod = importlib.import_module("module_2.http_client")
+cache_mod = importlib.import_module("module_2.http_cache")
+listing_html_for_hrefs = importlib.import_module("data_builders").listing_html_for_hrefs
 parse_row = scrape_mod.parse_row
 parse_detail_page = scrape_mod.parse_detail_page
 scrape_data = scrape_mod.scrape_data
@@ -34,6 +42,15 @@ class _FakeResp:
         return None
 
 
+def _patch_urlopen(monkeypatch, fake_urlopen):
+    """Route the shared HTTP session through a urlopen-style fake."""
+
+    def _fake_get_text(url):
+        return fake_urlopen(url).read().decode("utf-8")
+
+    monkeypatch.setattr(scrape_mod.HTTP_SESSION, "get_text", _fake_get_text)
+
+
 @pytest.mark.db
 def test_parse_row_and_meta():
     """parse_row extracts detail URL and semester metadata from adjacent rows."""
@@ -64,9 +81,8 @@ def test_parse_row_short_row():
 
 @pytest.mark.db
 def test_extract_semester_no_match():
-    """_extract_semester returns None when term text is missing."""
-    extract_fn = getattr(scrape_mod, "_extract_semester")
-    assert extract_fn("No semester provided") is None
+    """extract_semester returns None when term text is missing."""
+    assert parsers_mod.extract_semester("No semester provided") is None
 
 
 @pytest.mark.db
@@ -92,7 +108,7 @@ def test_parse_detail_page(monkeypatch):
     def _fake_urlopen(_request_obj):
         return _FakeResp(html)
 
-    monkeypatch.setattr("module_2.scrape.request.urlopen", _fake_urlopen)
+    _patch_urlopen(monkeypatch, _fake_urlopen)
 
     data = parse_detail_page("https://example.com")
     assert data["gpa_raw"] == "3.9"
@@ -112,14 +128,14 @@ def test_parse_detail_page_missing_sections(monkeypatch):
     def _fake_urlopen_missing_main(_request_obj):
         return _FakeResp("<html><body>No main here</body></html>")
 
-    monkeypatch.setattr("module_2.scrape.request.urlopen", _fake_urlopen_missing_main)
+    _patch_urlopen(monkeypatch, _fake_urlopen_missing_main)
     data = parse_detail_page("https://example.com/missing")
     assert not data
 
     def _fake_urlopen_missing_dl(_request_obj):
         return _FakeResp("<main><p>No dl here</p></main>")
 
-    monkeypatch.setattr("module_2.scrape.request.urlopen", _fake_urlopen_missing_dl)
+    _patch_urlopen(monkeypatch, _fake_urlopen_missing_dl)
     data2 = parse_detail_page("https://example.com/missing2")
     assert not data2
 
@@ -131,7 +147,7 @@ def test_parse_detail_page_exception(monkeypatch):
     def _fake_urlopen(_request_obj):
         raise RuntimeError("boom")
 
-    monkeypatch.setattr("module_2.scrape.request.urlopen", _fake_urlopen)
+    _patch_urlopen(monkeypatch, _fake_urlopen)
     data = parse_detail_page("https://example.com/error")
     assert not data
 
@@ -163,7 +179,7 @@ def test_scrape_data_collects_entries(monkeypatch):
             return _FakeResp(list_html)
         return _FakeResp(detail_html)
 
-    monkeypatch.setattr("module_2.scrape.request.urlopen", _fake_urlopen)
+    _patch_urlopen(monkeypatch, _fake_urlopen)
 
     entries = scrape_data(existing_urls=set(), stop_after_existing=1)
     assert len(entries) == 1
@@ -178,7 +194,7 @@ def test_scrape_data_breaks_on_no_rows(monkeypatch):
     def _fake_urlopen(_request_obj):
         return _FakeResp("<table><tr><th>Header</th></tr></table>")
 
-    monkeypatch.setattr("module_2.scrape.request.urlopen", _fake_urlopen)
+    _patch_urlopen(monkeypatch, _fake_urlopen)
     entries = scrape_data(existing_urls=set(), stop_after_existing=1)
     assert not entries
 
@@ -190,8 +206,13 @@ def test_scrape_data_handles_fetch_error(monkeypatch):
     def _fake_urlopen(_request_obj):
         raise RuntimeError("boom")
 
-    monkeypatch.setattr("module_2.scrape.request.urlopen", _fake_urlopen)
-    entries = scrape_data(existing_urls=set(), stop_after_existing=1)
+    _patch_urlopen(monkeypatch, _fake_urlopen)
+    unpaced = rate_mod.AdaptiveRateLimiter(rate=1000, burst=1000)
+    entries = scrape_data(
+        existing_urls=set(),
+        stop_after_existing=1,
+        options={"rate_limiter": unpaced},
+    )
     assert not entries
 
 
@@ -211,7 +232,7 @@ def test_scrape_data_stops_on_existing(monkeypatch):
     def _fake_urlopen(_request_obj):
         return _FakeResp(list_html)
 
-    monkeypatch.setattr("module_2.scrape.request.urlopen", _fake_urlopen)
+    _patch_urlopen(monkeypatch, _fake_urlopen)
     entries = scrape_data(
         existing_urls={"https://www.thegradcafe.com/survey/123"},
         stop_after_existing=1,
@@ -238,12 +259,18 @@ def test_save_data_and_run_scrape(monkeypatch, tmp_path):
 
 
 @pytest.mark.db
-def test_scrape_main():
-    """module_2.scrape __main__ executes safely with injected run_scrape."""
+def test_scrape_main(monkeypatch, tmp_path):
+    """module_2.scrape __main__ executes safely without touching the network."""
 
     def _fake_run_scrape(**_kwargs):
         return []
 
+    def _fake_request(_session, url, headers=None):
+        return http_client_mod.HttpResponse(url, 200, dict(headers or {}), b"<p>empty</p>")
+
+    monkeypatch.setattr(http_client_mod.HttpSession, "request", _fake_request)
+    monkeypatch.setattr(cache_mod, "DEFAULT_CACHE_DIR", str(tmp_path / "http_cache"))
+    monkeypatch.chdir(tmp_path)
     runpy.run_module(
         "module_2.scrape",
         run_name="__main__",
@@ -267,7 +294,7 @@ def test_existing_continue_branch(monkeypatch):
     def _fake_urlopen(_request_obj):
         return _FakeResp(list_html)
 
-    monkeypatch.setattr("module_2.scrape.request.urlopen", _fake_urlopen)
+    _patch_urlopen(monkeypatch, _fake_urlopen)
     entries = scrape_data(
         existing_urls={"https://www.thegradcafe.com/survey/123"},
         stop_after_existing=2,
@@ -291,6 +318,198 @@ def test_parse_detail_page_short_spans(monkeypatch):
     def _fake_urlopen(_request_obj):
         return _FakeResp(html)
 
-    monkeypatch.setattr("module_2.scrape.request.urlopen", _fake_urlopen)
+    _patch_urlopen(monkeypatch, _fake_urlopen)
     data = parse_detail_page("https://example.com/short")
     assert not data
+
+
+@pytest.mark.db
+def test_scrape_data_fetches_details_concurrently_in_order(monkeypatch):
+    """Detail pages fan out across workers, bounded, and keep listing order."""
+    hrefs = [f"/result/{idx}" for idx in range(6)]
+    pages = {"n": 0}
+    state = {"active": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def _fake_fetch_html(_url):
+        pages["n"] += 1
+        return listing_html_for_hrefs(hrefs) if pages["n"] == 1 else "<p>end</p>"
+
+    def _fake_detail(url):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.02 if url.endswith("/0") else 0.01)
+        with lock:
+            state["active"] -= 1
+        return {"gpa_raw": url.rsplit("/", 1)[-1]}
+
+    monkeypatch.setattr(scrape_mod, "_fetch_html", _fake_fetch_html)
+    monkeypatch.setattr(scrape_mod, "parse_detail_page", _fake_detail)
+
+    entries = scrape_data(options={"detail_workers": 3})
+    assert [entry["gpa_raw"] for entry in entries] == [str(idx) for idx in range(6)]
+    assert 1 < state["peak"] <= 3
+
+
+@pytest.mark.db
+def test_scrape_data_enriches_rows_before_existing_stop(monkeypatch):
+    """Rows before the stop threshold are still enriched; known rows are not fetched."""
+    hrefs = ["/result/2", "/result/1"]
+    fetched = []
+
+    monkeypatch.setattr(scrape_mod, "_fetch_html", lambda _url: listing_html_for_hrefs(hrefs))
+    monkeypatch.setattr(
+        scrape_mod,
+        "parse_detail_page",
+        lambda url: fetched.append(url) or {"gpa_raw": "3.5"},
+    )
+
+    entries = scrape_data(
+        existing_urls={"https://www.thegradcafe.com/result/1"},
+        stop_after_existing=1,
+        options={"detail_workers": 4},
+    )
+    assert [entry["url"] for entry in entries] == ["https://www.thegradcafe.com/result/2"]
+    assert entries[0]["gpa_raw"] == "3.5"
+    assert fetched == ["https://www.thegradcafe.com/result/2"]
+
+
+@pytest.mark.db
+def test_scrape_options_validation():
+    """Unknown option keys and non-positive worker counts are rejected."""
+    with pytest.raises(ValueError):
+        scrape_data(options={"nope": 1})
+    with pytest.raises(ValueError):
+        scrape_data(options={"detail_workers": 0})
+
+
+@pytest.mark.db
+def test_parse_detail_page_skips_blocks_without_dd(monkeypatch):
+    """Detail blocks missing a <dd> are ignored while later blocks still parse."""
+    html = """
+    <main><dl>
+      <div><dt>Program</dt></div>
+      <div><dt>Undergrad GPA</dt><dd>3.7</dd></div>
+    </dl></main>
+    """
+    monkeypatch.setattr(scrape_mod, "_fetch_html", lambda _url: html)
+    assert parse_detail_page("https://example.com/partial") == {"gpa_raw": "3.7"}
+
+
+@pytest.mark.db
+def test_run_scrape_stream_writes_jsonl_incrementally(monkeypatch, tmp_path):
+    """Streaming mode appends each row as soon as its detail page is merged."""
+    out_path = tmp_path / "applicant_data.jsonl"
+    out_path.write_text("stale\n", encoding="utf-8")
+    hrefs = ["/result/3", "/result/2"]
+    pages = {"n": 0}
+    seen_on_disk = []
+
+    def _fake_fetch_html(_url):
+        pages["n"] += 1
+        return listing_html_for_hrefs(hrefs) if pages["n"] == 1 else "<p>end</p>"
+
+    def _fake_detail(url):
+        seen_on_disk.append(out_path.read_text(encoding="utf-8").count("\n"))
+        return {"gpa_raw": url[-1]}
+
+    monkeypatch.setattr(scrape_mod, "_fetch_html", _fake_fetch_html)
+    monkeypatch.setattr(scrape_mod, "parse_detail_page", _fake_detail)
+
+    count = scrape_mod.run_scrape(
+        filename=str(out_path),
+        options={"detail_workers": 1},
+        stream=True,
+    )
+    lines = out_path.read_text(encoding="utf-8").splitlines()
+    assert count == 2
+    assert [json.loads(line)["gpa_raw"] for line in lines] == ["3", "2"]
+    assert seen_on_disk == [0, 1]
+
+
+@pytest.mark.db
+def test_iter_scrape_is_lazy(monkeypatch):
+    """iter_scrape fetches nothing until iterated."""
+    calls = []
+    monkeypatch.setattr(scrape_mod, "_fetch_html", lambda url: calls.append(url) or "")
+    rows = scrape_mod.iter_scrape()
+    assert not calls
+    assert not list(rows)
+    assert len(calls) == 1
+
+
+@pytest.mark.db
+def test_watermark_stops_at_first_known_result_id(monkeypatch):
+    """Rows at or below the watermark end the walk; id-less rows still pass."""
+    pages = {
+        1: listing_html_for_hrefs(["/result/12", "/survey/no-id", "/result/11"]),
+        2: listing_html_for_hrefs(["/result/10", "/result/9"]),
+        3: listing_html_for_hrefs(["/result/8"]),
+    }
+    fetched = []
+
+    def _fake_fetch_html(url):
+        fetched.append(url)
+        return pages[int(url.rsplit("=", 1)[-1])]
+
+    monkeypatch.setattr(scrape_mod, "_fetch_html", _fake_fetch_html)
+    monkeypatch.setattr(scrape_mod, "parse_detail_page", lambda _url: {})
+    entries = scrape_data(options={"watermark": 10})
+
+    assert [entry["url"].rsplit("/", 1)[-1] for entry in entries] == ["12", "no-id", "11"]
+    assert len(fetched) == 2
+    assert parsers_mod.result_id("https://www.thegradcafe.com/result/987654") == 987654
+    assert parsers_mod.result_id(None) is None
+
+
+@pytest.mark.db
+def test_run_state_is_isolated_from_other_threads_and_the_caller(monkeypatch):
+    """A suspended run's state is visible to its workers only, not to other code."""
+    metrics = scrape_mod.ScrapeMetrics()
+    seen = []
+
+    def _fake_fetch_html(url):
+        seen.append(scrape_mod.current_run_state()["metrics"] is metrics)
+        if "page=1" not in url:
+            return "<p>end</p>"
+        return listing_html_for_hrefs(["/result/2", "/result/1"])
+
+    def _fake_detail(_url):
+        seen.append(scrape_mod.current_run_state()["metrics"] is metrics)
+        return {}
+
+    monkeypatch.setattr(scrape_mod, "_fetch_html", _fake_fetch_html)
+    monkeypatch.setattr(scrape_mod, "parse_detail_page", _fake_detail)
+    rows = scrape_mod.iter_scrape(options={"metrics": metrics, "detail_workers": 2})
+    next(rows)
+
+    outside = []
+    thread = threading.Thread(target=lambda: outside.append(scrape_mod.current_run_state()))
+    thread.start()
+    thread.join()
+    assert outside == [scrape_mod.DEFAULT_RUN_STATE]
+    assert isinstance(outside[0]["retry"], rate_mod.RefillingRetryPolicy)
+    assert scrape_mod.current_run_state() is scrape_mod.DEFAULT_RUN_STATE
+    assert len(list(rows)) == 1
+    assert seen and all(seen)
+    assert scrape_mod.current_run_state() is scrape_mod.DEFAULT_RUN_STATE
+
+
+@pytest.mark.db
+def test_watermark_run_aborts_on_failed_listing_page(monkeypatch):
+    """With a watermark a failed listing page aborts the run; without one it is skipped."""
+    pages = {1: listing_html_for_hrefs(["/result/30"]), 3: listing_html_for_hrefs(["/result/10"])}
+
+    def _fake_fetch_html(url):
+        page = int(url.rsplit("=", 1)[-1])
+        if page == 2:
+            raise OSError("listing down")
+        return pages.get(page, "<p>end</p>")
+
+    monkeypatch.setattr(scrape_mod, "_fetch_html", _fake_fetch_html)
+    monkeypatch.setattr(scrape_mod, "parse_detail_page", lambda _url: {})
+    with pytest.raises(RuntimeError, match="Listing page 2"):
+        scrape_data(options={"watermark": 5})
+    entries = scrape_data()
+    assert [entry["url"].rsplit("/", 1)[-1] for entry in entries] == ["30", "10"]
@@ -0,0 +1,94 @@
+"""Tests for the cached decision-status and added-on date parsers."""
+
+import importlib
+import os
+import sys
+from datetime import date, datetime
+
+import pytest
+
+SRC_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+
+status_parse = importlib.import_module("module_2.status_parse")
+Decision = status_parse.Decision
+
+
+def _strptime(text):
+    """Return what the old strptime loop in load_data.parse_date returned."""
+    for fmt in ("%B %d, %Y", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(text.strip(), fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+@pytest.mark.db
+@pytest.mark.parametrize(
+    "status, expected",
+    [
+        ("Accepted on Jan 01, 2025", (Decision.ACCEPTED, "Jan 01, 2025")),
+        ("Wait listed on 13 Feb", (Decision.WAIT_LISTED, "13 Feb")),
+        ("rejected ON 2 Feb ", (Decision.REJECTED, "2 Feb")),
+        ("Interview", (Decision.INTERVIEW, None)),
+        ("Rejected on", (Decision.REJECTED, "")),
+        ("Accepted onward", (Decision.ACCEPTED, None)),
+        (" Accepted on 1 Feb", (Decision.OTHER, None)),
+        ("Other", (Decision.OTHER, None)),
+        (None, (None, None)),
+        (["x"], (None, None)),
+    ],
+)
+def test_split_status(status, expected):
+    """Statuses split into a decision and the text after 'on'."""
+    assert status_parse.split_status(status) == expected
+
+
+@pytest.mark.db
+def test_parse_date_added_matches_strptime():
+    """The regex date parser agrees with the strptime formats it replaces."""
+    samples = [
+        "February 13, 2026", "february 3, 2026", " March 09, 2025 ", "Feb 13, 2026",
+        "February 30, 2026", "February 13,2026", "February  13,  2026", "2025-01-02",
+        "2025-1-2", "2025-13-01", "2025-00-10", "January 00, 2025", "bad-date", "2025/01/02",
+    ]
+    for text in samples:
+        assert status_parse.parse_date_added(text) == _strptime(text), text
+    assert status_parse.parse_date_added("") is None
+    assert status_parse.parse_date_added(None) is None
+    assert status_parse.parse_date_added(date(2025, 1, 1)) is None
+
+
+@pytest.mark.db
+@pytest.mark.parametrize(
+    "status, added, expected",
+    [
+        ("Accepted on 29 Jan", "January 30, 2026", date(2026, 1, 29)),
+        ("Rejected on Dec 30", "January 02, 2026", date(2025, 12, 30)),
+        ("Accepted on Jan 01, 2025", "March 01, 2026", date(2025, 1, 1)),
+        ("Wait listed on 13 Sept", "2025-10-01", date(2025, 9, 13)),
+        ("Accepted on 29 Feb", "March 01, 2025", None),
+        ("Accepted on 29 Jan", None, None),
+        ("Accepted on 29 Foo", "January 30, 2026", None),
+        ("Accepted on 12/02/2026", "January 30, 2026", None),
+        ("Interview", "January 30, 2026", None),
+    ],
+)
+def test_parse_decision_infers_year(status, added, expected):
+    """Decision dates take the added-on year, stepping back a year past the added date."""
+    parsed = status_parse.parse_decision(status, added)
+    assert parsed.decision_date == expected
+    assert parsed.date_added == status_parse.parse_date_added(added)
+
+
+@pytest.mark.db
+def test_parse_decision_is_memoized():
+    """Repeated status/date pairs are served from the cache."""
+    status_parse.parse_decision("Accepted on 3 Mar", "March 04, 2026")
+    hits = getattr(status_parse, "_parse_decision").cache_info().hits
+    parsed = status_parse.parse_decision("Accepted on 3 Mar", "March 04, 2026")
+    assert getattr(status_parse, "_parse_decision").cache_info().hits == hits + 1
+    assert parsed == (Decision.ACCEPTED, date(2026, 3, 3), date(2026, 3, 4))
+    assert status_parse.parse_decision(0, 0) == (None, None, None)
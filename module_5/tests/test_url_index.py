@@ -0,0 +1,59 @@
+"""Tests the compact result-id URL index against plain set semantics."""
+
+import importlib
+import os
+import sys
+
+import pytest
+
+SRC_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+
+index_mod = importlib.import_module("module_2.url_index")
+scrape_mod = importlib.import_module("module_2.scrape")
+listing_html = importlib.import_module("data_builders").listing_html
+
+ROOT = "https://www.thegradcafe.com/result/"
+
+
+@pytest.mark.db
+def test_membership_matches_set():
+    """Lookups agree with a set of URL strings."""
+    urls = [f"{ROOT}{rid}" for rid in (5, 900, 3, 5, 70000)]
+    urls += ["https://example.com/other", "", None, f"{ROOT}{2 ** 33}"]
+    index = index_mod.ResultIdSet(urls)
+    expected = {url for url in urls if url}
+
+    probes = expected | {f"{ROOT}{rid}" for rid in range(0, 1000)} | {f"{ROOT}{2 ** 34}"}
+    for probe in probes:
+        assert (probe in index) == (probe in expected), probe
+    assert f" {ROOT}900 " in index
+    assert f"{ROOT}900?x=1" in index
+    assert f"{ROOT}9001" not in index
+    assert len(index) == 6
+    assert list(index) == [3, 5, 900, 70000]
+    assert index.nbytes() == 16
+
+
+@pytest.mark.db
+def test_add_keeps_ids_sorted_and_unique():
+    """add inserts in order and ignores duplicates and blanks."""
+    index = index_mod.ResultIdSet([f"{ROOT}10"])
+    for url in (f"{ROOT}4", f"{ROOT}12", f"{ROOT}4", "", "https://example.com/x"):
+        index.add(url)
+    assert list(index) == [4, 10, 12]
+    assert f"{ROOT}12" in index
+    assert "https://example.com/x" in index
+    assert not index_mod.ResultIdSet()
+
+
+@pytest.mark.db
+def test_scraper_accepts_result_id_set(monkeypatch):
+    """The scraper's existing_urls check works with a ResultIdSet."""
+    listing = listing_html([3, 2, 1])
+    monkeypatch.setattr(scrape_mod, "_fetch_html", lambda _url: listing)
+    monkeypatch.setattr(scrape_mod, "parse_detail_page", lambda _url: {})
+    existing = index_mod.ResultIdSet([f"{ROOT}2", f"{ROOT}1"])
+    entries = scrape_mod.scrape_data(existing_urls=existing, stop_after_existing=2)
+    assert [entry["url"] for entry in entries] == [f"{ROOT}3"]